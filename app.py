@@ -1,12 +1,14 @@
+import json
+import logging
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 from dotenv import load_dotenv
 import requests
 from config import Config
 from github_analytics import GitHubPullRequestAnalytics
 from azuredevops_analytics import AzureDevOpsAnalytics
 from figma_analytics import FigmaAnalytics
-from chatbot_analytics import ChatbotAnalytics
+from chatbot_analytics import get_chatbot
 from datadog_analytics import DatadogApplicationKeyAnalytics
 from context_storage import context_storage
 
@@ -16,12 +18,15 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = Config.SECRET_KEY
 
+# Load stored chatbot context and start persisting updates
+context_storage.start()
+
 # Initialize analytics clients
 github_analytics = GitHubPullRequestAnalytics()
 azuredevops_analytics = AzureDevOpsAnalytics()
 figma_analytics = FigmaAnalytics()
 datadog_analytics = DatadogApplicationKeyAnalytics()
-chatbot_analytics = ChatbotAnalytics()
+chatbot_analytics = get_chatbot()
 
 @app.route('/')
 def index():
@@ -282,10 +287,10 @@ def test_wiql_direct():
     }
     
     # Try without date filtering but with TOP limit - fix WIQL syntax
-    simple_query = f"""
+    simple_query = """
     SELECT [System.Id], [System.Title], [System.WorkItemType], [System.State], [System.CreatedDate]
     FROM WorkItems 
-    WHERE [System.TeamProject] = '{project}'
+    WHERE [System.TeamProject] = @project
     ORDER BY [System.CreatedDate] DESC
     """
     
@@ -466,6 +471,35 @@ def get_azuredevops_github_prs():
             'message': f'Error analyzing GitHub PRs: {str(e)}'
         }), 500
 
+@app.route('/api/azuredevops/github-prs/stream')
+def stream_azuredevops_github_prs():
+    """Stream work items with GitHub PR analysis as newline-delimited JSON, one batch per line"""
+    org = request.args.get('org', '')
+    project = request.args.get('project', '')
+    area_path = request.args.get('area_path', '')
+    
+    # Validate required parameters
+    if not org or not project:
+        return jsonify({
+            'status': 'error',
+            'message': 'Organization and project name are required'
+        }), 400
+    
+    # Update the Azure DevOps analytics instance
+    azuredevops_analytics.organization = org
+    azuredevops_analytics.project = project
+    azuredevops_analytics.area_path = area_path
+    
+    def generate():
+        try:
+            for work_items in azuredevops_analytics.iter_work_items_with_github_prs():
+                yield json.dumps({'status': 'partial', 'work_items': work_items}) + '\n'
+            yield json.dumps({'status': 'complete'}) + '\n'
+        except Exception as e:
+            yield json.dumps({'status': 'error', 'message': f'Error analyzing GitHub PRs: {str(e)}'}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/azuredevops/comprehensive-pr-analysis')
 def get_comprehensive_pr_analysis():
     """Comprehensive PR analysis endpoint with detailed work item and development work information"""
@@ -736,7 +770,8 @@ def debug_azuredevops():
         'area_path': azuredevops_analytics.area_path,
         'base_url': azuredevops_analytics._get_base_url(),
         'has_token': bool(azuredevops_analytics.pat_token),
-        'token_length': len(azuredevops_analytics.pat_token) if azuredevops_analytics.pat_token else 0
+        'token_length': len(azuredevops_analytics.pat_token) if azuredevops_analytics.pat_token else 0,
+        'cache_stats': azuredevops_analytics.get_cache_stats()
     }
     
     return jsonify({
@@ -765,7 +800,8 @@ def get_azuredevops_analytics():
     azuredevops_analytics.area_path = area_path
     
     # Use streamlined analytics for better performance (7-day default)
-    result = azuredevops_analytics.get_streamlined_analytics(days)
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
+    result = azuredevops_analytics.get_streamlined_analytics(days, force_refresh=refresh)
     
     # Store context for chatbot
     if result and result.get('status') == 'success':
@@ -853,7 +889,8 @@ def get_azuredevops_workitems_summary():
     azuredevops_analytics.area_path = area_path
     
     # Get work items only summary (fast loading)
-    result = azuredevops_analytics.get_workitems_only_summary(days)
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
+    result = azuredevops_analytics.get_workitems_only_summary(days, force_refresh=refresh)
     return jsonify(result)
 
 @app.route('/api/azuredevops/pullrequests')
@@ -1499,6 +1536,30 @@ def chatbot_analyze():
             'message': f'Analysis error: {str(e)}'
             }), 500
             
+@app.route('/api/chatbot/analyze/stream', methods=['POST'])
+def chatbot_analyze_stream():
+    """Stream a chatbot analysis as server-sent events, one text chunk per event"""
+    data = request.get_json() or {}
+    question = data.get('question', '')
+    data_source = data.get('data_source', 'general')
+    context_data = data.get('context_data', {})
+    
+    if not question:
+        return jsonify({
+            'status': 'error',
+            'message': 'Question is required'
+        }), 400
+    
+    def generate():
+        try:
+            for chunk in chatbot_analytics.stream_analysis(data_source, context_data, question):
+                yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'status': 'error', 'message': f'Analysis error: {str(e)}'})}\n\n"
+        yield f"data: {json.dumps({'done': True, 'data_source': data_source, 'timestamp': datetime.now().isoformat()})}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
 @app.route('/api/chatbot/summary/<data_source>', methods=['POST'])
 def chatbot_summary(data_source):
     """API endpoint for getting data summaries"""
@@ -1527,6 +1588,45 @@ def chatbot_summary(data_source):
             'message': f'Summary error: {str(e)}'
         }), 500
 
+@app.route('/api/chatbot/prime', methods=['POST'])
+def chatbot_prime():
+    """API endpoint for the dashboard's first load: summaries, questions and analyses for all sources at once"""
+    try:
+        data = request.get_json() or {}
+        sources_data = data.get('sources_data', {})
+        
+        if not sources_data:
+            return jsonify({
+                'status': 'error',
+                'message': 'Sources data is required'
+            }), 400
+        
+        if not isinstance(sources_data, dict) or not all(isinstance(value, dict) for value in sources_data.values()):
+            return jsonify({
+                'status': 'error',
+                'message': 'Sources data must map each data source to an object'
+            }), 400
+        
+        primed = chatbot_analytics.prime_dashboard(sources_data)
+        
+        if 'error' in primed:
+            return jsonify({
+                'status': 'error',
+                'message': primed['error']
+            }), 502
+        
+        return jsonify({
+            'status': 'success',
+            'data': primed,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Dashboard prime error: {str(e)}'
+        }), 500
+
 @app.route('/api/chatbot/suggest-questions/<data_source>', methods=['POST'])
 def chatbot_suggest_questions(data_source):
     """API endpoint for getting suggested questions"""
@@ -1603,4 +1703,5 @@ def chatbot_status():
         }), 500
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
     app.run(debug=True, host='0.0.0.0', port=5002)
@@ -5,12 +5,330 @@ Handles all Azure DevOps-related functionality including work items, pull reques
 
 import json
 import base64
-from datetime import datetime, timedelta
+import logging
+import functools
+import hashlib
+import heapq
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple, Optional
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import plotly.graph_objs as go
 import plotly
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+
+# Relation types that can carry a PR/commit link; everything else (hierarchy,
+# related work items, attachments) is skipped before any URL inspection
+_CANDIDATE_REL_TYPES = frozenset({'artifactlink', 'hyperlink'})
+_PR_REL_TYPE_SUBSTRS = ('pullrequest', 'development')
+
+# Work item types that carry development links; Epics/Features only link
+# downward through the hierarchy, so their relations are never fetched
+_PR_BEARING_TYPES = frozenset({'User Story', 'Task', 'Bug', 'Product Backlog Item'})
+
+# Known repository ID -> GitHub mappings for this organization; add entries here
+# for repositories that cannot be resolved through the Azure DevOps API
+_KNOWN_REPOS = {
+    '206cdeed-ccde-4df1-a203-092a2522662f': {
+        'github_repo': 'tr/cs-prof-cloud_ultratax-api-services',
+        'repo_name': 'cs-prof-cloud_ultratax-api-services',
+        'owner': 'tr',
+        'repo': 'cs-prof-cloud_ultratax-api-services',
+        'remote_url': 'https://github.com/tr/cs-prof-cloud_ultratax-api-services'
+    },
+    '0d836de7-dfee-46c2-a340-a39d84189402': {
+        'github_repo': 'tr/tax-professional-services',
+        'repo_name': 'tax-professional-services',
+        'owner': 'tr',
+        'repo': 'tax-professional-services',
+        'remote_url': 'https://github.com/tr/tax-professional-services'
+    },
+    '2c2726b0-50bd-4425-89ad-a1361ffa3467': {
+        'github_repo': 'tr/tax-automation-engine',
+        'repo_name': 'tax-automation-engine',
+        'owner': 'tr',
+        'repo': 'tax-automation-engine',
+        'remote_url': 'https://github.com/tr/tax-automation-engine'
+    }
+}
+
+# Fields requested when fetching work items by id. The summary views read
+# only these; System.AreaPath is also surfaced by the dashboard's PR tables
+ANALYTICS_FIELDS = ('System.Id', 'System.Title', 'System.WorkItemType', 'System.State',
+                    'System.AssignedTo', 'System.CreatedDate', 'System.AreaPath')
+# PR analysis also needs ChangedDate for its recency filter, plus Tags
+PR_ANALYSIS_FIELDS = ANALYTICS_FIELDS + ('System.ChangedDate', 'System.Tags')
+
+# The work items endpoint accepts at most 200 ids per request
+_WORK_ITEMS_BATCH_SIZE = 200
+_MAX_BATCH_WORKERS = 8
+
+# Azure DevOps rate limiting: only slow down when the service asks us to
+_RATE_LIMIT_LOW_WATERMARK = 100
+_MAX_RATE_LIMIT_DELAY = 30.0
+
+# Above this many work items, breakdowns are counted with pandas instead of
+# a Python loop; smaller windows skip the pandas import entirely
+_VECTORIZE_THRESHOLD = 1000
+
+
+# WIQL queries run against the project-scoped endpoint, so @project resolves to
+# the current project without interpolating its name into the query text
+_WIQL_AREA_PATHS = """
+SELECT [System.Id], [System.AreaPath]
+FROM WorkItems
+WHERE [System.TeamProject] = @project
+"""
+
+
+def _wiql_quote(value):
+    """Quote a value as a WIQL string literal, doubling embedded single quotes"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class RepoInfo(NamedTuple):
+    """Repository details parsed from a PR/commit link URL"""
+    repository: str
+    pr_number: str
+    platform: str
+    full_repo_path: str
+    repository_id: Optional[str] = None
+    commit_id: Optional[str] = None
+
+
+_VSTFS_PR_RE = re.compile(r'vstfs:///GitHub/PullRequest/([^%]+)%2f(\d+)')
+_VSTFS_COMMIT_RE = re.compile(r'vstfs:///GitHub/Commit/([^%]+)%2f([a-f0-9]+)')
+_GITHUB_PR_RE = re.compile(r'github\.com/([^/]+)/([^/]+)/pull/(\d+)')
+# Repository ID from a vstfs:///GitHub/{Commit|PullRequest}/{repo-id}%2f{ref} link
+_GITHUB_REPO_RE = re.compile(r'GitHub/(?:Commit|PullRequest)/([^%/]+)')
+# owner/repo from a GitHub remote URL (https or ssh), without any .git suffix
+_GITHUB_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+
+def _extract_vstfs_pr(url):
+    """vstfs:///GitHub/PullRequest/{repo-id}%2f{pr-number}"""
+    match = _VSTFS_PR_RE.search(url)
+    if not match:
+        return None
+    repo_id, pr_number = match.groups()
+    return RepoInfo(
+        repository=f'GitHub-{repo_id[:8]}',  # Shortened repo ID
+        pr_number=pr_number,
+        platform='GitHub',
+        full_repo_path=f'GitHub/{repo_id}',
+        repository_id=repo_id
+    )
+
+
+def _extract_vstfs_commit(url):
+    """vstfs:///GitHub/Commit/{repo-id}%2f{commit-hash}"""
+    match = _VSTFS_COMMIT_RE.search(url)
+    if not match:
+        return None
+    repo_id, commit_hash = match.groups()
+    return RepoInfo(
+        repository=f'GitHub-{repo_id[:8]}',
+        pr_number=f'commit-{commit_hash[:8]}',
+        platform='GitHub',
+        full_repo_path=f'GitHub/{repo_id}',
+        repository_id=repo_id,
+        commit_id=commit_hash
+    )
+
+
+def _extract_github_pr(url):
+    """https://github.com/{owner}/{repo}/pull/{number}"""
+    match = _GITHUB_PR_RE.search(url)
+    if not match:
+        return None
+    owner, repo, pr_number = match.groups()
+    return RepoInfo(
+        repository=repo,
+        pr_number=pr_number,
+        platform='GitHub',
+        full_repo_path=f'{owner}/{repo}'
+    )
+
+
+def _extract_azure_pr(url, repo_separator, pr_separator):
+    """Split an Azure DevOps PR URL into repository and PR number"""
+    parts = url.split(repo_separator)
+    if len(parts) <= 1:
+        return None
+    repo_part, found, pr_tail = parts[1].partition(pr_separator)
+    pr_number = pr_tail.split('/')[0] if found else 'unknown'
+    return RepoInfo(
+        repository=repo_part,
+        pr_number=pr_number,
+        platform='Azure DevOps',
+        full_repo_path=repo_part,
+        repository_id=repo_part
+    )
+
+
+def _extract_azure_git_pr(url):
+    """https://dev.azure.com/{org}/{project}/_git/{repo}/pullrequest/{id}"""
+    return _extract_azure_pr(url, '/_git/', '/pullrequest/')
+
+
+def _extract_azure_api_pr(url):
+    """https://dev.azure.com/{org}/{project}/_apis/git/repositories/{repo}/pullRequests/{id}"""
+    return _extract_azure_pr(url, '/repositories/', '/pullRequests/')
+
+
+# Ordered (predicate, extractor) dispatch for PR/commit link URLs; the first
+# matching predicate decides, mirroring the original if/elif cascade
+_PR_URL_EXTRACTORS = (
+    (lambda url: url.startswith('vstfs:///GitHub/PullRequest/'), _extract_vstfs_pr),
+    (lambda url: url.startswith('vstfs:///GitHub/Commit/'), _extract_vstfs_commit),
+    (lambda url: 'github.com' in url.lower(), _extract_github_pr),
+    (lambda url: '_git/' in url and 'pullrequest/' in url, _extract_azure_git_pr),
+    (lambda url: 'repositories/' in url and 'pullRequests/' in url, _extract_azure_api_pr),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_repo_from_pr_url(url):
+    """Extract detailed repository information from PR URL including VSTFS GitHub links
+    
+    Pure on its input, so results are memoized - the same PR is typically linked
+    from several work items (feature, story, task).
+    """
+    default_result = RepoInfo(
+        repository=url,  # Fallback to full URL
+        pr_number='unknown',
+        platform='unknown',
+        full_repo_path=url
+    )
+    
+    try:
+        for matches, extract in _PR_URL_EXTRACTORS:
+            if matches(url):
+                return extract(url) or default_result
+        
+        return default_result
+        
+    except Exception as e:
+        logger.error("Error extracting repo from URL %s: %s", url, e)
+        return default_result
+
+
+class _ChartSpec(NamedTuple):
+    """How to render one breakdown from the analytics summary as a chart"""
+    builder: Callable
+    data_key: str
+    name: str
+    title: str
+    empty_message: str
+    xaxis_title: str = ''
+    yaxis_title: str = ''
+    fast_mode_message: Optional[str] = None
+    requires_detailed: bool = False
+
+
+def _pie_chart(breakdown, spec, days):
+    """Pie chart of a {label: count} breakdown"""
+    fig = go.Figure(data=go.Pie(
+        labels=list(breakdown.keys()),
+        values=list(breakdown.values()),
+        name=spec.name
+    ))
+    fig.update_layout(
+        title=f'{spec.title} - Last {days} days'
+    )
+    return fig
+
+
+def _bar_chart(breakdown, spec, days):
+    """Bar chart of a {label: count} breakdown"""
+    fig = go.Figure(data=go.Bar(
+        x=list(breakdown.keys()),
+        y=list(breakdown.values()),
+        name=spec.name
+    ))
+    fig.update_layout(
+        title=f'{spec.title} - Last {days} days',
+        xaxis_title=spec.xaxis_title,
+        yaxis_title=spec.yaxis_title,
+        hovermode='x unified'
+    )
+    return fig
+
+
+def _overview_chart(values, days, detailed_mode):
+    """Bar chart of the headline totals (work items, pull requests, repositories)"""
+    categories = ['Work Items', 'Pull Requests', 'Repositories']
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
+    
+    fig = go.Figure(data=go.Bar(
+        x=categories,
+        y=values,
+        marker_color=colors,
+        name='Activity Overview'
+    ))
+    fig.update_layout(
+        title=f'Azure DevOps Activity Overview - Last {days} days ({("Detailed" if detailed_mode else "Fast")} Mode)',
+        xaxis_title='Activity Type',
+        yaxis_title='Count',
+        hovermode='x unified'
+    )
+    return fig
+
+
+def _digest(value):
+    """Short, stable fingerprint of JSON-serializable chart input"""
+    encoded = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+def _value_counts(values):
+    """Count occurrences of each value, vectorized with pandas for large inputs"""
+    if len(values) > _VECTORIZE_THRESHOLD:
+        try:
+            import pandas as pd
+        except ImportError:
+            pass
+        else:
+            counts = pd.Series(values, dtype=object).value_counts(sort=False, dropna=False)
+            # Plain ints so the breakdown stays JSON-serializable
+            return {key: int(count) for key, count in counts.items()}
+    return dict(Counter(values))
+
+
+_CHART_SPECS = {
+    'work_items_by_type': _ChartSpec(
+        _pie_chart, 'work_items_by_type', 'Work Items by Type', 'Work Items by Type',
+        "No work items found for the selected time period"),
+    'work_items_by_state': _ChartSpec(
+        _bar_chart, 'work_items_by_state', 'Work Items by State', 'Work Items by State',
+        "No work items found for the selected time period",
+        xaxis_title='State', yaxis_title='Number of Work Items'),
+    'work_items_by_assignee': _ChartSpec(
+        _bar_chart, 'work_items_by_assignee', 'Work Items by Assignee', 'Work Items by Assignee',
+        "No assignee data available",
+        xaxis_title='Assignee', yaxis_title='Number of Work Items'),
+    'prs_by_status': _ChartSpec(
+        _pie_chart, 'prs_by_status', 'Pull Requests by Status', 'Pull Requests by Status',
+        "No pull request status data available",
+        fast_mode_message="PR status data requires detailed mode. Please switch to detailed analysis mode.",
+        requires_detailed=True),
+    'repositories_breakdown': _ChartSpec(
+        _bar_chart, 'repository_breakdown', 'PRs by Repository', 'Pull Requests by Repository',
+        "No repository data available for the selected time period",
+        xaxis_title='Repository', yaxis_title='Number of PRs/Commits',
+        fast_mode_message="Repository data requires detailed mode or no repositories found. Try switching to detailed analysis mode."),
+}
+
 
 class AzureDevOpsAnalytics:
     def __init__(self):
@@ -18,6 +336,178 @@ class AzureDevOpsAnalytics:
         self.organization = Config.AZURE_DEVOPS_ORG
         self.project = Config.AZURE_DEVOPS_PROJECT
         self.area_path = getattr(Config, 'AZURE_DEVOPS_AREA_PATH', '')
+        self._auth_headers = None
+        self._auth_headers_token = None
+        
+        # Shared session so repeated calls to dev.azure.com reuse keep-alive
+        # connections instead of paying a TCP/TLS handshake per request
+        self._session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        self._session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+        self._session.headers.update(self._get_headers() or {})
+        
+        # TTL caches for slow-changing metadata, keyed on the request arguments
+        self._cache_lock = threading.Lock()
+        self._projects_cache = {}
+        self._projects_cache_duration = 3600  # 1 hour in seconds
+        self._area_paths_cache = {}
+        self._area_paths_cache_duration = 600  # 10 minutes in seconds
+        self._repo_name_cache = {}
+        self._repo_name_cache_duration = 86400  # 24 hours - repository IDs never change
+        # IDs Azure DevOps does not know (404), mapped to their fallback resolution
+        self._repo_miss_cache = {}
+        self._repo_miss_cache_duration = 3600  # 1 hour
+        # Organization-wide {repository id: resolved info} from a single list call
+        self._repo_index_cache = {}
+        self._repo_index_cache_duration = 3600  # 1 hour
+        self._repo_name_cache_hits = 0
+        self._repo_name_cache_misses = 0
+        
+        # Long-lived pool for repository resolution so each analytics call reuses
+        # warm worker threads (and their pooled connections) instead of spawning new ones
+        self._resolve_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='ado-resolve')
+        
+        # ETag -> raw body store for conditional GETs; a 304 re-parses the stored body
+        self._etag_cache = {}
+        self._etag_cache_size = 512
+        self._etag_cache_bytes = 0
+        self._etag_cache_max_bytes = 64 * 1024 * 1024  # work item batches can be large
+        
+        # Whole analytics payloads keyed on (method, org, project, area path, days);
+        # dashboards poll far more often than the underlying data changes
+        self._analytics_cache = {}
+        self._analytics_cache_duration = 60  # 1 minute in seconds
+        
+        # Rendered chart JSON keyed on (chart_type, days, detailed_mode, digest of chart input)
+        self._chart_cache = OrderedDict()
+        self._chart_cache_size = 64
+    
+    def close(self):
+        """Close the pooled HTTP session and the resolution worker pool"""
+        self._resolve_executor.shutdown(wait=False)
+        self._session.close()
+    
+    def _cache_get(self, cache, key, duration):
+        """Return a cached value if it is still fresh, otherwise None"""
+        with self._cache_lock:
+            entry = cache.get(key)
+        if entry and time.time() - entry[0] < duration:
+            return entry[1]
+        return None
+    
+    def _cache_set(self, cache, key, value):
+        """Store a value in one of the TTL caches"""
+        with self._cache_lock:
+            cache[key] = (time.time(), value)
+    
+    def _analytics_cache_key(self, kind, days):
+        """Key for the analytics cache; includes a short hash of the PAT so a new token never sees old results"""
+        token_hash = hashlib.blake2b((self.pat_token or '').encode(), digest_size=8).hexdigest()
+        return (kind, self.organization, self.project, self.area_path, days, token_hash)
+    
+    @staticmethod
+    def _shared_result(result):
+        """Copy of a cached analytics result down to its data dict, so callers can set keys without
+        touching the cache; nested values are shared and must be copied by anyone who keeps them"""
+        return {**result, 'data': dict(result['data'])}
+    
+    def _json(self, response):
+        """Parse a response body with orjson"""
+        return orjson.loads(response.content)
+    
+    def _conditional_get(self, url, headers=None, params=None, timeout=30):
+        """GET with If-None-Match; returns (response, payload) where payload is None on failure
+        
+        The raw body is stored and re-parsed on a 304, so callers always get their own
+        objects and can mutate them (e.g. attaching associated_prs) without affecting others.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._cache_lock:
+            entry = self._etag_cache.get(key)
+        
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers['If-None-Match'] = entry[0]
+        
+        response = self._session.get(url, headers=request_headers, params=params, timeout=timeout)
+        
+        if response.status_code == 304 and entry:
+            return response, orjson.loads(entry[1])
+        if response.status_code != 200:
+            return response, None
+        
+        content = response.content
+        payload = orjson.loads(content)
+        etag = response.headers.get('ETag')
+        if etag:
+            with self._cache_lock:
+                previous = self._etag_cache.pop(key, None)
+                if previous:
+                    self._etag_cache_bytes -= len(previous[1])
+                while self._etag_cache and (len(self._etag_cache) >= self._etag_cache_size or
+                                            self._etag_cache_bytes + len(content) > self._etag_cache_max_bytes):
+                    evicted = self._etag_cache.pop(next(iter(self._etag_cache)))
+                    self._etag_cache_bytes -= len(evicted[1])
+                self._etag_cache[key] = (etag, content)
+                self._etag_cache_bytes += len(content)
+        return response, payload
+    
+    def get_cache_stats(self):
+        """Repository resolution cache counters for monitoring"""
+        with self._cache_lock:
+            return {
+                'repo_name_cache_hits': self._repo_name_cache_hits,
+                'repo_name_cache_misses': self._repo_name_cache_misses,
+                'repo_name_cache_size': len(self._repo_name_cache) + len(self._repo_miss_cache)
+            }
+    
+    def bust_cache(self):
+        """Clear the project, area path, repository name and analytics caches"""
+        with self._cache_lock:
+            self._projects_cache.clear()
+            self._area_paths_cache.clear()
+            self._repo_name_cache.clear()
+            self._repo_miss_cache.clear()
+            self._repo_index_cache.clear()
+            self._etag_cache.clear()
+            self._etag_cache_bytes = 0
+            self._chart_cache.clear()
+            self._analytics_cache.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+        
+    def _respect_rate_limit(self, response):
+        """Back off only when Azure DevOps signals throttling via Retry-After or X-RateLimit-* headers"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = 1.0
+            time.sleep(min(delay, _MAX_RATE_LIMIT_DELAY))
+            return
+        
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        
+        try:
+            remaining = float(remaining)
+            if remaining >= _RATE_LIMIT_LOW_WATERMARK:
+                return
+            # Spread the remaining budget evenly over the time left until the window resets
+            reset_at = float(response.headers.get('X-RateLimit-Reset', 0))
+            delay = max(reset_at - time.time(), 0) / max(remaining, 1)
+        except ValueError:
+            return
+        
+        if delay > 0:
+            time.sleep(min(delay, _MAX_RATE_LIMIT_DELAY))
         
     def _get_base_url(self):
         """Get the base URL for Azure DevOps API"""
@@ -26,50 +516,52 @@ class AzureDevOpsAnalytics:
         return f"https://dev.azure.com/{self.organization}/{self.project}/_apis"
         
     def _get_headers(self):
-        """Get authentication headers for Azure DevOps API"""
+        """Get authentication headers for Azure DevOps API (encoded once per PAT)"""
         if not self.pat_token:
             return None
         
-        # Create Basic Auth header with PAT
-        credentials = base64.b64encode(f":{self.pat_token}".encode()).decode()
-        return {
-            'Authorization': f'Basic {credentials}',
-            'Content-Type': 'application/json'
-        }
+        if self._auth_headers_token != self.pat_token:
+            # Create Basic Auth header with PAT
+            credentials = base64.b64encode(f":{self.pat_token}".encode()).decode()
+            self._auth_headers = {
+                'Authorization': f'Basic {credentials}',
+                'Content-Type': 'application/json'
+            }
+            self._auth_headers_token = self.pat_token
+        return self._auth_headers
     
     def get_work_items(self, work_item_type=None, state=None, days=30):
         """Optimized work items fetch with area path and date filtering for better performance"""
-        print(f"📋 OPTIMIZED: Getting work items for area path: '{self.area_path}' within last {days} days")
+        logger.debug("Getting work items for area path %r within last %s days", self.area_path, days)
         
         if not self.pat_token or not self.organization or not self.project:
-            print("📋 ERROR: Missing token, org, or project")
+            logger.error("Missing Azure DevOps token, organization or project")
             return None
             
         base_url = self._get_base_url()
         if not base_url:
-            print("📋 ERROR: Could not get base URL")
+            logger.error("Could not build the Azure DevOps base URL")
             return None
             
         try:
             # Calculate date filter based on days parameter
-            from datetime import datetime, timedelta
             cutoff_date = datetime.now() - timedelta(days=days)
             date_filter = cutoff_date.strftime('%Y-%m-%d')
             
             # OPTIMIZED WIQL query with date filtering
             if self.area_path:
-                area_filter = f"[System.AreaPath] = '{self.area_path}'"
-                print(f"📋 OPTIMIZED: Using exact area path match: {self.area_path}")
+                area_filter = f"[System.AreaPath] = {_wiql_quote(self.area_path)}"
+                logger.debug("Using exact area path match: %s", self.area_path)
             else:
                 area_filter = ""  # No area filter
-                print("📋 OPTIMIZED: No area path filter - all work items from project")
+                logger.debug("No area path filter - all work items from project")
             
             # Enhanced WIQL query with date filtering
             if area_filter:
                 wiql_query = f"""
                 SELECT [System.Id], [System.Title], [System.WorkItemType], [System.State], [System.CreatedDate]
                 FROM WorkItems 
-                WHERE [System.TeamProject] = '{self.project}' 
+                WHERE [System.TeamProject] = @project 
                 AND {area_filter}
                 AND [System.CreatedDate] >= '{date_filter}'
                 """
@@ -77,23 +569,23 @@ class AzureDevOpsAnalytics:
                 wiql_query = f"""
                 SELECT [System.Id], [System.Title], [System.WorkItemType], [System.State], [System.CreatedDate]
                 FROM WorkItems 
-                WHERE [System.TeamProject] = '{self.project}' 
+                WHERE [System.TeamProject] = @project 
                 AND [System.CreatedDate] >= '{date_filter}'
                 """
             
             # Add optional filters
             if work_item_type:
-                wiql_query += f" AND [System.WorkItemType] = '{work_item_type}'"
-                print(f"📋 OPTIMIZED: Applied work item type filter: {work_item_type}")
+                wiql_query += f" AND [System.WorkItemType] = {_wiql_quote(work_item_type)}"
+                logger.debug("Applied work item type filter: %s", work_item_type)
                 
             if state:
-                wiql_query += f" AND [System.State] = '{state}'"
-                print(f"📋 OPTIMIZED: Applied state filter: {state}")
+                wiql_query += f" AND [System.State] = {_wiql_quote(state)}"
+                logger.debug("Applied state filter: %s", state)
             
             # Order by creation date (most recent first)
             wiql_query += " ORDER BY [System.CreatedDate] DESC"
             
-            print(f"📋 OPTIMIZED WIQL with date filter ({days} days): {wiql_query}")
+            logger.debug("WIQL with date filter (%s days): %s", days, wiql_query)
             
             # Remove the top limit to get all work items within the date range
             url = f"{base_url}/wit/wiql?api-version=6.0"
@@ -101,16 +593,14 @@ class AzureDevOpsAnalytics:
             
             payload = {"query": wiql_query}
             
-            print(f"📋 OPTIMIZED: Making request to {url}")
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            
-            print(f"📋 OPTIMIZED Response: {response.status_code}")
+            response = self._session.post(url, headers=headers, json=payload, timeout=30)
+            logger.debug("WIQL request to %s returned %s", url, response.status_code)
             
             if response.status_code == 200:
-                wiql_result = response.json()
+                wiql_result = self._json(response)
                 work_item_ids = [item['id'] for item in wiql_result.get('workItems', [])]
                 
-                print(f"📋 OPTIMIZED: Found {len(work_item_ids)} work items in area path within last {days} days")
+                logger.debug("Found %s work items in area path within last %s days", len(work_item_ids), days)
                 
                 if not work_item_ids:
                     return []
@@ -118,51 +608,81 @@ class AzureDevOpsAnalytics:
                 # Get basic details for all work items found within date range
                 return self._get_work_item_basic_details(work_item_ids, base_url)
             else:
-                print(f"📋 OPTIMIZED ERROR: {response.status_code} - {response.text}")
+                logger.error("Work items query failed: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"📋 OPTIMIZED ERROR: {e}")
+            logger.error("Error fetching work items: %s", e)
+            return None
+    
+    def _get_work_items_batch(self, work_item_ids, base_url, fields=None, expand=None, timeout=30,
+                              preserve_positions=False):
+        """Fetch work items by id, fanning out 200-id chunks concurrently
+        
+        Returns the work items in request order, or None if any chunk fails. With
+        preserve_positions=True, items that could not be read stay as None so the
+        result lines up index-for-index with work_item_ids.
+        """
+        url = f"{base_url}/wit/workitems"
+        headers = self._get_headers()
+        chunks = [work_item_ids[i:i + _WORK_ITEMS_BATCH_SIZE]
+                  for i in range(0, len(work_item_ids), _WORK_ITEMS_BATCH_SIZE)]
+        
+        def fetch_chunk(chunk_ids):
+            # GET (rather than the workitemsbatch POST) so unchanged chunks come
+            # back as 304 Not Modified through the ETag cache
+            params = {'ids': ','.join(map(str, chunk_ids)), 'errorPolicy': 'omit', 'api-version': '6.0'}
+            if fields:
+                params['fields'] = ','.join(fields)
+            if expand:
+                params['$expand'] = expand
+            
+            response, result = self._conditional_get(url, headers=headers, params=params, timeout=timeout)
+            self._respect_rate_limit(response)
+            if result is None:
+                logger.error("Work items batch request failed: %s - %s", response.status_code, response.text)
+                return None
+            return result.get('value', [])
+        
+        if len(chunks) <= 1:
+            results = [fetch_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_BATCH_WORKERS, len(chunks))) as executor:
+                results = list(executor.map(fetch_chunk, chunks))
+        
+        if any(result is None for result in results):
             return None
+        
+        # errorPolicy=omit leaves null entries for deleted/inaccessible items
+        return [item for result in results for item in result if item or preserve_positions]
     
     def _get_work_item_basic_details(self, work_item_ids, base_url):
         """Fast work item details fetch without PR analysis"""
         try:
-            url = f"{base_url}/wit/workitems?api-version=6.0"
-            headers = self._get_headers()
+            logger.debug("Getting basic details for %s work items", len(work_item_ids))
             
             # Minimal field set for fastest response
-            params = {
-                'ids': ','.join(map(str, work_item_ids)),
-                'fields': 'System.Id,System.Title,System.State,System.WorkItemType,System.CreatedDate,System.AreaPath,System.AssignedTo'
-            }
+            work_items = self._get_work_items_batch(work_item_ids, base_url, fields=list(ANALYTICS_FIELDS), timeout=15)
             
-            print(f"📋 FAST: Getting basic details for {len(work_item_ids)} work items")
+            if work_items is None:
+                logger.error("Work items batch request failed")
+                return None
             
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            logger.debug("Retrieved %s work items", len(work_items))
             
-            print(f"📋 FAST Response: {response.status_code}")
+            # Initialize with empty PR lists for compatibility
+            for work_item in work_items:
+                work_item['associated_prs'] = []
             
-            if response.status_code == 200:
-                work_items = response.json().get('value', [])
-                print(f"📋 FAST: Retrieved {len(work_items)} work items")
-                
-                # Initialize with empty PR lists for compatibility
-                for work_item in work_items:
-                    work_item['associated_prs'] = []
-                
-                return work_items
-            else:
-                print(f"📋 FAST ERROR: {response.status_code} - {response.text}")
-                return None
+            return work_items
                 
         except Exception as e:
-            print(f"📋 FAST ERROR: {e}")
+            logger.error("Error fetching work item details: %s", e)
             return None
     
     def get_work_items_with_github_prs(self, work_item_type=None, state=None, days=30):
         """Get work items with detailed GitHub PR analysis - respects date filtering"""
-        print(f"📋 GITHUB PR ANALYSIS: Starting comprehensive analysis for area: '{self.area_path}' within last {days} days")
+        logger.debug("Starting GitHub PR analysis for area path %r within last %s days", self.area_path, days)
         
         if not self.pat_token or not self.organization or not self.project:
             return None
@@ -172,173 +692,156 @@ class AzureDevOpsAnalytics:
             return None
             
         try:
-            # Calculate date filter based on days parameter
-            from datetime import datetime, timedelta
-            cutoff_date = datetime.now() - timedelta(days=days)
-            date_filter = cutoff_date.strftime('%Y-%m-%d')
+            work_item_ids = self._query_github_pr_work_item_ids(base_url, work_item_type, state, days)
             
-            # Use area path filtering with date filtering
-            if self.area_path:
-                area_filter = f"[System.AreaPath] UNDER '{self.area_path}'"
-                print(f"📋 GITHUB PR: Using UNDER area path filter: {self.area_path}")
-            else:
-                area_filter = ""
-            
-            # Full field selection for PR analysis with date filtering
-            if area_filter:
-                wiql_query = f"""
-                SELECT [System.Id], [System.Title], [System.State], [System.WorkItemType], 
-                       [System.CreatedDate], [System.ChangedDate], [System.AssignedTo], [System.AreaPath]
-                FROM WorkItems 
-                WHERE [System.TeamProject] = '{self.project}' 
-                AND {area_filter}
-                AND [System.CreatedDate] >= '{date_filter}'
-                ORDER BY [System.ChangedDate] DESC
-                """
-            else:
-                wiql_query = f"""
-                SELECT [System.Id], [System.Title], [System.State], [System.WorkItemType], 
-                       [System.CreatedDate], [System.ChangedDate], [System.AssignedTo], [System.AreaPath]
-                FROM WorkItems 
-                WHERE [System.TeamProject] = '{self.project}' 
-                AND [System.CreatedDate] >= '{date_filter}'
-                ORDER BY [System.ChangedDate] DESC
-                """
+            if work_item_ids is None:
+                return None
+            if not work_item_ids:
+                return []
             
-            if work_item_type:
-                wiql_query += f" AND [System.WorkItemType] = '{work_item_type}'"
+            # Use detailed method with PR analysis for all work items in date range
+            return self._get_work_item_details(work_item_ids, base_url)
                 
-            if state:
-                wiql_query += f" AND [System.State] = '{state}'"
-            
-            print(f"📋 GITHUB PR WIQL with date filter ({days} days): {wiql_query}")
+        except Exception as e:
+            logger.error("Error fetching work items with GitHub PRs: %s", e)
+            return None
+    
+    def iter_work_items_with_github_prs(self, work_item_type=None, state=None, days=30):
+        """Streaming variant of get_work_items_with_github_prs
+        
+        Yields lists of work items (with associated_prs) as each batch completes, so
+        callers can render partial results while the remaining batches are in flight.
+        Batches arrive in completion order, not WIQL order.
+        """
+        if not self.pat_token or not self.organization or not self.project:
+            return
             
-            # Remove top limit to get all work items within date range
-            url = f"{base_url}/wit/wiql?api-version=6.0"
-            headers = self._get_headers()
-            payload = {"query": wiql_query}
+        base_url = self._get_base_url()
+        if not base_url:
+            return
+        
+        work_item_ids = self._query_github_pr_work_item_ids(base_url, work_item_type, state, days)
+        if not work_item_ids:
+            return
+        
+        chunks = [work_item_ids[i:i + _WORK_ITEMS_BATCH_SIZE]
+                  for i in range(0, len(work_item_ids), _WORK_ITEMS_BATCH_SIZE)]
+        
+        with ThreadPoolExecutor(max_workers=min(_MAX_BATCH_WORKERS, len(chunks))) as executor:
+            futures = [executor.submit(self._get_work_item_details, chunk, base_url) for chunk in chunks]
+            for future in as_completed(futures):
+                work_items = future.result()
+                if work_items:
+                    yield work_items
+    
+    def _query_github_pr_work_item_ids(self, base_url, work_item_type, state, days):
+        """Run the PR-analysis WIQL query and return the matching work item ids (None on API error)"""
+        # Calculate date filter based on days parameter
+        cutoff_date = datetime.now() - timedelta(days=days)
+        date_filter = cutoff_date.strftime('%Y-%m-%d')
+        
+        # Use area path filtering with date filtering
+        if self.area_path:
+            area_filter = f"[System.AreaPath] UNDER {_wiql_quote(self.area_path)}"
+            logger.debug("Using UNDER area path filter: %s", self.area_path)
+        else:
+            area_filter = ""
+        
+        # Full field selection for PR analysis with date filtering
+        if area_filter:
+            wiql_query = f"""
+            SELECT [System.Id], [System.Title], [System.State], [System.WorkItemType], 
+                   [System.CreatedDate], [System.ChangedDate], [System.AssignedTo], [System.AreaPath]
+            FROM WorkItems 
+            WHERE [System.TeamProject] = @project 
+            AND {area_filter}
+            AND [System.CreatedDate] >= '{date_filter}'
+            """
+        else:
+            wiql_query = f"""
+            SELECT [System.Id], [System.Title], [System.State], [System.WorkItemType], 
+                   [System.CreatedDate], [System.ChangedDate], [System.AssignedTo], [System.AreaPath]
+            FROM WorkItems 
+            WHERE [System.TeamProject] = @project 
+            AND [System.CreatedDate] >= '{date_filter}'
+            """
+        
+        if work_item_type:
+            wiql_query += f" AND [System.WorkItemType] = {_wiql_quote(work_item_type)}"
             
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+        if state:
+            wiql_query += f" AND [System.State] = {_wiql_quote(state)}"
+        
+        # ORDER BY must follow every WHERE clause, including the optional filters
+        wiql_query += " ORDER BY [System.ChangedDate] DESC"
+        
+        logger.debug("GitHub PR WIQL with date filter (%s days): %s", days, wiql_query)
+        
+        # Remove top limit to get all work items within date range
+        url = f"{base_url}/wit/wiql?api-version=6.0"
+        headers = self._get_headers()
+        payload = {"query": wiql_query}
+        
+        response = self._session.post(url, headers=headers, json=payload, timeout=30)
+        
+        if response.status_code == 200:
+            wiql_result = self._json(response)
+            work_item_ids = [item['id'] for item in wiql_result.get('workItems', [])]
             
-            if response.status_code == 200:
-                wiql_result = response.json()
-                work_item_ids = [item['id'] for item in wiql_result.get('workItems', [])]
-                
-                print(f"📋 GITHUB PR: Found {len(work_item_ids)} work items for PR analysis within last {days} days")
-                
-                if not work_item_ids:
-                    return []
-                
-                # Use detailed method with PR analysis for all work items in date range
-                return self._get_work_item_details(work_item_ids, base_url)
-            else:
-                print(f"📋 GITHUB PR ERROR: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"📋 GITHUB PR ERROR: {e}")
-            return None
+            logger.debug("Found %s work items for PR analysis within last %s days", len(work_item_ids), days)
+            return work_item_ids
+        
+        logger.error("GitHub PR work items query failed: %s - %s", response.status_code, response.text)
+        return None
     
     def _get_work_item_details(self, work_item_ids, base_url):
         """Get detailed information for work items including linked PRs with optimized batch processing"""
         try:
             # First get basic work item details
-            url = f"{base_url}/wit/workitems?api-version=6.0"
-            headers = self._get_headers()
+            logger.debug("Getting details for %s work items", len(work_item_ids))
             
-            params = {
-                'ids': ','.join(map(str, work_item_ids)),
-                'fields': 'System.Id,System.Title,System.State,System.WorkItemType,System.CreatedDate,System.ChangedDate,System.AssignedTo,System.Tags,System.AreaPath'
-            }
-            
-            print(f"Azure DevOps: Getting basic details for {len(work_item_ids)} work items")
-            print(f"Azure DevOps: Request URL: {url}")
-            
-            response = requests.get(url, headers=headers, params=params)
+            work_items = self._get_work_items_batch(work_item_ids, base_url, fields=list(PR_ANALYSIS_FIELDS))
             
-            print(f"Azure DevOps Work Items Details Response: {response.status_code}")
-            
-            if response.status_code == 200:
-                work_items = response.json().get('value', [])
-                print(f"Azure DevOps: Retrieved details for {len(work_items)} work items")
-                
-                # Initialize all work items with empty PR lists
-                work_items_dict = {item['id']: item for item in work_items}
-                for work_item in work_items:
-                    work_item['associated_prs'] = []
-                
-                # Get PR relations using optimized batch processing
-                print("🔗 Starting GitHub PR analysis for work items...")
-                pr_links_with_ids = self._get_work_items_with_relations_batch([item['id'] for item in work_items], base_url)
-                
-                # Assign PR links to their respective work items
-                for work_item_id, pr_link in pr_links_with_ids:
-                    if work_item_id in work_items_dict:
-                        work_items_dict[work_item_id]['associated_prs'].append(pr_link)
+            if work_items is not None:
+                logger.debug("Retrieved details for %s work items", len(work_items))
                 
+                self._attach_pr_links(work_items, base_url)
                 return work_items
             else:
-                print(f"Azure DevOps API Error: {response.status_code} - {response.text}")
+                logger.error("Work items batch request failed")
                 return None
                 
         except Exception as e:
-            print(f"Error fetching work item details: {e}")
+            logger.error("Error fetching work item details: %s", e)
             return None
     
-    def _get_work_item_relations(self, work_item_id, base_url):
-        """Get PR relations for a specific work item with improved error handling"""
-        try:
-            # Get work item with relations expanded
-            url = f"{base_url}/wit/workitems/{work_item_id}?api-version=6.0&$expand=relations"
-            headers = self._get_headers()
-            
-            # Add timeout and retry logic
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                work_item_data = response.json()
-                return self._extract_pr_links(work_item_data)
-            else:
-                # Don't spam logs for individual failures, just return empty
-                return []
-                
-        except Exception as e:
-            # Don't spam logs for network issues, just return empty
-            return []
-
-    def _get_work_items_with_relations_batch(self, work_item_ids, base_url):
-        """Get work items with relations in smaller batches to avoid network issues"""
-        all_pr_links = []
-        successful_fetches = 0
-        batch_size = 10  # Process in smaller batches
-        
-        print(f"🔗 Fetching PR relations for {len(work_item_ids)} work items in batches of {batch_size}")
-        
-        for i in range(0, len(work_item_ids), batch_size):
-            batch_ids = work_item_ids[i:i + batch_size]
-            batch_success = 0
-            
-            for work_item_id in batch_ids:
-                try:
-                    pr_links = self._get_work_item_relations(work_item_id, base_url)
-                    if pr_links:  # Only count if we found PR links
-                        all_pr_links.extend([(work_item_id, link) for link in pr_links])
-                        batch_success += 1
-                    successful_fetches += 1
-                except Exception:
-                    continue
-            
-            if batch_success > 0:
-                print(f"🔗 Batch {i//batch_size + 1}: Found PR links in {batch_success} work items")
-            
-            # Small delay between batches to avoid overwhelming the API
-            import time
-            time.sleep(0.1)
-        
-        print(f"🔗 Successfully processed {successful_fetches}/{len(work_item_ids)} work items")
-        print(f"🔗 Found {len(all_pr_links)} total PR links")
-        
-        return all_pr_links
+    def _attach_pr_links(self, work_items, base_url):
+        """Set 'associated_prs' on already-fetched work items, fetching relations in batches"""
+        # Initialize all work items with empty PR lists
+        for work_item in work_items:
+            work_item['associated_prs'] = []
+        
+        # Get PR relations only for work item types that can have PRs
+        pr_candidates = [item for item in work_items
+                         if item.get('fields', {}).get('System.WorkItemType') in _PR_BEARING_TYPES]
+        logger.info("Starting GitHub PR analysis for %s/%s PR-bearing work items", len(pr_candidates), len(work_items))
+        
+        expanded_items = self._get_work_items_batch(
+            [item['id'] for item in pr_candidates], base_url,
+            expand='Relations', preserve_positions=True
+        )
+        
+        if expanded_items is None:
+            logger.warning("Relations batch request failed - returning work items without PR links")
+            return
+        
+        # The batch response is positional, so attach PR links in a single pass
+        for work_item, expanded in zip(pr_candidates, expanded_items):
+            if expanded:
+                work_item['associated_prs'] = self._extract_pr_links(expanded)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Found %s total PR links", sum(len(item['associated_prs']) for item in pr_candidates))
     
     def _extract_pr_links(self, work_item):
         """Extract PR links from work item relations, with precise development work detection"""
@@ -347,52 +850,52 @@ class AzureDevOpsAnalytics:
         
         # Only log for first few work items to avoid spam
         work_item_id = work_item.get('id', 'unknown')
-        should_log = int(str(work_item_id)[-1]) < 3  # Log ~30% of work items
+        should_log = logger.isEnabledFor(logging.DEBUG) and str(work_item_id)[-1:] in '012'  # Log ~30% of work items
         
         if should_log:
-            print(f"🔍 Analyzing work item {work_item_id} - found {len(relations)} relations")
+            logger.debug("Analyzing work item %s - found %s relations", work_item_id, len(relations))
         
         for relation in relations:
             rel_type = relation.get('rel', '').lower()
+            
+            # Cheap rel_type check first - most relations are hierarchy/related links
+            if rel_type not in _CANDIDATE_REL_TYPES and not any(s in rel_type for s in _PR_REL_TYPE_SUBSTRS):
+                continue
+            
             url = relation.get('url', '')
+            url_lc = url.lower()
             attributes = relation.get('attributes', {})
             
             # PRECISE PR detection - focus on actual development work relations
-            is_pr_link = any([
+            is_pr_link = (
                 # Exact Azure DevOps development relation types
-                rel_type == 'artifactlink',
-                'pullrequest' in rel_type,
-                'development' in rel_type and 'work' in rel_type,
+                rel_type == 'artifactlink'
+                or 'pullrequest' in rel_type
+                or ('development' in rel_type and 'work' in rel_type)
                 
                 # GitHub URLs (external links)
-                'github.com' in url.lower() and 'pull/' in url,
+                or ('github.com' in url_lc and 'pull/' in url)
                 
                 # Azure DevOps Git PR URLs
-                '_git/' in url.lower() and 'pullrequest' in url.lower(),
-                'repositories/' in url.lower() and 'pullrequests' in url.lower(),
+                or ('_git/' in url_lc and 'pullrequest' in url_lc)
+                or ('repositories/' in url_lc and 'pullrequests' in url_lc)
                 
                 # External hyperlinks that could be PRs
-                rel_type == 'hyperlink' and any([
-                    'github.com' in url.lower() and 'pull/' in url,
-                    'pull/' in url.lower(),
-                    'pr/' in url.lower(),
-                    'pullrequest' in url.lower()
-                ])
-            ])
+                or (rel_type == 'hyperlink' and (
+                    'pull/' in url_lc
+                    or 'pr/' in url_lc
+                    or 'pullrequest' in url_lc
+                ))
+            )
             
             if is_pr_link:
                 if should_log:
-                    print(f"    ✅ Found PR link: {rel_type} -> {url}")
-                repo_info = self._extract_repo_from_pr_url(url)
+                    logger.debug("Found PR link: %s -> %s", rel_type, url)
+                repo_info = _extract_repo_from_pr_url(url)
                 pr_info = {
                     'relation_type': rel_type,
                     'url': url,
-                    'repository': repo_info['repository'],
-                    'pr_number': repo_info['pr_number'],
-                    'platform': repo_info['platform'],
-                    'full_repo_path': repo_info['full_repo_path'],
-                    'repository_id': repo_info.get('repository_id'),
-                    'commit_id': repo_info.get('commit_id'),
+                    **repo_info._asdict(),
                     'attributes': attributes
                 }
                 
@@ -402,116 +905,15 @@ class AzureDevOpsAnalytics:
                 pr_links.append(pr_info)
             elif should_log and ('hyperlink' in rel_type or 'artifact' in rel_type):
                 # Log potential external links for analysis
-                print(f"    ℹ️  External link: {rel_type} -> {url[:100]}...")
+                logger.debug("External link: %s -> %.100s", rel_type, url)
         
         if pr_links and should_log:
-            print(f"  🎯 Found {len(pr_links)} PR links for work item {work_item_id}")
+            logger.debug("Found %s PR links for work item %s", len(pr_links), work_item_id)
         elif should_log:
-            print(f"  ⚠️  No PR links found for work item {work_item_id}")
+            logger.debug("No PR links found for work item %s", work_item_id)
             
         return pr_links
     
-    def _extract_repo_from_pr_url(self, url):
-        """Extract detailed repository information from PR URL including VSTFS GitHub links"""
-        default_result = {
-            'repository': url,  # Fallback to full URL
-            'pr_number': 'unknown',
-            'platform': 'unknown',
-            'full_repo_path': url,
-            'repository_id': None,
-            'commit_id': None
-        }
-        
-        try:
-            # VSTFS GitHub PR URLs: vstfs:///GitHub/PullRequest/{repo-id}%2f{pr-number}
-            if url.startswith('vstfs:///GitHub/PullRequest/'):
-                import re
-                vstfs_match = re.search(r'vstfs:///GitHub/PullRequest/([^%]+)%2f(\d+)', url)
-                if vstfs_match:
-                    repo_id, pr_number = vstfs_match.groups()
-                    return {
-                        'repository': f'GitHub-{repo_id[:8]}',  # Shortened repo ID
-                        'pr_number': pr_number,
-                        'platform': 'GitHub',
-                        'full_repo_path': f'GitHub/{repo_id}',
-                        'repository_id': repo_id,
-                        'commit_id': None
-                    }
-            
-            # VSTFS GitHub Commit URLs: vstfs:///GitHub/Commit/{repo-id}%2f{commit-hash}
-            elif url.startswith('vstfs:///GitHub/Commit/'):
-                import re
-                vstfs_commit_match = re.search(r'vstfs:///GitHub/Commit/([^%]+)%2f([a-f0-9]+)', url)
-                if vstfs_commit_match:
-                    repo_id, commit_hash = vstfs_commit_match.groups()
-                    return {
-                        'repository': f'GitHub-{repo_id[:8]}',
-                        'pr_number': f'commit-{commit_hash[:8]}',
-                        'platform': 'GitHub',
-                        'full_repo_path': f'GitHub/{repo_id}',
-                        'repository_id': repo_id,
-                        'commit_id': commit_hash
-                    }
-            
-            # Standard GitHub PR URLs: https://github.com/{owner}/{repo}/pull/{number}
-            elif 'github.com' in url.lower():
-                import re
-                github_match = re.search(r'github\.com/([^/]+)/([^/]+)/pull/(\d+)', url)
-                if github_match:
-                    owner, repo, pr_number = github_match.groups()
-                    return {
-                        'repository': repo,
-                        'pr_number': pr_number,
-                        'platform': 'GitHub',
-                        'full_repo_path': f'{owner}/{repo}',
-                        'repository_id': None,
-                        'commit_id': None
-                    }
-            
-            # Azure DevOps PR URLs: 
-            # https://dev.azure.com/{org}/{project}/_git/{repo}/pullrequest/{id}
-            elif '_git/' in url and 'pullrequest/' in url:
-                parts = url.split('/_git/')
-                if len(parts) > 1:
-                    repo_and_pr = parts[1]
-                    repo_part = repo_and_pr.split('/pullrequest/')[0]
-                    pr_match = repo_and_pr.split('/pullrequest/')
-                    pr_number = pr_match[1].split('/')[0] if len(pr_match) > 1 else 'unknown'
-                    
-                    return {
-                        'repository': repo_part,
-                        'pr_number': pr_number,
-                        'platform': 'Azure DevOps',
-                        'full_repo_path': repo_part,
-                        'repository_id': repo_part,
-                        'commit_id': None
-                    }
-            
-            # Azure DevOps API URLs:
-            # https://dev.azure.com/{org}/{project}/_apis/git/repositories/{repo}/pullRequests/{id}
-            elif 'repositories/' in url and 'pullRequests/' in url:
-                parts = url.split('/repositories/')
-                if len(parts) > 1:
-                    repo_and_pr = parts[1]
-                    repo_part = repo_and_pr.split('/pullRequests/')[0]
-                    pr_match = repo_and_pr.split('/pullRequests/')
-                    pr_number = pr_match[1].split('/')[0] if len(pr_match) > 1 else 'unknown'
-                    
-                    return {
-                        'repository': repo_part,
-                        'pr_number': pr_number,
-                        'platform': 'Azure DevOps',
-                        'full_repo_path': repo_part,
-                        'repository_id': repo_part,
-                        'commit_id': None
-                    }
-            
-            return default_result
-            
-        except Exception as e:
-            print(f"Error extracting repo from URL {url}: {e}")
-            return default_result
-    
     def get_commit_details(self, repository_id, commit_id):
         """Get detailed commit information from Azure DevOps"""
         if not self.pat_token or not self.organization or not self.project:
@@ -521,16 +923,16 @@ class AzureDevOpsAnalytics:
             url = f"https://dev.azure.com/{self.organization}/{self.project}/_apis/git/repositories/{repository_id}/commits/{commit_id}?api-version=7.0"
             headers = self._get_headers()
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self._session.get(url, headers=headers, timeout=15)
             
             if response.status_code == 200:
-                return response.json()
+                return self._json(response)
             else:
-                print(f"Failed to get commit details: {response.status_code} - {response.text}")
+                logger.error("Failed to get commit details: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"Error fetching commit details: {e}")
+            logger.error("Error fetching commit details: %s", e)
             return None
     
     def get_pr_details(self, repository_id, pull_request_id):
@@ -542,16 +944,16 @@ class AzureDevOpsAnalytics:
             url = f"https://dev.azure.com/{self.organization}/{self.project}/_apis/git/repositories/{repository_id}/pullRequests/{pull_request_id}?api-version=7.0"
             headers = self._get_headers()
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self._session.get(url, headers=headers, timeout=15)
             
             if response.status_code == 200:
-                return response.json()
+                return self._json(response)
             else:
-                print(f"Failed to get PR details: {response.status_code} - {response.text}")
+                logger.error("Failed to get PR details: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"Error fetching PR details: {e}")
+            logger.error("Error fetching PR details: %s", e)
             return None
     
     def enrich_pr_with_details(self, pr_info):
@@ -588,7 +990,7 @@ class AzureDevOpsAnalytics:
             return pr_info
             
         except Exception as e:
-            print(f"Error enriching PR details: {e}")
+            logger.error("Error enriching PR details: %s", e)
             return pr_info
     
     def get_pull_requests(self, status=None, days=30):
@@ -596,14 +998,14 @@ class AzureDevOpsAnalytics:
         if not self.pat_token or not self.organization or not self.project:
             return None
             
-        print(f"🔀 ENHANCED: Getting PRs from work item relations instead of direct Git API")
+        logger.debug("Getting PRs from work item relations")
         
         try:
             # Get work items with PR relations to extract recent PRs
             work_items = self.get_work_items_with_github_prs()
             
             if not work_items:
-                print("🔀 No work items found for PR extraction")
+                logger.debug("No work items found for PR extraction")
                 return []
             
             # Extract all PRs from work items
@@ -653,11 +1055,11 @@ class AzureDevOpsAnalytics:
             # Sort by creation date (most recent first)
             all_prs.sort(key=lambda x: x.get('creationDate', ''), reverse=True)
             
-            print(f"🔀 ENHANCED: Found {len(all_prs)} recent PRs from work item relations")
+            logger.debug("Found %s recent PRs from work item relations", len(all_prs))
             return all_prs[:1000]  # Return top 1000 recent PRs
             
         except Exception as e:
-            print(f"🔀 Error fetching PRs from work item relations: {e}")
+            logger.error("Error fetching PRs from work item relations: %s", e)
             return []
     
     def get_area_paths(self):
@@ -668,92 +1070,93 @@ class AzureDevOpsAnalytics:
         base_url = self._get_base_url()
         if not base_url:
             return None
+        
+        cache_key = (self.organization, self.project)
+        cached = self._cache_get(self._area_paths_cache, cache_key, self._area_paths_cache_duration)
+        if cached is not None:
+            logger.debug("Using cached area paths for %s", self.project)
+            return cached
             
         try:
             # Simple query to get unique area paths from work items
-            wiql_query = f"""
-            SELECT [System.AreaPath]
-            FROM WorkItems 
-            WHERE [System.TeamProject] = '{self.project}'
-            """
-            
             url = f"{base_url}/wit/wiql?api-version=6.0&$top=1000"
             headers = self._get_headers()
             
-            payload = {"query": wiql_query}
+            payload = {"query": _WIQL_AREA_PATHS}
             
-            print(f"🗂️ Azure DevOps: Getting area paths from {url}")
+            logger.debug("Getting area paths from %s", url)
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = self._session.post(url, headers=headers, json=payload)
             
             if response.status_code == 200:
-                wiql_result = response.json()
+                wiql_result = self._json(response)
                 work_item_ids = [item['id'] for item in wiql_result.get('workItems', [])]
                 
                 if not work_item_ids:
                     return []
                 
-                # Get work item details to extract area paths
-                details_url = f"{base_url}/wit/workitems?api-version=6.0"
-                params = {
-                    'ids': ','.join(map(str, work_item_ids[:100])),  # Limit to 100 for performance
-                    'fields': 'System.AreaPath'
-                }
-                
-                details_response = requests.get(details_url, headers=headers, params=params)
+                # Get work item details to extract area paths; batches of 200 are
+                # fetched concurrently so no work items are dropped
+                work_items = self._get_work_items_batch(work_item_ids, base_url, fields=['System.AreaPath'])
                 
-                if details_response.status_code == 200:
-                    work_items = details_response.json().get('value', [])
-                    area_paths = set()
+                if work_items is not None:
+                    area_paths = {}
                     
                     for item in work_items:
                         area_path = item.get('fields', {}).get('System.AreaPath', '')
                         if area_path:
-                            area_paths.add(area_path)
+                            area_paths[area_path] = None
                     
-                    return sorted(list(area_paths))
+                    area_paths = sorted(area_paths)
+                    self._cache_set(self._area_paths_cache, cache_key, area_paths)
+                    return area_paths
                     
             return []
             
         except Exception as e:
-            print(f"🗂️ Error fetching area paths: {e}")
+            logger.error("Error fetching area paths: %s", e)
             return []
 
     def list_projects(self):
         """List all available projects in the organization"""
         if not self.pat_token or not self.organization:
             return None
+        
+        cached = self._cache_get(self._projects_cache, self.organization, self._projects_cache_duration)
+        if cached is not None:
+            logger.debug("Using cached projects for org: %s", self.organization)
+            return cached
             
         try:
             # FIX: Add API version to the URL
             url = f"https://dev.azure.com/{self.organization}/_apis/projects?api-version=6.0"
             headers = self._get_headers()
             
-            print(f"🔍 DEBUG: Listing projects for org: {self.organization}")
-            print(f"🔍 DEBUG: Request URL: {url}")
+            logger.debug("Listing projects for org: %s", self.organization)
+            logger.debug("Request URL: %s", url)
             
-            response = requests.get(url, headers=headers)
+            response, result = self._conditional_get(url, headers=headers)
             
-            print(f"🔍 DEBUG: Projects API Response: {response.status_code}")
+            logger.debug("Projects API Response: %s", response.status_code)
             
-            if response.status_code == 200:
-                result = response.json()
+            if result is not None:
                 projects = result.get('value', [])
-                print(f"🔍 DEBUG: Found {len(projects)} projects")
+                logger.debug("Found %s projects", len(projects))
                 
                 for project in projects:
-                    print(f"🔍 DEBUG: Project: {project.get('name')} (ID: {project.get('id')})")
-                    
+                    logger.debug("Project: %s (ID: %s)", project.get('name'), project.get('id'))
+                
+                self._cache_set(self._projects_cache, self.organization, projects)
                 return projects
             else:
-                print(f"🔍 Azure DevOps Projects API Error: {response.status_code} - {response.text}")
+                logger.error("Azure DevOps Projects API Error: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"🔍 Error listing projects: {e}")
+            logger.error("Error listing projects: %s", e)
             return None
     
-    def get_builds(self, days=30):
+    def get_builds(self, days=30, status_filter=None, result_filter=None, max_builds=1000):
         """Fetch build information from Azure DevOps"""
         if not self.pat_token or not self.organization or not self.project:
             return None
@@ -767,84 +1170,99 @@ class AzureDevOpsAnalytics:
             url = f"{base_url}/build/builds?api-version=6.0"
             headers = self._get_headers()
             
+            # Let the server apply the date window instead of filtering client-side
             params = {
-                'top': 100,
-                'queryOrder': 'queueTimeDescending'
+                '$top': 100,
+                'queryOrder': 'queueTimeDescending',
+                'minTime': (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
             }
-            
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                builds = response.json().get('value', [])
+            if status_filter:
+                params['statusFilter'] = status_filter
+            if result_filter:
+                params['resultFilter'] = result_filter
+            
+            builds = []
+            while True:
+                # Plain GET: minTime moves every second and continuation tokens are one-off,
+                # so these pages would only fill the ETag cache with entries never asked for again
+                response = self._session.get(url, headers=headers, params=params, timeout=30)
                 
-                # Filter by date
-                cutoff_date = datetime.now() - timedelta(days=days)
-                recent_builds = []
+                if response.status_code != 200:
+                    logger.error("Builds request failed: %s - %s", response.status_code, response.text)
+                    return None
                 
-                for build in builds:
-                    if build.get('queueTime'):
-                        queue_date = datetime.strptime(build['queueTime'][:10], '%Y-%m-%d')
-                        if queue_date >= cutoff_date:
-                            recent_builds.append(build)
+                builds.extend(self._json(response).get('value', []))
                 
-                return recent_builds
-            else:
-                print(f"Azure DevOps API Error: {response.status_code} - {response.text}")
-                return None
+                # Follow the continuation token until the window is exhausted
+                continuation_token = response.headers.get('x-ms-continuationtoken')
+                if not continuation_token or len(builds) >= max_builds:
+                    break
+                params = dict(params, continuationToken=continuation_token)
+            
+            return builds[:max_builds]
                 
         except Exception as e:
-            print(f"Error fetching builds: {e}")
+            logger.error("Error fetching builds: %s", e)
             return None
     
     def get_analytics_summary(self, days=7, include_pr_analysis=False):
         """Get comprehensive analytics summary with optional PR analysis for performance"""
-        print(f"🔧 DEBUG: Starting get_analytics_summary with days={days}, include_pr_analysis={include_pr_analysis}")
-        print(f"🔧 DEBUG: Token present: {bool(self.pat_token)}")
-        print(f"🔧 DEBUG: Organization: {self.organization}")
-        print(f"🔧 DEBUG: Project: {self.project}")
-        print(f"🔧 DEBUG: ***** PERFORMANCE OPTIMIZED VERSION *****")
+        logger.debug("Starting get_analytics_summary with days=%s, include_pr_analysis=%s", days, include_pr_analysis)
+        logger.debug("Token present: %s", bool(self.pat_token))
+        logger.debug("Organization: %s", self.organization)
+        logger.debug("Project: %s", self.project)
+        logger.debug("***** PERFORMANCE OPTIMIZED VERSION *****")
         
         if not self.pat_token:
-            print("❌ DEBUG: No PAT token configured")
+            logger.warning("No PAT token configured")
             return {
                 'status': 'error',
                 'message': 'Azure DevOps PAT token not configured'
             }
         
         if not self.organization or not self.project:
-            print("❌ DEBUG: Missing organization or project")
+            logger.warning("Missing organization or project")
             return {
                 'status': 'error', 
                 'message': 'Azure DevOps organization and project must be provided'
             }
             
         try:
-            print(f"🚀 Azure DevOps: Fetching analytics for {self.organization}/{self.project}")
+            logger.info("Fetching analytics for %s/%s", self.organization, self.project)
             
-            # Get work items (fast)
-            print("📋 DEBUG: Calling get_work_items...")
-            work_items = self.get_work_items(days=days)
-            print(f"📋 DEBUG: get_work_items returned: {type(work_items)} with {len(work_items) if work_items else 0} items")
-            
-            # Conditionally get pull requests (can be slow due to relation fetching)
-            if include_pr_analysis:
-                print("🔀 DEBUG: Including PR analysis (slower but more detailed)...")
-                pull_requests = self.get_pull_requests(days=days)
-                print(f"🔀 DEBUG: get_pull_requests returned: {type(pull_requests)} with {len(pull_requests) if pull_requests else 0} items")
-            else:
-                print("🔀 DEBUG: Skipping PR analysis for fast performance...")
-                pull_requests = []
-                print(f"🔀 DEBUG: Using empty PR list for speed")
+            # Work items and pull requests are independent queries, so issue them
+            # concurrently; wall-clock time becomes the slower of the two
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                logger.debug("Calling get_work_items...")
+                work_items_future = executor.submit(self.get_work_items, days=days)
+                
+                # Conditionally get pull requests (can be slow due to relation fetching)
+                if include_pr_analysis:
+                    logger.debug("Including PR analysis (slower but more detailed)...")
+                    pull_requests_future = executor.submit(self.get_pull_requests, days=days)
+                else:
+                    logger.debug("Skipping PR analysis for fast performance...")
+                    pull_requests_future = None
+                
+                work_items = work_items_future.result()
+                logger.debug("get_work_items returned: %s with %s items", type(work_items), len(work_items) if work_items else 0)
+                
+                if pull_requests_future is not None:
+                    pull_requests = pull_requests_future.result()
+                    logger.debug("get_pull_requests returned: %s with %s items", type(pull_requests), len(pull_requests) if pull_requests else 0)
+                else:
+                    pull_requests = []
+                    logger.debug("Using empty PR list for speed")
             
             # SKIP BUILDS - commenting out to improve performance
-            print("🔨 DEBUG: Skipping get_builds for performance optimization...")
+            logger.debug("Skipping get_builds for performance optimization...")
             builds = []  # Empty list instead of API call
-            print(f"🔨 DEBUG: get_builds skipped - using empty list")
+            logger.debug("get_builds skipped - using empty list")
             
             if work_items is None:
-                print("❌ Azure DevOps: Failed to fetch work items")
+                logger.warning("Failed to fetch work items")
             if pull_requests is None:
-                print("❌ Azure DevOps: Failed to fetch pull requests") 
+                logger.warning("Failed to fetch pull requests")
             # Builds skipped for performance - no error checking needed
             
             analytics = {
@@ -866,26 +1284,36 @@ class AzureDevOpsAnalytics:
             
             
             # Initialize repository and PR tracking
-            all_repositories = set()
+            all_repositories = {}  # insertion-ordered set of repository identifiers
             all_prs = []
+            repository_breakdown = Counter()
+            
+            # Bounded min-heap of the 10 most recently created work items; the
+            # negated index keeps ties in their original order
+            recent_heap = []
             
             # Analyze work items and conditionally extract PR information
             if work_items:
+                type_counts = Counter()
+                state_counts = Counter()
+                assignee_counts = Counter()
                 
-                for item in work_items:
+                for index, item in enumerate(work_items):
                     fields = item.get('fields', {})
                     
-                    # By type
-                    work_item_type = fields.get('System.WorkItemType', 'Unknown')
-                    analytics['work_items_by_type'][work_item_type] = analytics['work_items_by_type'].get(work_item_type, 0) + 1
+                    # Track recent work items in the same pass
+                    heap_entry = (fields.get('System.CreatedDate', ''), -index, item)
+                    if len(recent_heap) < 10:
+                        heapq.heappush(recent_heap, heap_entry)
+                    else:
+                        heapq.heappushpop(recent_heap, heap_entry)
                     
-                    # By state
+                    # By type, state and assignee
+                    work_item_type = fields.get('System.WorkItemType', 'Unknown')
+                    type_counts[work_item_type] += 1
                     state = fields.get('System.State', 'Unknown')
-                    analytics['work_items_by_state'][state] = analytics['work_items_by_state'].get(state, 0) + 1
-                    
-                    # By assignee
-                    assigned_to = fields.get('System.AssignedTo', {}).get('displayName', 'Unassigned')
-                    analytics['work_items_by_assignee'][assigned_to] = analytics['work_items_by_assignee'].get(assigned_to, 0) + 1
+                    state_counts[state] += 1
+                    assignee_counts[(fields.get('System.AssignedTo') or {}).get('displayName', 'Unassigned')] += 1
                 
                     # Process associated PRs only if PR analysis is enabled (can be slow)
                     if include_pr_analysis:
@@ -897,8 +1325,8 @@ class AzureDevOpsAnalytics:
                                 all_prs.append({
                                     'work_item_id': item.get('id'),
                                     'work_item_title': fields.get('System.Title', ''),
-                                    'work_item_type': fields.get('System.WorkItemType', 'Unknown'),
-                                    'work_item_state': fields.get('System.State', 'Unknown'),
+                                    'work_item_type': work_item_type,
+                                    'work_item_state': state,
                                     'pr_url': pr.get('url', ''),
                                     'pr_number': pr.get('pr_number', 'unknown'),
                                     'repository': pr.get('repository', ''),
@@ -906,6 +1334,12 @@ class AzureDevOpsAnalytics:
                                     'platform': pr.get('platform', 'unknown'),
                                     'relation_type': pr.get('relation_type', '')
                                 })
+                                
+                                # Repository breakdown for analytics
+                                repo = pr.get('full_repo_path', '') or pr.get('repository', '')
+                                if repo:
+                                    repository_breakdown[repo] += 1
+                                
                                 # Add repository to set (prefer full repo path for GitHub)
                                 repo_identifier = pr.get('full_repo_path', '')
                                 if not repo_identifier:
@@ -917,50 +1351,51 @@ class AzureDevOpsAnalytics:
                                         repo_identifier = str(repo_obj) if repo_obj else ''
                                 
                                 if repo_identifier and repo_identifier != pr.get('url', ''):
-                                    all_repositories.add(repo_identifier)
+                                    all_repositories[repo_identifier] = None
                     # Note: If PR analysis disabled, work item still counted but no PR data extracted
                 
+                analytics['work_items_by_type'] = dict(type_counts)
+                analytics['work_items_by_state'] = dict(state_counts)
+                analytics['work_items_by_assignee'] = dict(assignee_counts)
+                
                 # Store PR and repository information
                 analytics['associated_prs'] = all_prs
-                analytics['involved_repositories'] = sorted(list(all_repositories))
+                analytics['involved_repositories'] = sorted(all_repositories)
                 analytics['total_repositories'] = len(all_repositories)
                 
-                # Create repository breakdown for analytics
-                repository_breakdown = {}
-                for pr in all_prs:
-                    repo = pr.get('full_repo_path', '') or pr.get('repository', '')
-                    if repo:
-                        repository_breakdown[repo] = repository_breakdown.get(repo, 0) + 1
-                analytics['repository_breakdown'] = repository_breakdown
+                analytics['repository_breakdown'] = dict(repository_breakdown)
                 
                 if include_pr_analysis:
-                    print(f"📋 Found {len(all_prs)} associated PRs across {len(all_repositories)} repositories")
-                    print(f"📋 Repositories involved: {analytics['involved_repositories']}")
+                    logger.info("Found %s associated PRs across %s repositories", len(all_prs), len(all_repositories))
+                    logger.debug("Repositories involved: %s", analytics['involved_repositories'])
                 else:
-                    print(f"📋 PR analysis skipped for performance - {len(work_items)} work items processed")
+                    logger.debug("PR analysis skipped for performance - %s work items processed", len(work_items))
                 
-                # Get recent work items sorted by creation date (most recent first, limit to 10)
-                sorted_work_items = sorted(work_items, 
-                                         key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''), 
-                                         reverse=True)
-                analytics['recent_work_items'] = sorted_work_items[:10]
+                # Recent work items sorted by creation date (most recent first, limit to 10)
+                analytics['recent_work_items'] = [entry[2] for entry in sorted(recent_heap, reverse=True)]
             
-            # Analyze pull requests
+            # Analyze pull requests, building the repository breakdown used for
+            # resolution in the same pass
             commit_count = 0
+            pr_repository_counts = Counter()
+            prs_by_status = Counter()
             if pull_requests:
                 for pr in pull_requests:
-                    status = pr.get('status', 'Unknown')
-                    analytics['prs_by_status'][status] = analytics['prs_by_status'].get(status, 0) + 1
+                    prs_by_status[pr.get('status', 'Unknown')] += 1
                     
                     # Count commits vs PRs
                     if pr.get('is_commit', False):
                         commit_count += 1
                     
+                    repo_obj = pr.get('repository', {})
+                    if isinstance(repo_obj, dict):
+                        # Use the original GitHub-xxx format for breakdown counting
+                        pr_repository_counts[repo_obj.get('name', 'Unknown')] += 1
+                    
                     # Extract repository information from pull requests
                     repo_identifier = pr.get('full_repo_path', '')
                     if not repo_identifier:
                         # Handle repository object structure
-                        repo_obj = pr.get('repository', {})
                         if isinstance(repo_obj, dict):
                             repo_name = repo_obj.get('name', '')
                             if repo_name and repo_name.startswith('GitHub-'):
@@ -973,22 +1408,14 @@ class AzureDevOpsAnalytics:
                             repo_identifier = str(repo_obj) if repo_obj else ''
                     
                     if repo_identifier and repo_identifier != pr.get('url', ''):
-                        all_repositories.add(repo_identifier)
+                        all_repositories[repo_identifier] = None
                 
                 # Get recent PRs (limit to 10 for display)
                 analytics['recent_pull_requests'] = pull_requests[:10]
-            
-            # Create repository breakdown for resolution
-            repository_breakdown = {}
-            for pr in pull_requests or []:
-                repo_obj = pr.get('repository', {})
-                if isinstance(repo_obj, dict):
-                    repo_name = repo_obj.get('name', 'Unknown')
-                    # Use the original GitHub-xxx format for breakdown counting
-                    repository_breakdown[repo_name] = repository_breakdown.get(repo_name, 0) + 1
+                analytics['prs_by_status'] = dict(prs_by_status)
             
             # Resolve repository names to actual GitHub repo names
-            resolved_repos = self._get_resolved_repositories(sorted(list(all_repositories)), repository_breakdown)
+            resolved_repos = self._get_resolved_repositories(sorted(all_repositories), pr_repository_counts)
             
             # Update final counts in analytics
             analytics['total_commits'] = commit_count
@@ -999,14 +1426,12 @@ class AzureDevOpsAnalytics:
             # Add all work items with PR data for debug table
             analytics['all_work_items_with_prs'] = work_items  # All work items with their PR associations
             
-            print(f"📊 Final Analytics Summary:")
-            print(f"   - Work Items: {analytics['total_work_items']}")
-            print(f"   - Pull Requests: {analytics['total_pull_requests']}")
-            print(f"   - Commits: {analytics['total_commits']}")
-            print(f"   - Repositories (raw): {len(all_repositories)}")
-            print(f"   - Repositories (resolved): {analytics['total_repositories']}")
-            print(f"   - Repository Names: {analytics['involved_repositories']}")
-            print(f"   - All work items with PRs: {len(analytics['all_work_items_with_prs'])}")
+            logger.info(
+                "Analytics summary: %s work items, %s pull requests, %s commits, "
+                "%s repositories (%s raw)",
+                analytics['total_work_items'], analytics['total_pull_requests'], analytics['total_commits'],
+                analytics['total_repositories'], len(all_repositories))
+            logger.debug("Repository names: %s", analytics['involved_repositories'])
             
             return {
                 'status': 'success',
@@ -1014,7 +1439,7 @@ class AzureDevOpsAnalytics:
             }
             
         except Exception as e:
-            print(f"Error calculating Azure DevOps analytics: {e}")
+            logger.error("Error calculating Azure DevOps analytics: %s", e)
             return {
                 'status': 'error',
                 'message': f'Error calculating analytics: {str(e)}'
@@ -1033,126 +1458,44 @@ class AzureDevOpsAnalytics:
             return None
         
         data = result['data']
+        spec = _CHART_SPECS.get(chart_type)
         
-        # Prepare chart data based on type
-        if chart_type == 'work_items_by_type':
-            types = list(data['work_items_by_type'].keys())
-            values = list(data['work_items_by_type'].values())
-            
-            if not types or not any(values):
-                return self._create_empty_chart("No work items found for the selected time period")
-            
-            fig = go.Figure(data=go.Pie(
-                labels=types,
-                values=values,
-                name='Work Items by Type'
-            ))
-            
-            fig.update_layout(
-                title=f'Work Items by Type - Last {days} days'
-            )
-            
-        elif chart_type == 'work_items_by_state':
-            states = list(data['work_items_by_state'].keys())
-            values = list(data['work_items_by_state'].values())
-            
-            if not states or not any(values):
-                return self._create_empty_chart("No work items found for the selected time period")
-            
-            fig = go.Figure(data=go.Bar(
-                x=states,
-                y=values,
-                name='Work Items by State'
-            ))
-            
-            fig.update_layout(
-                title=f'Work Items by State - Last {days} days',
-                xaxis_title='State',
-                yaxis_title='Number of Work Items',
-                hovermode='x unified'
-            )
-            
-        elif chart_type == 'work_items_by_assignee':
-            assignees = list(data['work_items_by_assignee'].keys())
-            values = list(data['work_items_by_assignee'].values())
-            
-            if not assignees or not any(values):
-                return self._create_empty_chart("No assignee data available")
-            
-            fig = go.Figure(data=go.Bar(
-                x=assignees,
-                y=values,
-                name='Work Items by Assignee'
-            ))
-            
-            fig.update_layout(
-                title=f'Work Items by Assignee - Last {days} days',
-                xaxis_title='Assignee',
-                yaxis_title='Number of Work Items',
-                hovermode='x unified'
-            )
-            
-        elif chart_type == 'prs_by_status':
-            if not detailed_mode:
-                return self._create_empty_chart("PR status data requires detailed mode. Please switch to detailed analysis mode.")
-            
-            statuses = list(data.get('prs_by_status', {}).keys())
-            values = list(data.get('prs_by_status', {}).values())
-            
-            if not statuses or not any(values):
-                return self._create_empty_chart("No pull request status data available")
-            
-            fig = go.Figure(data=go.Pie(
-                labels=statuses,
-                values=values,
-                name='Pull Requests by Status'
-            ))
-            
-            fig.update_layout(
-                title=f'Pull Requests by Status - Last {days} days'
-            )
-            
-        elif chart_type == 'repositories_breakdown':
-            repositories = list(data.get('repository_breakdown', {}).keys())
-            pr_counts = list(data.get('repository_breakdown', {}).values())
+        # Dashboards poll with unchanged data most of the time, so reuse the
+        # rendered JSON when the chart's input is identical to a recent call
+        if spec is None:
+            chart_input = [data['total_work_items'], data['total_pull_requests'], data['total_repositories']]
+        else:
+            chart_input = data.get(spec.data_key, {})
+        cache_key = (chart_type, days, detailed_mode, _digest(chart_input))
+        
+        with self._cache_lock:
+            cached = self._chart_cache.get(cache_key)
+            if cached is not None:
+                self._chart_cache.move_to_end(cache_key)
+                return cached
+        
+        chart_json = self._render_chart(spec, chart_input, days, detailed_mode)
+        
+        with self._cache_lock:
+            self._chart_cache[cache_key] = chart_json
+            if len(self._chart_cache) > self._chart_cache_size:
+                self._chart_cache.popitem(last=False)
+        return chart_json
+    
+    def _render_chart(self, spec, chart_input, days, detailed_mode):
+        """Render one chart to Plotly JSON from its spec and input data"""
+        if spec is None:  # Default to overview
+            fig = _overview_chart(chart_input, days, detailed_mode)
+        else:
+            if spec.requires_detailed and not detailed_mode:
+                return self._create_empty_chart(spec.fast_mode_message)
             
-            if not repositories or not any(pr_counts):
-                if not detailed_mode:
-                    return self._create_empty_chart("Repository data requires detailed mode or no repositories found. Try switching to detailed analysis mode.")
-                else:
-                    return self._create_empty_chart("No repository data available for the selected time period")
-            
-            fig = go.Figure(data=go.Bar(
-                x=repositories,
-                y=pr_counts,
-                name='PRs by Repository'
-            ))
-            
-            fig.update_layout(
-                title=f'Pull Requests by Repository - Last {days} days',
-                xaxis_title='Repository',
-                yaxis_title='Number of PRs/Commits',
-                hovermode='x unified'
-            )
+            if not chart_input or not any(chart_input.values()):
+                if spec.fast_mode_message and not detailed_mode:
+                    return self._create_empty_chart(spec.fast_mode_message)
+                return self._create_empty_chart(spec.empty_message)
             
-        else:  # Default to overview
-            categories = ['Work Items', 'Pull Requests', 'Repositories']
-            values = [data['total_work_items'], data['total_pull_requests'], data['total_repositories']]
-            colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-            
-            fig = go.Figure(data=go.Bar(
-                x=categories,
-                y=values,
-                marker_color=colors,
-                name='Activity Overview'
-            ))
-            
-            fig.update_layout(
-                title=f'Azure DevOps Activity Overview - Last {days} days ({("Detailed" if detailed_mode else "Fast")} Mode)',
-                xaxis_title='Activity Type',
-                yaxis_title='Count',
-                hovermode='x unified'
-            )
+            fig = spec.builder(chart_input, spec, days)
         
         return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
 
@@ -1176,6 +1519,13 @@ class AzureDevOpsAnalytics:
         )
         return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
     
+    def _cached_repository(self, repository_id):
+        """Resolve a repository ID from the known mapping or the hit/miss caches without any API call"""
+        cache_key = (self.organization, repository_id)
+        return (_KNOWN_REPOS.get(repository_id)
+                or self._cache_get(self._repo_name_cache, cache_key, self._repo_name_cache_duration)
+                or self._cache_get(self._repo_miss_cache, cache_key, self._repo_miss_cache_duration))
+    
     def _resolve_repository_name(self, repository_id):
         """
         Resolve Azure DevOps repository ID to actual GitHub repository name
@@ -1183,108 +1533,119 @@ class AzureDevOpsAnalytics:
         """
         if not self.pat_token or not self.organization:
             return None
+        
+        cache_key = (self.organization, repository_id)
+        cached = (self._cache_get(self._repo_name_cache, cache_key, self._repo_name_cache_duration)
+                  or self._cache_get(self._repo_miss_cache, cache_key, self._repo_miss_cache_duration))
+        if cached is not None:
+            return cached
             
         try:
             # First, try to get repository details from Azure DevOps
             url = f"https://dev.azure.com/{self.organization}/_apis/git/repositories/{repository_id}?api-version=7.0"
-            headers = {
-                'Authorization': f'Basic {base64.b64encode(f":{self.pat_token}".encode()).decode()}',
-                'Content-Type': 'application/json'
-            }
+            headers = self._get_headers()
             
-            print(f"🔍 Resolving repository ID: {repository_id}")
-            response = requests.get(url, headers=headers)
+            logger.debug("Resolving repository ID: %s", repository_id)
+            response, repo_data = self._conditional_get(url, headers=headers)
             
-            if response.status_code == 200:
-                repo_data = response.json()
-                repo_name = repo_data.get('name', '')
-                remote_url = repo_data.get('remoteUrl', '')
-                
-                print(f"✅ Repository details found:")
-                print(f"   Name: {repo_name}")
-                print(f"   Remote URL: {remote_url}")
-                
-                # Extract GitHub owner/repo from remote URL if it's a GitHub repository
-                if 'github.com' in remote_url:
-                    # Parse GitHub URL: https://github.com/owner/repo.git or git@github.com:owner/repo.git
-                    import re
-                    github_match = re.search(r'github\.com[:/]([^/]+)/([^/.]+)', remote_url)
-                    if github_match:
-                        owner, repo = github_match.groups()
-                        github_repo = f"{owner}/{repo}"
-                        print(f"🎯 Resolved to GitHub repo: {github_repo}")
-                        return {
-                            'github_repo': github_repo,
-                            'repo_name': repo_name,
-                            'remote_url': remote_url,
-                            'owner': owner,
-                            'repo': repo
-                        }
-                
-                # If not GitHub, return the Azure DevOps repository name
-                return {
-                    'github_repo': f"azuredevops/{repo_name}",
-                    'repo_name': repo_name,
-                    'remote_url': remote_url,
-                    'owner': 'azuredevops',
-                    'repo': repo_name
-                }
+            if repo_data is not None:
+                resolved = self._repository_info(repo_data)
+                logger.debug("Resolved %s to %s", repository_id, resolved['github_repo'])
+                self._cache_set(self._repo_name_cache, cache_key, resolved)
+                return resolved
                 
             else:
-                print(f"⚠️ Azure DevOps API failed for repository {repository_id}: {response.status_code}")
+                logger.warning("Azure DevOps API failed for repository %s: %s", repository_id, response.status_code)
                 # Try alternative approach: check if it's a known GitHub repository pattern
-                return self._try_github_resolution(repository_id)
+                fallback = self._try_github_resolution(repository_id)
+                if response.status_code == 404 and fallback:
+                    # GitHub-connected IDs never exist in Azure DevOps; remember the
+                    # miss so the next lookup skips the round trip
+                    self._cache_set(self._repo_miss_cache, cache_key, fallback)
+                return fallback
                 
         except Exception as e:
-            print(f"❌ Error resolving repository {repository_id}: {e}")
+            logger.error("Error resolving repository %s: %s", repository_id, e)
             # Try alternative approach
             return self._try_github_resolution(repository_id)
     
+    def _repository_info(self, repo_data):
+        """Resolved repository info from an Azure DevOps Git repository object"""
+        repo_name = repo_data.get('name', '')
+        remote_url = repo_data.get('remoteUrl', '')
+        
+        # Extract GitHub owner/repo from remote URL if it's a GitHub repository
+        if 'github.com' in remote_url:
+            # Parse GitHub URL: https://github.com/owner/repo.git or git@github.com:owner/repo.git
+            github_match = _GITHUB_URL_RE.search(remote_url)
+            if github_match:
+                owner, repo = github_match.groups()
+                return {
+                    'github_repo': f"{owner}/{repo}",
+                    'repo_name': repo_name,
+                    'remote_url': remote_url,
+                    'owner': owner,
+                    'repo': repo
+                }
+        
+        # If not GitHub, return the Azure DevOps repository name
+        return {
+            'github_repo': f"azuredevops/{repo_name}",
+            'repo_name': repo_name,
+            'remote_url': remote_url,
+            'owner': 'azuredevops',
+            'repo': repo_name
+        }
+    
+    def _prefetch_repository_index(self):
+        """
+        Resolve every Git repository in the organization with a single list call,
+        keyed on the lowercased repository ID
+        """
+        if not self.pat_token or not self.organization:
+            return {}
+        
+        cached = self._cache_get(self._repo_index_cache, self.organization, self._repo_index_cache_duration)
+        if cached is not None:
+            return cached
+        
+        try:
+            url = f"https://dev.azure.com/{self.organization}/_apis/git/repositories?api-version=7.0"
+            response, payload = self._conditional_get(url, headers=self._get_headers())
+            
+            if payload is None:
+                logger.warning("Repository list request failed: %s", response.status_code)
+                return {}
+            
+            index = {repo_data['id'].lower(): self._repository_info(repo_data)
+                     for repo_data in payload.get('value', []) if repo_data.get('id')}
+            logger.debug("Prefetched %s repositories for org: %s", len(index), self.organization)
+            self._cache_set(self._repo_index_cache, self.organization, index)
+            return index
+            
+        except Exception as e:
+            logger.error("Error prefetching repository index: %s", e)
+            return {}
+    
     def _try_github_resolution(self, repository_id):
         """
         Try to resolve repository using GitHub API or known patterns
         """
         try:
-            # Check if this matches known repository patterns from your organization
-            # This is where you'd add specific mappings for your repositories
-            known_repos = {
-                '206cdeed-ccde-4df1-a203-092a2522662f': {
-                    'github_repo': 'tr/cs-prof-cloud_ultratax-api-services',
-                    'repo_name': 'cs-prof-cloud_ultratax-api-services',
-                    'owner': 'tr',
-                    'repo': 'cs-prof-cloud_ultratax-api-services',
-                    'remote_url': 'https://github.com/tr/cs-prof-cloud_ultratax-api-services'
-                },
-                '0d836de7-dfee-46c2-a340-a39d84189402': {
-                    'github_repo': 'tr/tax-professional-services',
-                    'repo_name': 'tax-professional-services',
-                    'owner': 'tr',
-                    'repo': 'tax-professional-services',
-                    'remote_url': 'https://github.com/tr/tax-professional-services'
-                },
-                '2c2726b0-50bd-4425-89ad-a1361ffa3467': {
-                    'github_repo': 'tr/tax-automation-engine',
-                    'repo_name': 'tax-automation-engine',
-                    'owner': 'tr',
-                    'repo': 'tax-automation-engine',
-                    'remote_url': 'https://github.com/tr/tax-automation-engine'
-                }
-            }
-            
             # Check for exact match first
-            if repository_id in known_repos:
-                print(f"🎯 Found in known repositories mapping: {known_repos[repository_id]['github_repo']}")
-                return known_repos[repository_id]
+            if repository_id in _KNOWN_REPOS:
+                logger.debug("Found in known repositories mapping: %s", _KNOWN_REPOS[repository_id]['github_repo'])
+                return _KNOWN_REPOS[repository_id]
             
             # Check for partial match (shortened ID)
-            for full_id, repo_info in known_repos.items():
+            for full_id, repo_info in _KNOWN_REPOS.items():
                 if full_id.startswith(repository_id):
-                    print(f"🎯 Found partial match for {repository_id} -> {full_id}: {repo_info['github_repo']}")
+                    logger.debug("Found partial match for %s -> %s: %s", repository_id, full_id, repo_info['github_repo'])
                     return repo_info
             
             # If not in known repos, try to make an educated guess based on patterns
             # This could be enhanced with more sophisticated logic
-            print(f"🔍 Attempting pattern-based resolution for {repository_id}")
+            logger.debug("Attempting pattern-based resolution for %s", repository_id)
             
             # Try to extract meaningful name from repository ID patterns
             # This is a fallback that could be improved with more data
@@ -1298,14 +1659,14 @@ class AzureDevOpsAnalytics:
             }
             
         except Exception as e:
-            print(f"❌ GitHub resolution failed for {repository_id}: {e}")
+            logger.error("GitHub resolution failed for %s: %s", repository_id, e)
             return None
     
     def get_repositories_fast(self, days=30):
         """
         Fast repository extraction without full analytics - optimized for GitHub sync
         """
-        print(f"🚀 FAST REPO EXTRACTION: Getting repositories for {days} days...")
+        logger.info("Fast repository extraction: getting repositories for %s days", days)
         
         try:
             # Get work items quickly (without PR relations)
@@ -1316,49 +1677,42 @@ class AzureDevOpsAnalytics:
                     'message': 'No work items found'
                 }
             
-            print(f"📋 Found {len(work_items)} work items, extracting repository info...")
+            logger.debug("Found %s work items, extracting repository info", len(work_items))
             
             # Get PR data for a small sample to extract repositories quickly
             # We only need to analyze a few recent work items to get the repository list
             sample_size = min(20, len(work_items))  # Analyze only 20 most recent work items
-            sample_work_items = sorted(work_items, 
-                                     key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''), 
-                                     reverse=True)[:sample_size]
+            sample_work_items = heapq.nlargest(sample_size, work_items,
+                                               key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''))
             
-            print(f"🔍 Analyzing {sample_size} recent work items for repository extraction...")
+            logger.debug("Analyzing %s recent work items for repository extraction", sample_size)
             
-            # Get PR relations for sample work items
-            work_item_ids = [item['id'] for item in sample_work_items]
+            # Get PR relations for sample work items; their fields were already
+            # fetched, so only the relations round trip is needed
             base_url = self._get_base_url()
-            detailed_work_items = self._get_work_item_details(work_item_ids, base_url)
+            self._attach_pr_links(sample_work_items, base_url)
+            detailed_work_items = sample_work_items
             
-            # Extract repositories from PR relations
+            # Extract repository IDs from PR relations
             repositories = set()
-            repository_breakdown = {}
+            repository_breakdown = Counter()
             
             if detailed_work_items:
                 for item in detailed_work_items:
                     associated_prs = item.get('associated_prs', [])
                     for pr in associated_prs:
-                        # Extract repository from PR relation
-                        repo_url = pr.get('url', '')
-                        if 'GitHub' in repo_url:
-                            # Extract repository ID from GitHub URL
-                            if 'GitHub/Commit/' in repo_url or 'GitHub/PullRequest/' in repo_url:
-                                # Extract repo ID from vstfs URL
-                                parts = repo_url.split('/')
-                                for i, part in enumerate(parts):
-                                    if part in ['Commit', 'PullRequest'] and i > 0:
-                                        repo_id = parts[i-1]
-                                        repo_path = f'GitHub/{repo_id}'
-                                        repositories.add(repo_path)
-                                        repository_breakdown[f'GitHub-{repo_id[:8]}'] = repository_breakdown.get(f'GitHub-{repo_id[:8]}', 0) + 1
-                                        break
-            
-            print(f"📊 Found {len(repositories)} unique repositories from sample analysis")
+                        # Extract repository ID from the vstfs PR/commit URL
+                        match = _GITHUB_REPO_RE.search(pr.get('url', ''))
+                        if match:
+                            repo_id = match.group(1)
+                            repositories.add(repo_id)
+                            short_key = f'GitHub-{repo_id[:8]}'
+                            repository_breakdown[short_key] += 1
+            
+            logger.info("Found %s unique repositories from sample analysis", len(repositories))
             
             # Resolve repository names
-            resolved_repos = self._get_resolved_repositories(sorted(list(repositories)), repository_breakdown)
+            resolved_repos = self._get_resolved_repositories(sorted(repositories), repository_breakdown, raw_ids=True)
             
             return {
                 'status': 'success',
@@ -1371,56 +1725,92 @@ class AzureDevOpsAnalytics:
             }
             
         except Exception as e:
-            print(f"❌ Error in fast repository extraction: {str(e)}")
+            logger.error("Error in fast repository extraction: %s", e)
             return {
                 'status': 'error',
                 'message': f'Error extracting repositories: {str(e)}'
             }
 
-    def _get_resolved_repositories(self, involved_repositories, repository_breakdown):
+    def _get_resolved_repositories(self, involved_repositories, repository_breakdown, raw_ids=False):
         """
         Get resolved repository names for all involved repositories
+        Entries are 'GitHub/{repo-id}' paths (others are skipped), or bare repo IDs when raw_ids is set
         """
         resolved_repos = []
         
-        for repo_path in involved_repositories:
-            if repo_path.startswith('GitHub/'):
-                # Extract repo ID
-                repo_id = repo_path.replace('GitHub/', '')
-                
-                # Try to resolve the actual repository name
-                resolved_info = self._resolve_repository_name(repo_id)
-                
-                if resolved_info:
-                    # Use the resolved GitHub repository name
-                    github_repo = resolved_info['github_repo']
-                    pr_count = repository_breakdown.get(f'GitHub-{repo_id[:8]}', 0)
-                    
-                    resolved_repos.append({
-                        'repository_id': repo_id,
-                        'github_repo': github_repo,
-                        'display_name': resolved_info['repo_name'],
-                        'owner': resolved_info['owner'],
-                        'repo': resolved_info['repo'],
-                        'remote_url': resolved_info['remote_url'],
-                        'pr_count': pr_count,
-                        'full_path': repo_path,
-                        'resolved': True
-                    })
+        if raw_ids:
+            repo_ids = list(involved_repositories)
+        else:
+            repo_ids = [repo_path[len('GitHub/'):] for repo_path in involved_repositories
+                        if repo_path.startswith('GitHub/')]
+        
+        # Known and already-cached repositories (including remembered misses) resolve
+        # immediately; the rest are looked up concurrently since each is an independent GET
+        resolved_by_id = {}
+        pending_ids = []
+        for repo_id in repo_ids:
+            cached = self._cached_repository(repo_id)
+            if cached:
+                resolved_by_id[repo_id] = cached
+            else:
+                pending_ids.append(repo_id)
+        
+        with self._cache_lock:
+            self._repo_name_cache_hits += len(resolved_by_id)
+            self._repo_name_cache_misses += len(pending_ids)
+        logger.debug("Repository resolution: %s cached, %s to fetch", len(resolved_by_id), len(pending_ids))
+        
+        # One organization-wide list call covers every Azure DevOps repository;
+        # only IDs it does not know (GitHub-connected or deleted) need their own GET
+        if pending_ids:
+            repository_index = self._prefetch_repository_index()
+            unindexed_ids = []
+            for repo_id in pending_ids:
+                indexed = repository_index.get(repo_id.lower())
+                if indexed:
+                    resolved_by_id[repo_id] = indexed
                 else:
-                    # Fallback to placeholder if resolution fails
-                    pr_count = repository_breakdown.get(f'GitHub-{repo_id[:8]}', 0)
-                    resolved_repos.append({
-                        'repository_id': repo_id,
-                        'github_repo': f'owner/repo-{repo_id[:8]}',
-                        'display_name': f'GitHub-{repo_id[:8]}',
-                        'owner': 'owner',
-                        'repo': f'repo-{repo_id[:8]}',
-                        'remote_url': '',
-                        'pr_count': pr_count,
-                        'full_path': repo_path,
-                        'resolved': False
-                    })
+                    unindexed_ids.append(repo_id)
+            pending_ids = unindexed_ids
+        
+        # Steady-state dashboards resolve everything from cache and skip the pool entirely
+        if pending_ids:
+            resolved_by_id.update(zip(pending_ids, self._resolve_executor.map(self._resolve_repository_name, pending_ids)))
+        
+        for repo_id in repo_ids:
+            repo_path = f'GitHub/{repo_id}'
+            resolved_info = resolved_by_id.get(repo_id)
+            short_id = repo_id[:8]
+            pr_count = repository_breakdown.get(f'GitHub-{short_id}', 0)
+            
+            if resolved_info:
+                # Use the resolved GitHub repository name
+                github_repo = resolved_info['github_repo']
+                
+                resolved_repos.append({
+                    'repository_id': repo_id,
+                    'github_repo': github_repo,
+                    'display_name': resolved_info['repo_name'],
+                    'owner': resolved_info['owner'],
+                    'repo': resolved_info['repo'],
+                    'remote_url': resolved_info['remote_url'],
+                    'pr_count': pr_count,
+                    'full_path': repo_path,
+                    'resolved': True
+                })
+            else:
+                # Fallback to placeholder if resolution fails
+                resolved_repos.append({
+                    'repository_id': repo_id,
+                    'github_repo': f'owner/repo-{short_id}',
+                    'display_name': f'GitHub-{short_id}',
+                    'owner': 'owner',
+                    'repo': f'repo-{short_id}',
+                    'remote_url': '',
+                    'pr_count': pr_count,
+                    'full_path': repo_path,
+                    'resolved': False
+                })
         
         return resolved_repos
 
@@ -1428,23 +1818,30 @@ class AzureDevOpsAnalytics:
         """
         Fast work items retrieval without PR relations - use the same successful method as get_work_items
         """
-        print(f"📋 FAST MODE: Delegating to proven get_work_items method...")
+        logger.debug("Fast mode: delegating to get_work_items")
         
         # Just use the existing working method but return only basic data
         work_items = self.get_work_items(days=days)
         
         if work_items:
-            print(f"✅ FAST MODE: Successfully got {len(work_items)} work items")
+            logger.debug("Fast mode: got %s work items", len(work_items))
             return work_items
         else:
-            print(f"❌ FAST MODE: No work items returned from get_work_items")
+            logger.warning("Fast mode: no work items returned from get_work_items")
             return []
 
-    def get_workitems_only_summary(self, days=30):
+    def get_workitems_only_summary(self, days=30, force_refresh=False):
         """
         Get work items summary without PR analysis for fast initial loading
         """
-        print(f"🚀 Getting work items only summary for {days} days...")
+        cache_key = self._analytics_cache_key('workitems_only', days)
+        if not force_refresh:
+            cached = self._cache_get(self._analytics_cache, cache_key, self._analytics_cache_duration)
+            if cached is not None:
+                logger.debug("Using cached work items summary for %s days", days)
+                return self._shared_result(cached)
+        
+        logger.info("Getting work items only summary for %s days", days)
         
         try:
             # Get work items without PR relations
@@ -1457,35 +1854,19 @@ class AzureDevOpsAnalytics:
             
             # Analyze work items data
             total_work_items = len(work_items)
-            work_items_by_type = {}
-            work_items_by_state = {}
-            work_items_by_assignee = {}
-            recent_work_items = []
-            
-            # Sort work items by creation date for recent items (most recent first)
-            sorted_work_items = sorted(work_items, 
-                                     key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''), 
-                                     reverse=True)
-            
-            for item in work_items:
-                fields = item.get('fields', {})
-                
-                # Count by type
-                work_item_type = fields.get('System.WorkItemType', 'Unknown')
-                work_items_by_type[work_item_type] = work_items_by_type.get(work_item_type, 0) + 1
-                
-                # Count by state
-                state = fields.get('System.State', 'Unknown')
-                work_items_by_state[state] = work_items_by_state.get(state, 0) + 1
-                
-                # Count by assignee
-                assignee = fields.get('System.AssignedTo', {}).get('displayName', 'Unassigned')
-                work_items_by_assignee[assignee] = work_items_by_assignee.get(assignee, 0) + 1
+            all_fields = [item.get('fields') or {} for item in work_items]
             
-            # Get recent items based on changed date (limit to 10)
-            recent_work_items = sorted_work_items[:10]
+            # Count by type, state and assignee
+            work_items_by_type = _value_counts([f.get('System.WorkItemType', 'Unknown') for f in all_fields])
+            work_items_by_state = _value_counts([f.get('System.State', 'Unknown') for f in all_fields])
+            work_items_by_assignee = _value_counts(
+                [(f.get('System.AssignedTo') or {}).get('displayName', 'Unassigned') for f in all_fields])
             
-            return {
+            # Most recently created items (limit to 10), without sorting the whole list
+            recent_work_items = heapq.nlargest(10, work_items,
+                                               key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''))
+            
+            result = {
                 'status': 'success',
                 'data': {
                     'total_work_items': total_work_items,
@@ -1500,22 +1881,31 @@ class AzureDevOpsAnalytics:
                     'pr_loading': True  # Indicates PR data is still loading
                 }
             }
+            self._cache_set(self._analytics_cache, cache_key, result)
+            return self._shared_result(result)
             
         except Exception as e:
-            print(f"❌ Error in get_workitems_only_summary: {str(e)}")
+            logger.error("Error in get_workitems_only_summary: %s", e)
             return {
                 'status': 'error',
                 'message': f'Error getting work items summary: {str(e)}'
             }
 
-    def get_streamlined_analytics(self, days=7):
+    def get_streamlined_analytics(self, days=7, force_refresh=False):
         """
         Streamlined analytics flow for better performance:
         1. Get work items based on date filter (fast)
         2. Get PR data for recent items only (limited scope)
         3. Return focused analytics for charts and display
         """
-        print(f"🚀 Starting streamlined analytics for last {days} days...")
+        cache_key = self._analytics_cache_key('streamlined', days)
+        if not force_refresh:
+            cached = self._cache_get(self._analytics_cache, cache_key, self._analytics_cache_duration)
+            if cached is not None:
+                logger.debug("Using cached streamlined analytics for %s days", days)
+                return self._shared_result(cached)
+        
+        logger.info("Starting streamlined analytics for last %s days", days)
         
         if not self.pat_token:
             return {'status': 'error', 'message': 'Azure DevOps PAT token not configured'}
@@ -1525,11 +1915,11 @@ class AzureDevOpsAnalytics:
         
         try:
             # Step 1: Get work items efficiently (fast)
-            print(f"📋 Step 1: Getting work items for last {days} days...")
+            logger.debug("Step 1: getting work items for last %s days", days)
             work_items = self.get_work_items(days=days)
             
             if not work_items:
-                print("⚠️ No work items found")
+                logger.warning("No work items found")
                 return {
                     'status': 'success',
                     'data': {
@@ -1546,58 +1936,37 @@ class AzureDevOpsAnalytics:
                     }
                 }
             
-            print(f"✅ Found {len(work_items)} work items")
+            logger.info("Found %s work items", len(work_items))
             
             # Step 2: Get PR data for a limited set of recent work items (performance balance)
-            print(f"🔀 Step 2: Getting PR data for recent work items (limited scope for performance)...")
-            
-            # Sort work items by creation date and take more items for PR analysis based on time range
-            sorted_work_items = sorted(work_items, 
-                                     key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''), 
-                                     reverse=True)
-            
             # For accurate repository and PR counting, analyze ALL work items
             # This ensures we capture all repositories and PRs involved
-            print(f"🔍 Analyzing ALL {len(work_items)} work items for complete PR/repository data...")
+            logger.debug("Step 2: analyzing PR data for all %s work items", len(work_items))
             recent_work_items_for_pr_analysis = work_items  # Analyze all work items
             
-            # Get PR data for these recent items only
+            # Attach PR data in place; the work items already carry their fields,
+            # so only the relations need to be fetched
             if recent_work_items_for_pr_analysis:
-                work_item_ids = [item['id'] for item in recent_work_items_for_pr_analysis]
                 base_url = self._get_base_url()
-                
-                print(f"🔀 Analyzing PR relations for ALL {len(work_item_ids)} work items for complete data...")
-                detailed_work_items = self._get_work_item_details(work_item_ids, base_url)
-                
-                if detailed_work_items:
-                    # Create a mapping of work item ID to PR data
-                    pr_data_map = {}
-                    for item in detailed_work_items:
-                        pr_data_map[item['id']] = item.get('associated_prs', [])
-                    
-                    # Update the recent work items with PR data
-                    for item in recent_work_items_for_pr_analysis:
-                        if item['id'] in pr_data_map:
-                            item['associated_prs'] = pr_data_map[item['id']]
+                self._attach_pr_links(recent_work_items_for_pr_analysis, base_url)
             
             # Step 3: Analyze and categorize all work items
             pr_count = 0
             commit_count = 0
-            repositories = set()
-            all_prs = []
-            
-            work_items_by_type = {}
-            work_items_by_state = {}
-            
-            for item in work_items:
-                fields = item.get('fields', {})
-                
-                # Categorize work items
-                work_item_type = fields.get('System.WorkItemType', 'Unknown')
-                work_items_by_type[work_item_type] = work_items_by_type.get(work_item_type, 0) + 1
-                
-                state = fields.get('System.State', 'Unknown')
-                work_items_by_state[state] = work_items_by_state.get(state, 0) + 1
+            # Insertion-ordered set of repository paths, in discovery order
+            repositories = {}
+            repository_breakdown = Counter()
+            # Min-heap of the 10 most recent PRs as (created_date, -sequence, pr);
+            # the negated sequence keeps ties in discovery order
+            top_prs_heap = []
+            
+            # Categorize work items
+            all_fields = [item.get('fields') or {} for item in work_items]
+            work_items_by_type = _value_counts([f.get('System.WorkItemType', 'Unknown') for f in all_fields])
+            work_items_by_state = _value_counts([f.get('System.State', 'Unknown') for f in all_fields])
+            
+            for item, fields in zip(work_items, all_fields):
+                get_field = fields.get
                 
                 # Extract PR/commit data from relations if available
                 associated_prs = item.get('associated_prs', [])
@@ -1606,14 +1975,28 @@ class AzureDevOpsAnalytics:
                         commit_count += 1
                     else:
                         pr_count += 1
-                        all_prs.append({
-                            'title': f"PR #{pr.get('pr_number', 'N/A')}",
-                            'url': pr.get('url', ''),
-                            'repository': pr.get('repository', ''),
-                            'work_item_id': item.get('id'),
-                            'work_item_title': fields.get('System.Title', ''),
-                            'created_date': fields.get('System.CreatedDate', '')
-                        })
+                        repository = pr.get('repository', '')
+                        
+                        # Only build the PR summary when it makes the top 10
+                        created_date = get_field('System.CreatedDate', '')
+                        heap_key = (created_date, -pr_count)
+                        if len(top_prs_heap) < 10 or heap_key > top_prs_heap[0][:2]:
+                            entry = heap_key + ({
+                                'title': f"PR #{pr.get('pr_number', 'N/A')}",
+                                'url': pr.get('url', ''),
+                                'repository': repository,
+                                'work_item_id': item.get('id'),
+                                'work_item_title': get_field('System.Title', ''),
+                                'created_date': created_date
+                            },)
+                            if len(top_prs_heap) < 10:
+                                heapq.heappush(top_prs_heap, entry)
+                            else:
+                                heapq.heapreplace(top_prs_heap, entry)
+                        
+                        # Repository breakdown, counted in the same pass
+                        repo_key = repository.get('name', 'Unknown') if isinstance(repository, dict) else repository
+                        repository_breakdown[repo_key] += 1
                     
                     # Track repositories
                     repo = pr.get('full_repo_path', '')
@@ -1626,37 +2009,26 @@ class AzureDevOpsAnalytics:
                             repo = str(repo_obj) if repo_obj else ''
                     
                     if repo:
-                        repositories.add(repo)
-            
-            # Create repository breakdown
-            repository_breakdown = {}
-            for pr in all_prs:
-                repo = pr.get('repository', 'Unknown')
-                # Handle repository object structure
-                if isinstance(repo, dict):
-                    repo = repo.get('name', 'Unknown')
-                repository_breakdown[repo] = repository_breakdown.get(repo, 0) + 1
+                        repositories[repo] = None
             
-            # Sort recent items (limit to 10 for display)
-            recent_work_items = sorted_work_items[:10]
+            # Most recent items (limit to 10 for display)
+            recent_work_items = heapq.nlargest(10, work_items,
+                                               key=lambda x: x.get('fields', {}).get('System.CreatedDate', ''))
             
-            recent_pull_requests = sorted(all_prs,
-                                        key=lambda x: x.get('created_date', ''),
-                                        reverse=True)[:10]
+            recent_pull_requests = [entry[2] for entry in sorted(top_prs_heap, reverse=True)]
             
             # Get the complete repository list for accurate counting
             # This ensures consistency between dashboard display and GitHub sync
-            resolved_repos = self._get_resolved_repositories(sorted(list(repositories)), repository_breakdown)
+            resolved_repos = self._get_resolved_repositories(list(repositories), repository_breakdown)
             
-            print(f"📊 Analysis complete:")
-            print(f"   - Work Items: {len(work_items)}")
-            print(f"   - Pull Requests: {pr_count}")
-            print(f"   - Commits: {commit_count}")
-            print(f"   - Repositories (raw): {len(repositories)}")
-            print(f"   - Repositories (resolved): {len(resolved_repos)}")
-            print(f"   - PR analysis performed on ALL {len(recent_work_items_for_pr_analysis)} work items")
+            logger.info(
+                "Analysis complete: %s work items, %s pull requests, %s commits, "
+                "%s repositories (%s resolved), PR analysis on %s work items",
+                len(work_items), pr_count, commit_count, len(repositories),
+                len(resolved_repos), len(recent_work_items_for_pr_analysis)
+            )
             
-            return {
+            result = {
                 'status': 'success',
                 'data': {
                     'total_work_items': len(work_items),
@@ -1669,15 +2041,17 @@ class AzureDevOpsAnalytics:
                     'recent_work_items': recent_work_items,
                     'recent_pull_requests': recent_pull_requests,
                     'all_work_items_with_prs': recent_work_items_for_pr_analysis,  # All work items with PR data for debug table
-                    'repository_breakdown': repository_breakdown,
-                    'involved_repositories': sorted(list(repositories)),
+                    'repository_breakdown': dict(repository_breakdown),
+                    'involved_repositories': sorted(repositories),
                     'resolved_repositories': resolved_repos,  # Include resolved repos for consistency
                     'performance_note': f'Complete analytics for {days} days - {len(work_items)} work items, PR analysis on ALL {len(recent_work_items_for_pr_analysis)} work items'
                 }
             }
+            self._cache_set(self._analytics_cache, cache_key, result)
+            return self._shared_result(result)
             
         except Exception as e:
-            print(f"❌ Error in streamlined analytics: {e}")
+            logger.error("Error in streamlined analytics: %s", e)
             return {'status': 'error', 'message': f'Analytics error: {str(e)}'}
 
 
@@ -2,205 +2,683 @@
 Chatbot Analytics Module for LLM-powered data analysis and insights
 """
 
+import diskcache
+import orjson
 import requests
+import functools
 import json
+import hashlib
+import html
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-import os
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import Config
 from context_storage import context_storage
 
-# Disable SSL warnings for corporate environments
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Thomson Reuters AI platform configuration
+_TR_WORKSPACE_ID = "WePowerADBy"
+_TR_MODEL_NAME = "gpt-4o"
+_TR_ASSET_ID = "208321"
+_TR_CREDENTIALS_URL = "https://aiplatform.gcs.int.thomsonreuters.com/v1/openai/token"
+_TR_BASE_URL = "https://eais2-use.int.thomsonreuters.com"
+
+# Used when the token response does not say how long the credentials live
+_TR_CREDENTIALS_TTL = 300  # 5 minutes in seconds
+
+# Provider timeouts in seconds; quick suggestions get a (connect, read) pair so a
+# degraded provider cannot hold a request for the full analysis timeout
+_DEFAULT_TIMEOUT = 30
+_FAST_TIMEOUT = (3.0, 20.0)
+
+# After this many consecutive provider failures, calls fail fast until the reset timeout passes
+_BREAKER_FAIL_MAX = 5
+_BREAKER_RESET_TIMEOUT = 30  # seconds
+
+# Lists in additional context are cut to this many items to bound prompt size
+_MAX_CONTEXT_LIST_ITEMS = 100
+
+# Rough prompt budget; LLM latency and cost grow with input tokens. Tokens are
+# estimated at ~4 characters each, which is close enough to pick a pruning level.
+_PROMPT_TOKEN_BUDGET = 6000
+_CHARS_PER_TOKEN = 4
+
+# Progressively harsher (max list items, max nesting depth) used when a prompt is over budget
+_PRUNE_LEVELS = ((_MAX_CONTEXT_LIST_ITEMS, None), (25, 4), (5, 2))
+
+# Per-source analyzers used to fan out cross-source questions, as
+# (context key, heading, ChatbotAnalytics method name)
+_SOURCE_ANALYZERS = (
+    ('datadog', 'Datadog', 'analyze_datadog_metrics'),
+    ('github', 'GitHub', 'analyze_github_analytics'),
+    ('azuredevops', 'Azure DevOps', 'analyze_azure_devops_data'),
+    ('figma', 'Figma', 'analyze_figma_data'),
+)
+
+
+_TR_SYSTEM_PROMPT = "You are a concise analytics assistant. Provide brief, actionable insights in 2-3 sentences maximum. Focus on key findings and immediate recommendations. Use HTML formatting: <strong>bold</strong>, <ul><li>bullet points</li></ul>, <br/> for line breaks. Be direct and practical. Base your analysis on the provided context data from the analytics dashboard."
+_AZURE_SYSTEM_PROMPT = "You are an expert data analyst specializing in software development analytics. Provide clear, actionable insights based on the data provided."
+
+# Prompt templates, parsed once; only the user's question or data source is filled in per call
+_ANALYSIS_PROMPTS = {
+    "datadog": """Analyze the following Datadog metrics data and answer the user's question: "{question}"
+
+Focus on:
+- Performance trends and patterns
+- Anomalies or unusual behavior
+- Resource utilization insights
+- Recommendations for optimization
+
+Provide actionable insights in a clear, professional format.""".format,
+    "github": """Analyze the following GitHub analytics data and answer the user's question: "{question}"
+
+Focus on:
+- Development velocity and trends
+- Code review patterns
+- Team productivity metrics
+- Pull request quality indicators
+- Recommendations for process improvement
+
+Provide insights about development workflow and team performance.""".format,
+    "azuredevops": """Analyze the following Azure DevOps data and answer the user's question: "{question}"
+
+Focus on:
+- Work item completion trends
+- Development cycle insights
+- Team collaboration patterns
+- Project progress indicators
+- Process optimization opportunities
+
+Provide actionable recommendations for project management and development workflow.""".format,
+    "figma": """Analyze the following Figma design data and answer the user's question: "{question}"
+
+Focus on:
+- Design collaboration patterns
+- Project organization insights
+- Team design workflow
+- Asset management efficiency
+- Design system utilization
+
+Provide insights about design process and collaboration effectiveness.""".format,
+    "general": """Analyze the following comprehensive analytics data from multiple sources and answer the user's question: "{question}"
+
+Data sources include:
+- Datadog monitoring and metrics
+- GitHub development analytics  
+- Azure DevOps project management
+- Figma design collaboration
+
+Provide cross-platform insights, identify correlations between different data sources, and give strategic recommendations for improving overall development and design processes.""".format,
+}
+
+_SUMMARY_PROMPT = """Provide a concise executive summary of the {data_source} data below.
+
+Include:
+- Key metrics and trends
+- Notable patterns or anomalies
+- Top insights
+- Brief recommendations
+
+Keep it professional and actionable for management review.""".format
+
+_SUGGEST_QUESTIONS_PROMPT = """Based on the {data_source} data available, suggest 5 relevant questions that would provide valuable insights.
+
+The questions should be:
+- Specific to the data available
+- Actionable for decision-making
+- Cover different aspects (performance, trends, optimization, etc.)
+- Professional and business-focused
+
+Return EXACTLY 5 lines. Each line MUST be a single question ending in '?'. No numbering.""".format
+
+
+_PRIME_DASHBOARD_PROMPT = """For each data source below, prepare the dashboard's first view in one pass.
+
+Return a single JSON object keyed by data source ({sources}). Each value must be an object with:
+- "summary": a concise executive summary (key metrics, notable patterns, brief recommendations)
+- "questions": exactly 5 relevant questions about that data, each ending in '?'
+- "default_analysis": the most important actionable insight for that data
+
+Return only the JSON object.""".format
+
+# Room for a summary, five questions and an analysis per source
+_PRIME_DASHBOARD_MAX_TOKENS = 2000
+
+# Five short questions fit comfortably; a tighter cap stops the model rambling past them
+_SUGGEST_QUESTIONS_MAX_TOKENS = 220
+
+# One question per line, ignoring any list numbering or bullets the model adds anyway
+_QUESTION_RE = re.compile(r'(?m)^\s*(?:\d+[.)]\s*|[-*\u2022]\s*)?(.+?\?)\s*$')
+
+# Providers told to answer in HTML (or that add markdown anyway) wrap each question in markup:
+# block tags become line breaks, other tags and */_ emphasis markers are dropped before matching
+_BLOCK_TAG_RE = re.compile(r'(?i)</?(?:li|p|br|ul|ol|div|h[1-6])\b[^>]*>')
+_MARKUP_RE = re.compile(r'<[^>]+>|\*\*|__|(?<!\w)[*_]|[*_](?!\w)')
+
+
+def _parse_questions(response: str) -> List[str]:
+    """Questions in a model answer, one per line, with HTML and markdown markup removed"""
+    text = html.unescape(_MARKUP_RE.sub('', _BLOCK_TAG_RE.sub('\n', response)))
+    questions = _QUESTION_RE.findall(text)
+    if not questions:
+        # Questions that share a line with other text still count, as they always have
+        questions = [line.strip() for line in text.split('\n') if line.strip() and '?' in line]
+    return questions
+
+
+class _ProviderError(Exception):
+    """A provider call failed with a message meant for the user; never cached, and counted by the breaker"""
+
+
+class _CircuitBreaker:
+    """Fail fast while a provider keeps failing, then let one trial call through"""
+    
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+    
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            # Half-open: admit a single trial call whose result decides whether the circuit
+            # closes; a trial that never reports back is replaced after another reset timeout
+            if self._trial_in_flight and now - self._trial_started < self.reset_timeout:
+                return False
+            self._trial_in_flight = True
+            self._trial_started = now
+            return True
+    
+    def record(self, success: bool):
+        """Count a call result, opening the circuit after fail_max failures in a row"""
+        with self._lock:
+            self._trial_in_flight = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+
+def _chat_completion_delta(event):
+    """Text delta from an OpenAI-style chat completion stream event"""
+    choices = event.get('choices') or []
+    return choices[0].get('delta', {}).get('content') if choices else None
+
+
+def _anthropic_delta(event):
+    """Text delta from an Anthropic messages stream event"""
+    if event.get('type') == 'content_block_delta':
+        return event.get('delta', {}).get('text')
+    return None
+
+
+def _prune_context(value, max_items=_MAX_CONTEXT_LIST_ITEMS, max_depth=None, depth=0):
+    """Copy of a context value with long lists truncated to a '... N more' marker
+    
+    Containers nested deeper than max_depth are replaced by a one-line size summary.
+    """
+    if isinstance(value, (dict, list)) and max_depth is not None and depth >= max_depth:
+        return f"<{type(value).__name__} with {len(value)} items>"
+    if isinstance(value, dict):
+        return {key: _prune_context(item, max_items, max_depth, depth + 1) for key, item in value.items()}
+    if isinstance(value, list):
+        pruned = [_prune_context(item, max_items, max_depth, depth + 1) for item in value[:max_items]]
+        if len(value) > max_items:
+            pruned.append(f"... {len(value) - max_items} more")
+        return pruned
+    return value
+
+
+def _estimate_tokens(text: str) -> int:
+    """Approximate token count of a prompt"""
+    return len(text) // _CHARS_PER_TOKEN
+
+
+def _dumps_indented(value) -> str:
+    """Pretty-print a context value as JSON"""
+    return orjson.dumps(value, default=str,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
 
 class ChatbotAnalytics:
     """Chatbot for analyzing analytics data using LLM"""
     
     def __init__(self):
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
-        self.azure_openai_endpoint = os.getenv('AZURE_OPENAI_ENDPOINT')
-        self.azure_openai_key = os.getenv('AZURE_OPENAI_KEY')
-        self.azure_openai_deployment = os.getenv('AZURE_OPENAI_DEPLOYMENT')
+        self.openai_api_key = Config.OPENAI_API_KEY
+        self.anthropic_api_key = Config.ANTHROPIC_API_KEY
+        self.azure_openai_endpoint = Config.AZURE_OPENAI_ENDPOINT
+        self.azure_openai_key = Config.AZURE_OPENAI_KEY
+        self.azure_openai_deployment = Config.AZURE_OPENAI_DEPLOYMENT
         
         # Default to OpenAI if no specific provider is configured
-        self.llm_provider = os.getenv('LLM_PROVIDER', 'openai').lower()
+        self.llm_provider = Config.LLM_PROVIDER
         
-    def _get_llm_response(self, prompt: str, context_data: Dict = None, data_source: str = "general") -> str:
-        """Get response from configured LLM provider"""
+        # Shared session so every chat turn reuses keep-alive connections
+        # instead of paying a TCP/TLS handshake per request
+        self._session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
         
-        if self.llm_provider == 'openai':
-            return self._call_openai(prompt, context_data, data_source)
-        elif self.llm_provider == 'anthropic' and self.anthropic_api_key:
-            return self._call_anthropic(prompt, context_data, data_source)
-        elif self.llm_provider == 'azure' and self.azure_openai_endpoint:
-            return self._call_azure_openai(prompt, context_data, data_source)
-        else:
-            return self._get_fallback_response(prompt, context_data, data_source)
+        # Corporate endpoints (Thomson Reuters, Azure OpenAI) are verified against the
+        # corporate CA bundle when one is configured; otherwise verification stays off
+        # for them as before. The pooled connections keep their SSL context between calls.
+        self._corp_verify = Config.CORP_CA_BUNDLE or False
+        if not self._corp_verify:
+            # Disable SSL warnings for corporate environments without a CA bundle
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        
+        # Thomson Reuters credentials are reused until they expire
+        self._credentials_lock = threading.Lock()
+        self._tr_credentials = None
+        self._tr_credentials_expiry = 0.0
+        
+        # Independent LLM calls (per-source analyses, credential prefetch) run concurrently
+        self._executor = ThreadPoolExecutor(max_workers=len(_SOURCE_ANALYZERS), thread_name_prefix='chatbot-llm')
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='chatbot-token')
+        
+        # Provider failures trip the breaker so a degraded provider is not hammered
+        self._breaker = _CircuitBreaker(_BREAKER_FAIL_MAX, _BREAKER_RESET_TIMEOUT)
+        
+        # LRU + TTL cache of LLM answers so unchanged dashboard data is not re-analyzed;
+        # optionally backed by disk so answers survive restarts
+        self._cache_lock = threading.Lock()
+        self._response_cache = OrderedDict()
+        self._response_cache_size = Config.CHATBOT_CACHE_SIZE
+        self._response_cache_ttl = Config.CHATBOT_CACHE_TTL
+        self._disk_cache = diskcache.Cache(Config.CHATBOT_CACHE_DIR) if Config.CHATBOT_CACHE_DIR else None
+        
+        # Format the stored context in the background so the first question does not pay for it
+        self._prefetch_executor.submit(self._prewarm_context)
+        
+    def _prewarm_context(self):
+        """Fill context_storage's rendered context cache for every data source"""
+        for data_source in [key for key, _, _ in _SOURCE_ANALYZERS] + ["general"]:
+            context_storage.get_context_for_llm(data_source)
+    
+    def _get_tr_credentials(self):
+        """Return (credentials, error) for the Thomson Reuters OpenAI endpoint, reusing cached credentials"""
+        with self._credentials_lock:
+            if self._tr_credentials and time.time() < self._tr_credentials_expiry:
+                return self._tr_credentials, None
+        
+        # Fetch without holding the lock so a slow token endpoint cannot stall every other turn;
+        # concurrent refreshes at worst fetch twice
+        credentials_payload = {"workspace_id": _TR_WORKSPACE_ID, "model_name": _TR_MODEL_NAME}
+        credentials_response = self._session.post(
+            _TR_CREDENTIALS_URL,
+            json=credentials_payload,
+            timeout=_DEFAULT_TIMEOUT,
+            verify=self._corp_verify
+        )
+        
+        if credentials_response.status_code != 200:
+            return None, f"Failed to get credentials: {credentials_response.status_code} - {credentials_response.text}"
+        
+        credentials = orjson.loads(credentials_response.content)
+        
+        if "openai_key" not in credentials or "openai_endpoint" not in credentials:
+            return None, "Failed to retrieve OpenAI credentials from Thomson Reuters"
+        
+        ttl = credentials.get("expires_in") or _TR_CREDENTIALS_TTL
+        with self._credentials_lock:
+            self._tr_credentials = credentials
+            self._tr_credentials_expiry = time.time() + min(float(ttl), _TR_CREDENTIALS_TTL)
+        return credentials, None
+    
+    def _invalidate_tr_credentials(self):
+        """Drop cached credentials so the next call fetches fresh ones"""
+        with self._credentials_lock:
+            self._tr_credentials = None
+            self._tr_credentials_expiry = 0.0
+        
+    def _has_llm_provider(self) -> bool:
+        """Whether a real LLM provider (not the fallback message) will answer"""
+        return (self.llm_provider == 'openai'
+                or (self.llm_provider == 'anthropic' and bool(self.anthropic_api_key))
+                or (self.llm_provider == 'azure' and bool(self.azure_openai_endpoint)))
+    
+    def _response_cache_key(self, prompt: str, context_data: Dict, data_source: str) -> str:
+        """Stable key for an LLM answer; stored context is covered by a digest of the data in the prompt"""
+        stable_context = json.dumps(context_data, sort_keys=True, default=str)
+        stored_digest = context_storage.get_context_digest(data_source) if data_source else ""
+        raw_key = "|".join((self.llm_provider, str(data_source), prompt, stable_context, stored_digest))
+        return hashlib.blake2b(raw_key.encode(), digest_size=16).hexdigest()
     
-    def _call_openai(self, prompt: str, context_data: Dict = None, data_source: str = "general") -> str:
-        """Call Thomson Reuters Azure OpenAI API"""
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Return a fresh cached answer, checking memory before disk"""
+        with self._cache_lock:
+            entry = self._response_cache.get(key)
+            if entry and entry[0] > time.time():
+                self._response_cache.move_to_end(key)
+                return entry[1]
+        if self._disk_cache is not None:
+            return self._disk_cache.get(key)
+        return None
+    
+    def _set_cached_response(self, key: str, response: str):
+        """Store an answer in the LRU cache (and on disk when configured)"""
+        with self._cache_lock:
+            self._response_cache[key] = (time.time() + self._response_cache_ttl, response)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self._response_cache_size:
+                self._response_cache.popitem(last=False)
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, response, expire=self._response_cache_ttl)
+    
+    def _get_llm_response(self, prompt: str, context_data: Dict = None, data_source: Optional[str] = "general",
+                          max_tokens: Optional[int] = None, json_mode: bool = False,
+                          timeout=_DEFAULT_TIMEOUT) -> str:
+        """Get response from configured LLM provider"""
+        if not self._has_llm_provider():
+            return self._get_fallback_response(prompt, context_data, data_source)
+        
+        cache_key = self._response_cache_key(prompt, context_data, data_source)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        if not self._breaker.allow():
+            return self._circuit_open_message()
+        
         try:
-            # Thomson Reuters API configuration
-            workspace_id = "WePowerADBy"
-            model_name = "gpt-4o"
-            asset_id = "208321"
-            
-            # Get credentials from Thomson Reuters endpoint
-            credentials_url = "https://aiplatform.gcs.int.thomsonreuters.com/v1/openai/token"
-            credentials_payload = {"workspace_id": workspace_id, "model_name": model_name}
-            
-            credentials_response = requests.post(
-                credentials_url, 
-                json=credentials_payload,
-                verify=False
-            )
-            
-            if credentials_response.status_code != 200:
-                return f"Failed to get credentials: {credentials_response.status_code} - {credentials_response.text}"
-            
-            credentials = credentials_response.json()
-            
-            if "openai_key" not in credentials or "openai_endpoint" not in credentials:
-                return "Failed to retrieve OpenAI credentials from Thomson Reuters"
-            
-            OPENAI_API_KEY = credentials["openai_key"]
-            OPENAI_DEPLOYMENT_ID = credentials["azure_deployment"]
-            OPENAI_API_VERSION = credentials["openai_api_version"]
-            token = credentials["token"]
-            llm_profile_key = OPENAI_DEPLOYMENT_ID.split("/")[0]
-            OPENAI_BASE_URL = "https://eais2-use.int.thomsonreuters.com"
-            
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "api-key": OPENAI_API_KEY,
-                "Content-Type": "application/json",
-                "x-tr-chat-profile-name": "ai-platforms-chatprofile-prod",
-                "x-tr-userid": workspace_id,
-                "x-tr-llm-profile-key": llm_profile_key,
-                "x-tr-user-sensitivity": "true",
-                "x-tr-sessionid": OPENAI_DEPLOYMENT_ID,
-                "x-tr-asset-id": asset_id,
-                "x-tr-authorization": OPENAI_BASE_URL,
-            }
-            
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a concise analytics assistant. Provide brief, actionable insights in 2-3 sentences maximum. Focus on key findings and immediate recommendations. Use HTML formatting: <strong>bold</strong>, <ul><li>bullet points</li></ul>, <br/> for line breaks. Be direct and practical. Base your analysis on the provided context data from the analytics dashboard."
-                },
-                {
-                    "role": "user", 
-                    "content": self._format_prompt_with_context(prompt, context_data, data_source)
-                }
-            ]
-            
-            payload = {
-                "model": model_name,
-                "messages": messages,
-                "max_tokens": 300,
-                "temperature": 0.7
+            if self.llm_provider == 'openai':
+                response = self._call_openai(prompt, context_data, data_source, max_tokens, json_mode, timeout)
+            elif self.llm_provider == 'anthropic':
+                response = self._call_anthropic(prompt, context_data, data_source, max_tokens, json_mode, timeout)
+            else:
+                response = self._call_azure_openai(prompt, context_data, data_source, max_tokens, json_mode, timeout)
+        except _ProviderError as e:
+            self._breaker.record(False)
+            return str(e)
+        
+        self._breaker.record(True)
+        self._set_cached_response(cache_key, response)
+        return response
+    
+    def _circuit_open_message(self) -> str:
+        """Error returned while the circuit breaker is open"""
+        return (f"Failed to reach {self.llm_provider}: too many recent errors, "
+                f"retrying in up to {_BREAKER_RESET_TIMEOUT} seconds")
+    
+    def _openai_request(self, prompt: str, context_data: Dict = None, data_source: str = "general",
+                        max_tokens: Optional[int] = None, json_mode: bool = False):
+        """Build (url, headers, payload) for a Thomson Reuters chat completion"""
+        # Get credentials from Thomson Reuters endpoint (cached between turns) while
+        # the prompt is formatted, so a cold token fetch overlaps with local work
+        credentials_future = self._prefetch_executor.submit(self._get_tr_credentials)
+        user_content = self._format_prompt_with_context(prompt, context_data, data_source)
+        credentials, error = credentials_future.result()
+        if error:
+            raise _ProviderError(error)
+        
+        OPENAI_API_KEY = credentials["openai_key"]
+        OPENAI_DEPLOYMENT_ID = credentials["azure_deployment"]
+        OPENAI_API_VERSION = credentials["openai_api_version"]
+        token = credentials["token"]
+        llm_profile_key = OPENAI_DEPLOYMENT_ID.split("/")[0]
+        OPENAI_BASE_URL = _TR_BASE_URL
+        
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "api-key": OPENAI_API_KEY,
+            "Content-Type": "application/json",
+            "x-tr-chat-profile-name": "ai-platforms-chatprofile-prod",
+            "x-tr-userid": _TR_WORKSPACE_ID,
+            "x-tr-llm-profile-key": llm_profile_key,
+            "x-tr-user-sensitivity": "true",
+            "x-tr-sessionid": OPENAI_DEPLOYMENT_ID,
+            "x-tr-asset-id": _TR_ASSET_ID,
+            "x-tr-authorization": OPENAI_BASE_URL,
+        }
+        
+        messages = [
+            {
+                "role": "system",
+                "content": _TR_SYSTEM_PROMPT
+            },
+            {
+                "role": "user", 
+                "content": user_content
             }
+        ]
+        
+        payload = {
+            "model": _TR_MODEL_NAME,
+            "messages": messages,
+            "max_tokens": max_tokens or 300,
+            "temperature": 0.7
+        }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        
+        url = f"{OPENAI_BASE_URL}/openai/deployments/{OPENAI_DEPLOYMENT_ID}/chat/completions?api-version={OPENAI_API_VERSION}"
+        return url, headers, payload
+    
+    def _call_openai(self, prompt: str, context_data: Dict = None, data_source: str = "general",
+                     max_tokens: Optional[int] = None, json_mode: bool = False,
+                     timeout=_DEFAULT_TIMEOUT) -> str:
+        """Call Thomson Reuters Azure OpenAI API; raises _ProviderError on failure"""
+        try:
+            url, headers, payload = self._openai_request(prompt, context_data, data_source, max_tokens, json_mode)
             
-            response = requests.post(
-                f"{OPENAI_BASE_URL}/openai/deployments/{OPENAI_DEPLOYMENT_ID}/chat/completions?api-version={OPENAI_API_VERSION}",
+            response = self._session.post(
+                url,
                 headers=headers,
-                json=payload,
-                timeout=30,
-                verify=False  # Disable SSL verification for corporate environments
+                data=orjson.dumps(payload),
+                timeout=timeout,
+                verify=self._corp_verify
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 return result['choices'][0]['message']['content']
             else:
-                return f"Thomson Reuters OpenAI API Error: {response.status_code} - {response.text}"
+                if response.status_code in (401, 403):
+                    # Credentials were revoked or expired early; refetch on the next turn
+                    self._invalidate_tr_credentials()
+                raise _ProviderError(f"Thomson Reuters OpenAI API Error: {response.status_code} - {response.text}")
                 
+        except _ProviderError:
+            raise
         except Exception as e:
-            return f"Error calling OpenAI: {str(e)}"
+            raise _ProviderError(f"Error calling OpenAI: {str(e)}") from e
+    
+    def _anthropic_request(self, prompt: str, context_data: Dict = None, data_source: str = "general",
+                           max_tokens: Optional[int] = None, json_mode: bool = False):
+        """Build (url, headers, payload) for an Anthropic message"""
+        headers = {
+            'x-api-key': self.anthropic_api_key,
+            'Content-Type': 'application/json',
+            'anthropic-version': '2023-06-01'
+        }
+        
+        formatted_prompt = self._format_prompt_with_context(prompt, context_data, data_source)
+        
+        payload = {
+            "model": "claude-3-sonnet-20240229",
+            "max_tokens": max_tokens or 1000,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": formatted_prompt
+                }
+            ]
+        }
+        
+        return 'https://api.anthropic.com/v1/messages', headers, payload
     
-    def _call_anthropic(self, prompt: str, context_data: Dict = None, data_source: str = "general") -> str:
-        """Call Anthropic Claude API"""
+    def _call_anthropic(self, prompt: str, context_data: Dict = None, data_source: str = "general",
+                        max_tokens: Optional[int] = None, json_mode: bool = False,
+                        timeout=_DEFAULT_TIMEOUT) -> str:
+        """Call Anthropic Claude API; raises _ProviderError on failure"""
         try:
-            headers = {
-                'x-api-key': self.anthropic_api_key,
-                'Content-Type': 'application/json',
-                'anthropic-version': '2023-06-01'
-            }
+            url, headers, payload = self._anthropic_request(prompt, context_data, data_source, max_tokens, json_mode)
             
-            formatted_prompt = self._format_prompt_with_context(prompt, context_data)
-            
-            payload = {
-                "model": "claude-3-sonnet-20240229",
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": formatted_prompt
-                    }
-                ]
-            }
-            
-            response = requests.post(
-                'https://api.anthropic.com/v1/messages',
+            response = self._session.post(
+                url,
                 headers=headers,
-                json=payload,
-                timeout=30
+                data=orjson.dumps(payload),
+                timeout=timeout
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 return result['content'][0]['text']
             else:
-                return f"Anthropic API Error: {response.status_code} - {response.text}"
+                raise _ProviderError(f"Anthropic API Error: {response.status_code} - {response.text}")
                 
+        except _ProviderError:
+            raise
         except Exception as e:
-            return f"Error calling Anthropic: {str(e)}"
+            raise _ProviderError(f"Error calling Anthropic: {str(e)}") from e
     
-    def _call_azure_openai(self, prompt: str, context_data: Dict = None, data_source: str = "general") -> str:
-        """Call Azure OpenAI API"""
-        try:
-            headers = {
-                'api-key': self.azure_openai_key,
-                'Content-Type': 'application/json'
-            }
-            
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an expert data analyst specializing in software development analytics. Provide clear, actionable insights based on the data provided."
-                },
-                {
-                    "role": "user",
-                    "content": self._format_prompt_with_context(prompt, context_data)
-                }
-            ]
-            
-            payload = {
-                "messages": messages,
-                "max_tokens": 1000,
-                "temperature": 0.7
+    def _azure_openai_request(self, prompt: str, context_data: Dict = None, data_source: str = "general",
+                              max_tokens: Optional[int] = None, json_mode: bool = False):
+        """Build (url, headers, payload) for an Azure OpenAI chat completion"""
+        headers = {
+            'api-key': self.azure_openai_key,
+            'Content-Type': 'application/json'
+        }
+        
+        messages = [
+            {
+                "role": "system",
+                "content": _AZURE_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": self._format_prompt_with_context(prompt, context_data, data_source)
             }
+        ]
+        
+        payload = {
+            "messages": messages,
+            "max_tokens": max_tokens or 1000,
+            "temperature": 0.7
+        }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        
+        url = f"{self.azure_openai_endpoint}/openai/deployments/{self.azure_openai_deployment}/chat/completions?api-version=2023-12-01-preview"
+        return url, headers, payload
+    
+    def _call_azure_openai(self, prompt: str, context_data: Dict = None, data_source: str = "general",
+                           max_tokens: Optional[int] = None, json_mode: bool = False,
+                           timeout=_DEFAULT_TIMEOUT) -> str:
+        """Call Azure OpenAI API; raises _ProviderError on failure"""
+        try:
+            url, headers, payload = self._azure_openai_request(prompt, context_data, data_source, max_tokens, json_mode)
             
-            url = f"{self.azure_openai_endpoint}/openai/deployments/{self.azure_openai_deployment}/chat/completions?api-version=2023-12-01-preview"
-            
-            response = requests.post(
+            response = self._session.post(
                 url,
                 headers=headers,
-                json=payload,
-                timeout=30,
-                verify=False  # Disable SSL verification for corporate environments
+                data=orjson.dumps(payload),
+                timeout=timeout,
+                verify=self._corp_verify
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 return result['choices'][0]['message']['content']
             else:
-                return f"Azure OpenAI API Error: {response.status_code} - {response.text}"
+                raise _ProviderError(f"Azure OpenAI API Error: {response.status_code} - {response.text}")
                 
+        except _ProviderError:
+            raise
         except Exception as e:
-            return f"Error calling Azure OpenAI: {str(e)}"
+            raise _ProviderError(f"Error calling Azure OpenAI: {str(e)}") from e
+    
+    def _stream_completion(self, url: str, headers: Dict, payload: Dict, extract_text, error_label: str,
+                           on_auth_error=None, **post_kwargs):
+        """POST a streaming completion request and yield text deltas from its server-sent events
+        
+        on_auth_error, when given, is called on a 401/403 before the error is raised.
+        """
+        payload = dict(payload, stream=True)
+        with self._session.post(url, headers=headers, data=orjson.dumps(payload), timeout=_DEFAULT_TIMEOUT, stream=True, **post_kwargs) as response:
+            if response.status_code != 200:
+                if on_auth_error is not None and response.status_code in (401, 403):
+                    on_auth_error()
+                raise _ProviderError(f"{error_label}: {response.status_code} - {response.text}")
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    break
+                text = extract_text(orjson.loads(data))
+                if text:
+                    yield text
+    
+    def _stream_provider(self, prompt: str, context_data: Dict = None, data_source: str = "general"):
+        """Yield response text deltas from the configured provider"""
+        if self.llm_provider == 'openai':
+            url, headers, payload = self._openai_request(prompt, context_data, data_source)
+            # Credentials were revoked or expired early; refetch on the next turn, as _call_openai does
+            yield from self._stream_completion(url, headers, payload, _chat_completion_delta,
+                                               "Thomson Reuters OpenAI API Error",
+                                               on_auth_error=self._invalidate_tr_credentials,
+                                               verify=self._corp_verify)
+        elif self.llm_provider == 'anthropic':
+            url, headers, payload = self._anthropic_request(prompt, context_data, data_source)
+            yield from self._stream_completion(url, headers, payload, _anthropic_delta, "Anthropic API Error")
+        else:
+            url, headers, payload = self._azure_openai_request(prompt, context_data, data_source)
+            yield from self._stream_completion(url, headers, payload, _chat_completion_delta,
+                                               "Azure OpenAI API Error", verify=self._corp_verify)
+    
+    def _get_llm_response_stream(self, prompt: str, context_data: Dict = None, data_source: str = "general"):
+        """Yield the LLM response in chunks as the provider generates it"""
+        if not self._has_llm_provider():
+            yield self._get_fallback_response(prompt, context_data, data_source)
+            return
+        
+        cache_key = self._response_cache_key(prompt, context_data, data_source)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        if not self._breaker.allow():
+            yield self._circuit_open_message()
+            return
+        
+        chunks = []
+        try:
+            for chunk in self._stream_provider(prompt, context_data, data_source):
+                chunks.append(chunk)
+                yield chunk
+        except _ProviderError as e:
+            self._breaker.record(False)
+            yield str(e)
+            return
+        except Exception as e:
+            self._breaker.record(False)
+            yield f"Error calling {self.llm_provider}: {str(e)}"
+            return
+        
+        self._breaker.record(True)
+        # Only complete answers are cached
+        self._set_cached_response(cache_key, "".join(chunks))
     
     def _get_fallback_response(self, prompt: str, context_data: Dict = None, data_source: str = "general") -> str:
         """Fallback response when no LLM is configured"""
@@ -222,125 +700,129 @@ I can see you're asking about: "{prompt}"
 
 Once configured, I'll be able to provide intelligent insights and analysis of your data!"""
     
-    def _format_prompt_with_context(self, prompt: str, context_data: Dict = None, data_source: str = "general") -> str:
-        """Format the prompt with context data from storage and provided context"""
-        # Get stored context from all APIs
-        stored_context = context_storage.get_context_for_llm(data_source)
-        
-        # Add provided context data if available
-        additional_context = ""
-        if context_data:
-            additional_context = "\n\n**Additional Context Data:**\n"
-            for key, value in context_data.items():
-                if isinstance(value, (dict, list)):
-                    additional_context += f"- {key}: {json.dumps(value, indent=2)}\n"
-                else:
-                    additional_context += f"- {key}: {value}\n"
+    def _format_prompt_with_context(self, prompt: str, context_data: Dict = None, data_source: Optional[str] = "general") -> str:
+        """Format the prompt with context data from storage and provided context; data_source None skips storage"""
+        # Get stored context from all APIs (context_storage reuses the text until the data changes)
+        stored_context = context_storage.get_context_for_llm(data_source) if data_source else ""
         
-        # Combine all context
-        full_context = f"{stored_context}{additional_context}"
+        # Add provided context data if available, pruning harder until the prompt fits the budget
+        for max_items, max_depth in _PRUNE_LEVELS:
+            buffer = io.StringIO()
+            buffer.write(stored_context)
+            
+            if context_data:
+                buffer.write("\n\n**Additional Context Data:**\n")
+                for key, value in context_data.items():
+                    if isinstance(value, (dict, list)):
+                        buffer.write(f"- {key}: {_dumps_indented(_prune_context(value, max_items, max_depth))}\n")
+                    else:
+                        buffer.write(f"- {key}: {value}\n")
+            
+            buffer.write(f"\n\n**Question:** {prompt}")
+            formatted = buffer.getvalue()
+            if not context_data or _estimate_tokens(formatted) <= _PROMPT_TOKEN_BUDGET:
+                break
         
-        return f"{full_context}\n\n**Question:** {prompt}"
+        return formatted
+    
+    def _analysis_prompt(self, data_source: str, user_question: str) -> str:
+        """Prompt for a single-source analysis of the user's question"""
+        return _ANALYSIS_PROMPTS.get(data_source, _ANALYSIS_PROMPTS["general"])(question=user_question)
     
     def analyze_datadog_metrics(self, metrics_data: Dict, user_question: str) -> str:
         """Analyze Datadog metrics data"""
-        prompt = f"""Analyze the following Datadog metrics data and answer the user's question: "{user_question}"
-
-Focus on:
-- Performance trends and patterns
-- Anomalies or unusual behavior
-- Resource utilization insights
-- Recommendations for optimization
-
-Provide actionable insights in a clear, professional format."""
-        
-        return self._get_llm_response(prompt, metrics_data, "datadog")
+        return self._get_llm_response(self._analysis_prompt("datadog", user_question), metrics_data, "datadog")
     
     def analyze_github_analytics(self, github_data: Dict, user_question: str) -> str:
         """Analyze GitHub pull request analytics"""
-        prompt = f"""Analyze the following GitHub analytics data and answer the user's question: "{user_question}"
-
-Focus on:
-- Development velocity and trends
-- Code review patterns
-- Team productivity metrics
-- Pull request quality indicators
-- Recommendations for process improvement
-
-Provide insights about development workflow and team performance."""
-        
-        return self._get_llm_response(prompt, github_data, "github")
+        return self._get_llm_response(self._analysis_prompt("github", user_question), github_data, "github")
     
     def analyze_azure_devops_data(self, azure_data: Dict, user_question: str) -> str:
         """Analyze Azure DevOps work items and PRs"""
-        prompt = f"""Analyze the following Azure DevOps data and answer the user's question: "{user_question}"
-
-Focus on:
-- Work item completion trends
-- Development cycle insights
-- Team collaboration patterns
-- Project progress indicators
-- Process optimization opportunities
-
-Provide actionable recommendations for project management and development workflow."""
-        
-        return self._get_llm_response(prompt, azure_data, "azuredevops")
+        return self._get_llm_response(self._analysis_prompt("azuredevops", user_question), azure_data, "azuredevops")
     
     def analyze_figma_data(self, figma_data: Dict, user_question: str) -> str:
         """Analyze Figma design analytics"""
-        prompt = f"""Analyze the following Figma design data and answer the user's question: "{user_question}"
-
-Focus on:
-- Design collaboration patterns
-- Project organization insights
-- Team design workflow
-- Asset management efficiency
-- Design system utilization
-
-Provide insights about design process and collaboration effectiveness."""
-        
-        return self._get_llm_response(prompt, figma_data, "figma")
+        return self._get_llm_response(self._analysis_prompt("figma", user_question), figma_data, "figma")
+    
+    def stream_analysis(self, data_source: str, context_data: Dict, user_question: str):
+        """Yield an analysis of the user's question chunk by chunk as the LLM generates it"""
+        if data_source not in _ANALYSIS_PROMPTS:
+            data_source = "general"
+        prompt = self._analysis_prompt(data_source, user_question)
+        return self._get_llm_response_stream(prompt, context_data, data_source)
     
     def get_general_insights(self, all_data: Dict, user_question: str) -> str:
         """Get general insights across all data sources"""
-        prompt = f"""Analyze the following comprehensive analytics data from multiple sources and answer the user's question: "{user_question}"
-
-Data sources include:
-- Datadog monitoring and metrics
-- GitHub development analytics  
-- Azure DevOps project management
-- Figma design collaboration
-
-Provide cross-platform insights, identify correlations between different data sources, and give strategic recommendations for improving overall development and design processes."""
+        # When the context is split by source, analyze each source concurrently so the
+        # turn takes as long as the slowest source rather than one giant prompt
+        sources = [(heading, getattr(self, method), all_data[key])
+                   for key, heading, method in _SOURCE_ANALYZERS
+                   if all_data and all_data.get(key)]
+        if len(sources) > 1 and self._has_llm_provider():
+            futures = [(heading, self._executor.submit(analyze, data, user_question))
+                       for heading, analyze, data in sources]
+            # One deadline for the whole turn; sources still running when it passes are reported as timed out
+            deadline = time.monotonic() + Config.CHATBOT_INSIGHTS_DEADLINE
+            answers = []
+            for heading, future in futures:
+                try:
+                    answer = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    answer = f"Failed to analyze {heading} within {Config.CHATBOT_INSIGHTS_DEADLINE} seconds"
+                answers.append(f"<strong>{heading}</strong><br/>{answer}")
+            return "<br/>".join(answers)
         
-        return self._get_llm_response(prompt, all_data, "general")
+        return self._get_llm_response(self._analysis_prompt("general", user_question), all_data, "general")
+    
+    def prime_dashboard(self, sources_data: Dict[str, Dict]) -> Dict:
+        """Summary, suggested questions and a default analysis for every source in one LLM call"""
+        sources = [source for source, data in sources_data.items() if data]
+        if not sources:
+            return {}
+        
+        prompt = _PRIME_DASHBOARD_PROMPT(sources=", ".join(sources))
+        # The caller sends every source's data, so stored context would only repeat it
+        response = self._get_llm_response(prompt, {source: sources_data[source] for source in sources},
+                                          data_source=None,
+                                          max_tokens=_PRIME_DASHBOARD_MAX_TOKENS, json_mode=True)
+        
+        # Providers without a JSON mode may wrap the object in prose
+        start, end = response.find("{"), response.rfind("}")
+        try:
+            primed = orjson.loads(response[start:end + 1]) if start != -1 and end > start else None
+        except ValueError:
+            primed = None
+        if not isinstance(primed, dict):
+            return {'error': response}
+        
+        entries = {source: primed.get(source) if isinstance(primed.get(source), dict) else {}
+                   for source in sources}
+        return {
+            source: {
+                'summary': entry.get('summary', ''),
+                'questions': list(entry.get('questions') or [])[:5],
+                'default_analysis': entry.get('default_analysis', '')
+            }
+            for source, entry in entries.items()
+        }
     
     def get_data_summary(self, data_source: str, data: Dict) -> str:
         """Get a summary of data from a specific source"""
-        prompt = f"""Provide a concise executive summary of the {data_source} data below.
-
-Include:
-- Key metrics and trends
-- Notable patterns or anomalies
-- Top insights
-- Brief recommendations
-
-Keep it professional and actionable for management review."""
+        prompt = _SUMMARY_PROMPT(data_source=data_source)
         
         return self._get_llm_response(prompt, data)
     
     def suggest_questions(self, data_source: str, available_data: Dict) -> List[str]:
         """Suggest relevant questions based on available data"""
-        prompt = f"""Based on the {data_source} data available, suggest 5 relevant questions that would provide valuable insights.
+        prompt = _SUGGEST_QUESTIONS_PROMPT(data_source=data_source)
+        
+        response = self._get_llm_response(prompt, available_data, max_tokens=_SUGGEST_QUESTIONS_MAX_TOKENS,
+                                          timeout=_FAST_TIMEOUT)
+        return _parse_questions(response)[:5]  # Return top 5 questions
 
-The questions should be:
-- Specific to the data available
-- Actionable for decision-making
-- Cover different aspects (performance, trends, optimization, etc.)
-- Professional and business-focused
 
-Return only the questions, one per line."""
-        
-        response = self._get_llm_response(prompt, available_data)
-        questions = [q.strip() for q in response.split('\n') if q.strip() and '?' in q]
-        return questions[:5]  # Return top 5 questions
+@functools.lru_cache(maxsize=1)
+def get_chatbot() -> ChatbotAnalytics:
+    """Shared ChatbotAnalytics instance, so callers reuse one session and response cache"""
+    return ChatbotAnalytics()
@@ -1,74 +1,94 @@
+import functools
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-class Config:
-    """Application configuration"""
-    
-    # Flask configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-    FLASK_ENV = os.getenv('FLASK_ENV', 'development')
-    FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
-    
-    # Datadog configuration
-    DD_API_KEY = os.getenv('DD_API_KEY', 'dd_api_key_placeholder_12345678901234567890')
-    DD_APPLICATION_KEY = os.getenv('DD_APPLICATION_KEY', 'dd_app_key_placeholder_abcdef1234567890abcdef1234567890abcdef12')
-    DD_SITE = os.getenv('DD_SITE', 'datadoghq.com')
-    
-    # GitHub configuration
-    # Option 1: Set directly in code (replace with your actual values)
-    GITHUB_TOKEN = 'ghp_placeholder_token_1234567890abcdefghijklmnop'  # GitHub personal access token
-    GITHUB_OWNER = 'your-github-org'    # GitHub organization name
-    GITHUB_REPO = 'your-repository-name'     # Repository name for analytics
-    
-    # Option 2: Use environment variables (comment out the above and uncomment below)
-    # GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-    # GITHUB_OWNER = os.getenv('GITHUB_OWNER', '')
-    # GITHUB_REPO = os.getenv('GITHUB_REPO', '')
-    
-    # Option 3: Import from separate config file (uncomment below and create github_config.py)
-    # try:
-    #     from github_config import GITHUB_TOKEN, GITHUB_OWNER, GITHUB_REPO
-    # except ImportError:
-    #     GITHUB_TOKEN = None
-    #     GITHUB_OWNER = ''
-    #     GITHUB_REPO = ''
-    
-    # Azure DevOps configuration
-    # Option 1: Set directly in code (replace with your actual values)
-    AZURE_DEVOPS_PAT = 'ado_pat_placeholder_1234567890abcdefghijklmnopqrstuvwxyz1234567890abcdef'  # Azure DevOps PAT
-    AZURE_DEVOPS_ORG = 'your-ado-org'       # Your organization name
-    AZURE_DEVOPS_PROJECT = 'YourProject'        # Your project name
-    AZURE_DEVOPS_AREA_PATH = ''      # Will be set via user input (optional)
-    
-    # Option 2: Use environment variables (comment out the above and uncomment below)
-    # AZURE_DEVOPS_PAT = os.getenv('AZURE_DEVOPS_PAT')
-    # AZURE_DEVOPS_ORG = os.getenv('AZURE_DEVOPS_ORG', '')
-    # AZURE_DEVOPS_PROJECT = os.getenv('AZURE_DEVOPS_PROJECT', '')
-    
-    # Figma configuration
-    # Option 1: Set directly in code (replace with your actual values)
-    FIGMA_TOKEN = 'figma_token_placeholder_abcd1234567890'  # Replace with your Figma personal access token
-    FIGMA_TEAM_ID = 'figma_team_id_placeholder_9876543210'    # Replace with your Figma team ID
-    
-    # Option 2: Use environment variables (comment out the above and uncomment below)
-    # FIGMA_TOKEN = os.getenv('FIGMA_TOKEN')
-    # FIGMA_TEAM_ID = os.getenv('FIGMA_TEAM_ID', '')
-    
+from types import SimpleNamespace
+
+
+@functools.lru_cache(maxsize=1)
+def _load_settings():
+    """Read .env and the environment once, on first access to a setting"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    return SimpleNamespace(
+        # Flask configuration
+        SECRET_KEY=os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production'),
+        FLASK_ENV=os.getenv('FLASK_ENV', 'development'),
+        FLASK_DEBUG=os.getenv('FLASK_DEBUG', 'True').lower() == 'true',
+
+        # Datadog configuration
+        DD_API_KEY=os.getenv('DD_API_KEY'),
+        DD_APPLICATION_KEY=os.getenv('DD_APPLICATION_KEY'),
+        DD_SITE=os.getenv('DD_SITE', 'datadoghq.com'),
+
+        # GitHub configuration
+        # Set via environment variables, or import from a separate config file:
+        #     from github_config import GITHUB_TOKEN, GITHUB_OWNER, GITHUB_REPO
+        GITHUB_TOKEN=os.getenv('GITHUB_TOKEN'),  # GitHub personal access token
+        GITHUB_OWNER=os.getenv('GITHUB_OWNER', ''),  # GitHub organization name
+        GITHUB_REPO=os.getenv('GITHUB_REPO', ''),  # Repository name for analytics
+
+        # Azure DevOps configuration
+        AZURE_DEVOPS_PAT=os.getenv('AZURE_DEVOPS_PAT'),  # Azure DevOps PAT
+        AZURE_DEVOPS_ORG=os.getenv('AZURE_DEVOPS_ORG', ''),  # Your organization name
+        AZURE_DEVOPS_PROJECT=os.getenv('AZURE_DEVOPS_PROJECT', ''),  # Your project name
+        AZURE_DEVOPS_AREA_PATH='',  # Will be set via user input (optional)
+
+        # Figma configuration
+        FIGMA_TOKEN=os.getenv('FIGMA_TOKEN'),  # Figma personal access token
+        FIGMA_TEAM_ID=os.getenv('FIGMA_TEAM_ID', ''),  # Figma team ID
+
+        # Chatbot LLM providers
+        OPENAI_API_KEY=os.getenv('OPENAI_API_KEY'),
+        ANTHROPIC_API_KEY=os.getenv('ANTHROPIC_API_KEY'),
+        AZURE_OPENAI_ENDPOINT=os.getenv('AZURE_OPENAI_ENDPOINT'),
+        AZURE_OPENAI_KEY=os.getenv('AZURE_OPENAI_KEY'),
+        AZURE_OPENAI_DEPLOYMENT=os.getenv('AZURE_OPENAI_DEPLOYMENT'),
+        LLM_PROVIDER=os.getenv('LLM_PROVIDER', 'openai').lower(),
+
+        # Corporate CA bundle for verifying internal LLM endpoints (verification is off when unset)
+        CORP_CA_BUNDLE=os.getenv('CORP_CA_BUNDLE'),
+
+        # Chatbot response cache
+        CHATBOT_CACHE_TTL=int(os.getenv('CHATBOT_CACHE_TTL', '600')),  # 10 minutes in seconds
+        CHATBOT_CACHE_SIZE=int(os.getenv('CHATBOT_CACHE_SIZE', '512')),
+        CHATBOT_CACHE_DIR=os.getenv('CHATBOT_CACHE_DIR'),  # Optional on-disk answer cache directory
+
+        # Upper bound on a cross-source insights turn
+        CHATBOT_INSIGHTS_DEADLINE=int(os.getenv('CHATBOT_INSIGHTS_DEADLINE', '60')),  # seconds
+    )
+
+
+class _LazyConfig(type):
+    """Resolve settings not defined on the class from the environment, loaded on first use"""
+
+    def __getattr__(cls, name):
+        try:
+            return getattr(_load_settings(), name)
+        except AttributeError:
+            raise AttributeError(f"Config has no setting '{name}'") from None
+
+
+class Config(metaclass=_LazyConfig):
+    """Application configuration
+
+    Environment-backed settings (see _load_settings) are read the first time any of
+    them is accessed, so importing this module does no file or environment I/O.
+    Unset secrets are None.
+    """
+
     # Application settings
     REFRESH_INTERVAL = 300  # 5 minutes in seconds
     MAX_METRICS_PER_REQUEST = 10
     DEFAULT_TIME_RANGE_HOURS = 24
-    
+
     @classmethod
     def validate_config(cls):
         """Validate that required configuration is present"""
         # Note: GitHub, Azure DevOps, and Figma configurations are optional, only Datadog is required
         required_vars = ['DD_API_KEY', 'DD_APPLICATION_KEY']
-        missing_vars = [var for var in required_vars if not getattr(cls, var) or getattr(cls, var) == f'your_{var.lower().replace("dd_", "").replace("_", "_")}_here']
-        
+        missing_vars = [var for var in required_vars if not getattr(cls, var)]
+
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-        
+
         return True
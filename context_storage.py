@@ -1,10 +1,162 @@
-import json
+import atexit
+import copy
+import functools
+import hashlib
+import io
+import logging
+import mmap
 import os
+import signal
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import threading
 import time
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Each source is persisted to its own file so an update only rewrites what changed
+_SOURCES = ("datadog", "github", "azuredevops", "figma")
+_SUMMARY_SHARD = "summary"
+
+# Shape of a fresh context; deep-copied so callers never share its nested dicts
+_EMPTY_CONTEXT = {
+    "last_updated": None,
+    "data_sources": {
+        "datadog": {
+            "metrics": {},
+            "charts": {},
+            "logs": {},
+            "last_fetch": None,
+            "status": "not_fetched"
+        },
+        "github": {
+            "pull_requests": [],
+            "repositories": [],
+            "analytics": {},
+            "last_fetch": None,
+            "status": "not_fetched"
+        },
+        "azuredevops": {
+            "work_items": [],
+            "pull_requests": [],
+            "analytics": {},
+            "last_fetch": None,
+            "status": "not_fetched"
+        },
+        "figma": {
+            "files": [],
+            "projects": [],
+            "analytics": {},
+            "last_fetch": None,
+            "status": "not_fetched"
+        }
+    },
+    "summary": {
+        "total_work_items": 0,
+        "total_pull_requests": 0,
+        "total_repositories": 0,
+        "total_metrics": 0,
+        "last_activity": None
+    }
+}
+
+# Updates only touch memory; a background thread snapshots dirty shards this often.
+# The file exists for restart recovery, and anything lost is simply fetched again.
+_FLUSH_INTERVAL = 30.0  # seconds
+# Buffered WAL records are appended this often, so a crash loses at most this much
+_WAL_FLUSH_INTERVAL = 1.0  # seconds
+
+# Stored lists are cut to these lengths so snapshots stay small however much an API returns;
+# get_context_for_llm renders far fewer items than this
+_MAX_METRICS = 100
+_MAX_LOGS = 50
+_MAX_PRS = 50
+_MAX_WORK_ITEMS = 100
+_MAX_REPOSITORIES = 50
+_MAX_FILES = 50
+
+
+def _capped(data: Dict, limits: Dict[str, int], drop=()) -> Dict:
+    """Shallow copy of data with the given list fields cut to their limits and the drop fields removed"""
+    if not isinstance(data, dict):
+        return data
+    capped = {key: value for key, value in data.items() if key not in drop}
+    for key, limit in limits.items():
+        if isinstance(capped.get(key), list):
+            capped[key] = capped[key][:limit]
+    return capped
+
+
+def _changed(before: Dict, after: Dict) -> Dict:
+    """Top-level keys of after that were added or replaced since before (a shallow copy)"""
+    return {key: value for key, value in after.items() if key not in before or before[key] is not value}
+
+
+def _iso(timestamp):
+    """Render a stored epoch timestamp as ISO 8601; older files already hold strings"""
+    if isinstance(timestamp, (int, float)):
+        return datetime.fromtimestamp(timestamp).isoformat()
+    return timestamp
+
+
+def _exit_on_sigterm(signum, frame):
+    """Turn SIGTERM into a normal exit so atexit handlers write pending context"""
+    raise SystemExit(128 + signum)
+
+
+def _dumps(value, pretty: bool = False) -> bytes:
+    """Serialize the context to UTF-8 JSON"""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    return orjson.dumps(value, option=option)
+
+
+def _read_json(path: str):
+    """Parse a JSON file through a read-only memory map, skipping the text decode and copy"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _write_atomic(path: str, payload: bytes):
+    """Replace a file with payload in one step, so a crash never leaves it half written"""
+    tmp_path = path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _guarded(description: str, source: str):
+    """Run a context update under the lock, stamp and persist its source, and log failures instead of raising"""
+    def decorator(update):
+        @functools.wraps(update)
+        def wrapper(self, *args, **kwargs):
+            try:
+                with self.lock:
+                    entry = self.context["data_sources"][source]
+                    before, summary_before = dict(entry), dict(self.context["summary"])
+                    update(self, *args, **kwargs)
+                    entry["last_fetch"] = time.time()
+                    entry["status"] = "fetched"
+                    self._mark_dirty({source: _changed(before, entry),
+                                      _SUMMARY_SHARD: _changed(summary_before, self.context["summary"])})
+                logger.info("%s context updated", description)
+            except Exception:
+                logger.exception("Error updating %s context", description)
+        return wrapper
+    return decorator
+
+
 class ContextStorage:
     """Context storage system for capturing and managing API data for chatbot context"""
     
@@ -24,330 +176,442 @@ class ContextStorage:
             return
         
         self.storage_dir = storage_dir
+        # Single-file layout from before sharding; read only when no shard exists yet
         self.context_file = os.path.join(storage_dir, "api_context.json")
-        self.lock = threading.Lock()
+        self._shard_files = {shard: os.path.join(storage_dir, f"{shard}.json")
+                             for shard in _SOURCES + (_SUMMARY_SHARD,)}
+        # Append-only log of updates since the last snapshot, replayed on start after a crash
+        self._wal_file = os.path.join(storage_dir, "context.wal")
+        # Reentrant so helpers such as save_context can run while an update holds the lock
+        self.lock = threading.RLock()
         
-        # Create storage directory if it doesn't exist
-        os.makedirs(storage_dir, exist_ok=True)
+        # Bumped on every load/save so readers can memoize derived views of the context
+        self.version = 0
         
-        # Initialize context structure
-        self.context = {
-            "last_updated": None,
-            "data_sources": {
-                "datadog": {
-                    "metrics": {},
-                    "charts": {},
-                    "logs": {},
-                    "last_fetch": None,
-                    "status": "not_fetched"
-                },
-                "github": {
-                    "pull_requests": [],
-                    "repositories": [],
-                    "analytics": {},
-                    "last_fetch": None,
-                    "status": "not_fetched"
-                },
-                "azuredevops": {
-                    "work_items": [],
-                    "pull_requests": [],
-                    "analytics": {},
-                    "last_fetch": None,
-                    "status": "not_fetched"
-                },
-                "figma": {
-                    "files": [],
-                    "projects": [],
-                    "analytics": {},
-                    "last_fetch": None,
-                    "status": "not_fetched"
-                }
-            },
-            "summary": {
-                "total_work_items": 0,
-                "total_pull_requests": 0,
-                "total_repositories": 0,
-                "total_metrics": 0,
-                "last_activity": None
-            }
-        }
+        # Initialize context structure; nothing is read from or written to disk until start()
+        self.context = copy.deepcopy(_EMPTY_CONTEXT)
+        
+        # Rendered get_context_for_llm text and get_context_digest value per data source, as (version, value)
+        self._llm_cache = {}
+        self._digest_cache = {}
+        
+        # Shards changed since the last write, and the digest of what each shard file holds
+        self._dirty_shards = set()
+        self._shard_digests = {}
         
-        # Load existing context
-        self.load_context()
+        self._wal = None
+        # Update records waiting for the flusher as (sequence, record); records at or below
+        # _snapshot_seq are already in the snapshot files and are never written
+        self._wal_pending = []
+        self._wal_seq = 0
+        self._snapshot_seq = 0
+        self._wal_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flush_interval = _FLUSH_INTERVAL
+        self._flusher = None
         
         # Mark as initialized
         self._initialized = True
     
+    def start(self):
+        """Load the stored context and begin persisting updates; called once by the app at startup"""
+        with self.lock:
+            if self._flusher is not None:
+                return
+            os.makedirs(self.storage_dir, exist_ok=True)
+            self.load_context()
+            self._wal = open(self._wal_file, 'ab')
+            
+            # Coalesce bursts of updates into one write, and write whatever is pending on exit
+            self._flusher = threading.Thread(target=self._flush_loop, name="context-flusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
+            if (threading.current_thread() is threading.main_thread()
+                    and signal.getsignal(signal.SIGTERM) in (signal.SIG_DFL, None)):
+                signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    
     def load_context(self):
-        """Load existing context from file"""
+        """Load existing context from the per-source files, or the legacy single file"""
         try:
-            if os.path.exists(self.context_file):
-                with open(self.context_file, 'r', encoding='utf-8') as f:
-                    self.context = json.load(f)
-                print(f"📁 Loaded context from {self.context_file}")
+            existing = {shard: path for shard, path in self._shard_files.items() if os.path.exists(path)}
+            if existing:
+                for shard, path in existing.items():
+                    self._apply_shard(shard, _read_json(path))
+                self.version += 1
+                logger.info("Loaded context from %s", self.storage_dir)
+            elif os.path.exists(self.context_file):
+                self.context = _read_json(self.context_file)
+                # Migrate to per-source files on the next flush
+                self._dirty_shards.update(self._shard_files)
+                self.version += 1
+                logger.info("Loaded context from %s", self.context_file)
             else:
-                print(f"📁 Created new context file at {self.context_file}")
-        except Exception as e:
-            print(f"❌ Error loading context: {e}")
+                logger.info("Created new context storage at %s", self.storage_dir)
+            self._replay_wal()
+        except Exception:
+            logger.exception("Error loading context")
+    
+    def _apply_shard(self, shard: str, data: Dict):
+        """Put the content of one shard file into the context"""
+        if shard == _SUMMARY_SHARD:
+            self.context["last_updated"] = data.get("last_updated")
+            self.context["summary"] = data.get("summary", self.context["summary"])
+        else:
+            self.context["data_sources"][shard] = data
+    
+    def _apply_patch(self, shard: str, timestamp: float, patch: Dict):
+        """Put the keys changed by one logged update into the context"""
+        self.context["last_updated"] = timestamp
+        if shard == _SUMMARY_SHARD:
+            self.context["summary"].update(patch)
+        else:
+            self.context["data_sources"][shard].update(patch)
+    
+    def _replay_wal(self):
+        """Apply updates logged after the last snapshot, stopping at a torn final record"""
+        if not os.path.exists(self._wal_file):
+            return
+        replayed = 0
+        valid_bytes = 0
+        with open(self._wal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring incomplete record at the end of %s", self._wal_file)
+                    break
+                self._apply_patch(record["src"], record["ts"], record["patch"])
+                self._dirty_shards.update((record["src"], _SUMMARY_SHARD))
+                replayed += 1
+                valid_bytes += len(line)
+        # Drop a torn tail so new records are not appended onto it
+        if valid_bytes < os.path.getsize(self._wal_file):
+            os.truncate(self._wal_file, valid_bytes)
+        if replayed:
+            self.version += 1
+            logger.info("Replayed %s context updates from %s", replayed, self._wal_file)
     
-    def save_context(self):
-        """Save context to file"""
+    def _mark_dirty(self, patches: Dict[str, Dict]):
+        """Record the keys changed in each shard; the flusher persists them. Call with self.lock held."""
+        timestamp = time.time()
+        self.context["last_updated"] = timestamp
+        self.version += 1
+        self._dirty_shards.update(patches)
+        self._dirty_shards.add(_SUMMARY_SHARD)
+        
+        # Before start() the context lives in memory only
+        if self._wal is None:
+            return
+        # Only the changed keys are logged, and they are serialized later by the flusher
+        for shard, patch in patches.items():
+            if patch:
+                self._wal_seq += 1
+                self._wal_pending.append((self._wal_seq, {"src": shard, "ts": timestamp, "patch": patch}))
+    
+    def _flush_wal(self):
+        """Append buffered update records to the log, serializing them outside self.lock"""
+        with self.lock:
+            pending, self._wal_pending = self._wal_pending, []
+        if not pending:
+            return
+        try:
+            with self._wal_lock:
+                payload = b"".join(_dumps(record) + b"\n" for seq, record in pending if seq > self._snapshot_seq)
+                if payload:
+                    self._wal.write(payload)
+                    self._wal.flush()
+        except Exception:
+            logger.exception("Error appending to %s", self._wal_file)
+    
+    def _flush_loop(self):
+        """Append logged updates every second and write the context once per interval if anything changed"""
+        next_snapshot = time.monotonic() + self._flush_interval
+        while not self._stop.wait(_WAL_FLUSH_INTERVAL):
+            self._flush_wal()
+            if time.monotonic() >= next_snapshot:
+                self.flush()
+                next_snapshot = time.monotonic() + self._flush_interval
+    
+    def flush(self):
+        """Write pending changes to file now"""
+        with self.lock:
+            if self._dirty_shards and self._wal is not None:
+                self.save_context(shards=set(self._dirty_shards))
+    
+    def _shard_content(self, shard: str):
+        """The part of the context stored in one shard file"""
+        if shard == _SUMMARY_SHARD:
+            return {"last_updated": self.context.get("last_updated"), "summary": self.context.get("summary", {})}
+        return self.context["data_sources"][shard]
+    
+    def save_context(self, pretty: bool = False, shards=None):
+        """Save context to file, rewriting only the given shards (all of them by default)"""
         try:
             with self.lock:
-                self.context["last_updated"] = datetime.now().isoformat()
                 # Ensure directory exists
-                os.makedirs(os.path.dirname(self.context_file), exist_ok=True)
-                with open(self.context_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.context, f, indent=2, ensure_ascii=False)
-                print(f"💾 Context saved to {self.context_file}")
-        except Exception as e:
-            print(f"❌ Error saving context: {e}")
-            import traceback
-            traceback.print_exc()
+                os.makedirs(self.storage_dir, exist_ok=True)
+                written = shards or set(self._shard_files)
+                for shard in written:
+                    payload = _dumps(self._shard_content(shard))
+                    # Leave the file alone when it already holds exactly this content; the digest
+                    # covers last_fetch too, so a skipped write never loses anything the WAL still has
+                    digest = hashlib.blake2b(payload, digest_size=16).digest()
+                    if not pretty and self._shard_digests.get(shard) == digest:
+                        continue
+                    _write_atomic(self._shard_files[shard],
+                                  _dumps(self._shard_content(shard), True) if pretty else payload)
+                    self._shard_digests[shard] = digest
+                self._dirty_shards.difference_update(written)
+                # Once every change is in the snapshot files the log can start over
+                if not self._dirty_shards and self._wal is not None:
+                    self._wal_pending.clear()
+                    self._snapshot_seq = self._wal_seq
+                    with self._wal_lock:
+                        self._wal.truncate(0)
+                logger.debug("Context saved to %s", self.storage_dir)
+        except Exception:
+            logger.exception("Error saving context")
     
+    def _refresh_summary_totals(self):
+        """Recompute PR and repository totals from the latest per-source analytics. Call with self.lock held."""
+        sources = self.context["data_sources"]
+        summary = self.context["summary"]
+        for key in ("total_pull_requests", "total_repositories"):
+            summary[key] = sum((sources[source].get("analytics") or {}).get(key, 0) or 0
+                               for source in ("github", "azuredevops"))
+    
+    @_guarded("Datadog", "datadog")
     def update_datadog_context(self, metrics_data: Dict, charts_data: Dict = None):
         """Update Datadog context with new data"""
-        try:
-            with self.lock:
-                self.context["data_sources"]["datadog"]["metrics"] = metrics_data
-                if charts_data:
-                    self.context["data_sources"]["datadog"]["charts"] = charts_data
-                self.context["data_sources"]["datadog"]["last_fetch"] = datetime.now().isoformat()
-                self.context["data_sources"]["datadog"]["status"] = "fetched"
-                
-                # Update summary
-                if metrics_data and "metrics" in metrics_data:
-                    self.context["summary"]["total_metrics"] = len(metrics_data["metrics"])
-                
-                self.save_context()
-                print("📊 Datadog context updated")
-        except Exception as e:
-            print(f"❌ Error updating Datadog context: {e}")
+        datadog = self.context["data_sources"]["datadog"]
+        datadog["metrics"] = _capped(metrics_data, {"metrics": _MAX_METRICS})
+        if charts_data:
+            datadog["charts"] = charts_data
+        
+        # Update summary
+        if metrics_data and "metrics" in metrics_data:
+            self.context["summary"]["total_metrics"] = len(metrics_data["metrics"])
     
+    @_guarded("Datadog logs", "datadog")
     def update_datadog_logs_context(self, logs_data: Dict):
         """Update Datadog logs context with new data"""
-        try:
-            with self.lock:
-                self.context["data_sources"]["datadog"]["logs"] = logs_data
-                self.context["data_sources"]["datadog"]["last_fetch"] = datetime.now().isoformat()
-                self.context["data_sources"]["datadog"]["status"] = "fetched"
-                self.save_context()
-                print("📋 Datadog logs context updated")
-        except Exception as e:
-            print(f"❌ Error updating Datadog logs context: {e}")
+        self.context["data_sources"]["datadog"]["logs"] = _capped(logs_data, {"logs": _MAX_LOGS})
     
+    @_guarded("GitHub", "github")
     def update_github_context(self, analytics_data: Dict):
         """Update GitHub context with new data"""
-        try:
-            with self.lock:
-                if "data" in analytics_data:
-                    data = analytics_data["data"]
-                    self.context["data_sources"]["github"]["analytics"] = data
-                    
-                    # Extract pull requests and repositories
-                    if "recent_pull_requests" in data:
-                        self.context["data_sources"]["github"]["pull_requests"] = data["recent_pull_requests"]
-                    if "repositories" in data:
-                        self.context["data_sources"]["github"]["repositories"] = data["repositories"]
-                    
-                    # Update summary
-                    if "total_pull_requests" in data:
-                        self.context["summary"]["total_pull_requests"] += data["total_pull_requests"]
-                    if "total_repositories" in data:
-                        self.context["summary"]["total_repositories"] += data["total_repositories"]
-                
-                self.context["data_sources"]["github"]["last_fetch"] = datetime.now().isoformat()
-                self.context["data_sources"]["github"]["status"] = "fetched"
-                self.save_context()
-                print("🐙 GitHub context updated")
-        except Exception as e:
-            print(f"❌ Error updating GitHub context: {e}")
+        github = self.context["data_sources"]["github"]
+        if "data" in analytics_data:
+            data = _capped(analytics_data["data"], {"recent_prs": _MAX_PRS,
+                                                    "recent_pull_requests": _MAX_PRS,
+                                                    "repositories": _MAX_REPOSITORIES})
+            github["analytics"] = data
+            
+            # Extract pull requests and repositories
+            if "recent_pull_requests" in data:
+                github["pull_requests"] = data["recent_pull_requests"]
+            if "repositories" in data:
+                github["repositories"] = data["repositories"]
+            
+            # Update summary
+            self._refresh_summary_totals()
     
+    @_guarded("Azure DevOps", "azuredevops")
     def update_azuredevops_context(self, analytics_data: Dict):
         """Update Azure DevOps context with new data"""
-        try:
-            print(f"🔧 DEBUG: Updating Azure DevOps context with data: {analytics_data.get('status', 'unknown')}")
-            with self.lock:
-                if "data" in analytics_data:
-                    data = analytics_data["data"]
-                    self.context["data_sources"]["azuredevops"]["analytics"] = data
-                    
-                    # Extract work items and pull requests
-                    if "recent_work_items" in data:
-                        self.context["data_sources"]["azuredevops"]["work_items"] = data["recent_work_items"]
-                        print(f"🔧 DEBUG: Stored {len(data['recent_work_items'])} work items")
-                    if "recent_pull_requests" in data:
-                        self.context["data_sources"]["azuredevops"]["pull_requests"] = data["recent_pull_requests"]
-                        print(f"🔧 DEBUG: Stored {len(data['recent_pull_requests'])} pull requests")
-                    
-                    # Update summary
-                    if "total_work_items" in data:
-                        self.context["summary"]["total_work_items"] = data["total_work_items"]
-                        print(f"🔧 DEBUG: Total work items: {data['total_work_items']}")
-                    if "total_pull_requests" in data:
-                        self.context["summary"]["total_pull_requests"] += data["total_pull_requests"]
-                    if "total_repositories" in data:
-                        self.context["summary"]["total_repositories"] += data["total_repositories"]
-                else:
-                    print(f"🔧 DEBUG: No 'data' key found in analytics_data")
-                
-                self.context["data_sources"]["azuredevops"]["last_fetch"] = datetime.now().isoformat()
-                self.context["data_sources"]["azuredevops"]["status"] = "fetched"
-                self.save_context()
-                print("🔷 Azure DevOps context updated successfully")
-        except Exception as e:
-            print(f"❌ Error updating Azure DevOps context: {e}")
-            import traceback
-            traceback.print_exc()
+        logger.debug("Updating Azure DevOps context with data: %s", analytics_data.get('status', 'unknown'))
+        azuredevops = self.context["data_sources"]["azuredevops"]
+        if "data" in analytics_data:
+            # all_work_items_with_prs holds every work item in the window for the debug table;
+            # the chatbot never reads it, so it is not stored. What is kept is copied, since the
+            # analytics client hands out results that share nested values with its cache
+            data = _capped(analytics_data["data"], {"recent_work_items": _MAX_WORK_ITEMS,
+                                                    "recent_pull_requests": _MAX_PRS,
+                                                    "associated_prs": _MAX_PRS,
+                                                    "involved_repositories": _MAX_REPOSITORIES,
+                                                    "resolved_repositories": _MAX_REPOSITORIES},
+                           drop=("all_work_items_with_prs",))
+            data = copy.deepcopy(data)
+            azuredevops["analytics"] = data
+            
+            # Extract work items and pull requests
+            if "recent_work_items" in data:
+                azuredevops["work_items"] = data["recent_work_items"]
+                logger.debug("Stored %s work items", len(data['recent_work_items']))
+            if "recent_pull_requests" in data:
+                azuredevops["pull_requests"] = data["recent_pull_requests"]
+                logger.debug("Stored %s pull requests", len(data['recent_pull_requests']))
+            
+            # Update summary
+            if "total_work_items" in data:
+                self.context["summary"]["total_work_items"] = data["total_work_items"]
+                logger.debug("Total work items: %s", data['total_work_items'])
+            self._refresh_summary_totals()
+        else:
+            logger.debug("No 'data' key found in analytics_data")
     
+    @_guarded("Figma", "figma")
     def update_figma_context(self, analytics_data: Dict):
         """Update Figma context with new data"""
-        try:
-            with self.lock:
-                if "data" in analytics_data:
-                    data = analytics_data["data"]
-                    self.context["data_sources"]["figma"]["analytics"] = data
-                    
-                    # Extract files and projects
-                    if "files" in data:
-                        self.context["data_sources"]["figma"]["files"] = data["files"]
-                    if "projects" in data:
-                        self.context["data_sources"]["figma"]["projects"] = data["projects"]
-                
-                self.context["data_sources"]["figma"]["last_fetch"] = datetime.now().isoformat()
-                self.context["data_sources"]["figma"]["status"] = "fetched"
-                self.save_context()
-                print("🎨 Figma context updated")
-        except Exception as e:
-            print(f"❌ Error updating Figma context: {e}")
+        figma = self.context["data_sources"]["figma"]
+        if "data" in analytics_data:
+            data = _capped(analytics_data["data"], {"files": _MAX_FILES, "projects": _MAX_FILES})
+            figma["analytics"] = data
+            
+            # Extract files and projects
+            if "files" in data:
+                figma["files"] = data["files"]
+            if "projects" in data:
+                figma["projects"] = data["projects"]
     
     def get_context_for_llm(self, data_source: str = "all") -> str:
         """Get formatted context for LLM based on data source"""
+        # Chatbot turns between fetches see the same context; reuse the rendered text
+        version = self.version
+        cached = self._llm_cache.get(data_source)
+        if cached and cached[0] == version:
+            return cached[1]
+        
         try:
-            print(f"🔧 DEBUG: Getting context for data_source: {data_source}")
-            context_parts = []
+            logger.debug("Getting context for data_source: %s", data_source)
+            buf = io.StringIO()
+            w = buf.write
+            sources = self.context["data_sources"]
             
             # Add general summary
             summary = self.context.get("summary", {})
             if summary:
-                context_parts.append("=== ANALYTICS DASHBOARD SUMMARY ===")
-                context_parts.append(f"Total Work Items: {summary.get('total_work_items', 0)}")
-                context_parts.append(f"Total Pull Requests: {summary.get('total_pull_requests', 0)}")
-                context_parts.append(f"Total Repositories: {summary.get('total_repositories', 0)}")
-                context_parts.append(f"Total Metrics: {summary.get('total_metrics', 0)}")
-                context_parts.append(f"Last Updated: {self.context.get('last_updated', 'Never')}")
-                context_parts.append("")
+                w("=== ANALYTICS DASHBOARD SUMMARY ===\n"
+                  f"Total Work Items: {summary.get('total_work_items', 0)}\n"
+                  f"Total Pull Requests: {summary.get('total_pull_requests', 0)}\n"
+                  f"Total Repositories: {summary.get('total_repositories', 0)}\n"
+                  f"Total Metrics: {summary.get('total_metrics', 0)}\n"
+                  f"Last Updated: {_iso(self.context.get('last_updated', 'Never'))}\n\n")
             
             # Add data source specific context
             if data_source == "all" or data_source == "datadog":
-                datadog_data = self.context["data_sources"]["datadog"]
+                datadog_data = sources["datadog"]
                 if datadog_data["status"] == "fetched":
-                    context_parts.append("=== DATADOG METRICS ===")
-                    if datadog_data["metrics"]:
-                        metrics = datadog_data["metrics"].get("metrics", [])
-                        for metric in metrics[:10]:  # Limit to first 10 metrics
-                            context_parts.append(f"- {metric.get('name', 'Unknown')}: {metric.get('value', 'N/A')} {metric.get('unit', '')}")
+                    w("=== DATADOG METRICS ===\n")
+                    metrics = (datadog_data["metrics"] or {}).get("metrics") or []
+                    for m in metrics[:10]:  # Limit to first 10 metrics
+                        w(f"- {m.get('name', 'Unknown')}: {m.get('value', 'N/A')} {m.get('unit', '')}\n")
                     
                     # Add Datadog logs
-                    if datadog_data.get("logs"):
-                        context_parts.append("=== DATADOG LOGS ===")
-                        logs = datadog_data["logs"]
-                        if logs.get("logs"):
-                            context_parts.append(f"Total Logs: {logs.get('total_logs', 0)}")
-                            context_parts.append(f"Services: {', '.join(logs.get('services', []))}")
+                    logs = datadog_data.get("logs")
+                    if logs:
+                        w("=== DATADOG LOGS ===\n")
+                        log_entries = logs.get("logs")
+                        if log_entries:
+                            w(f"Total Logs: {logs.get('total_logs', 0)}\n"
+                              f"Services: {', '.join(logs.get('services', []))}\n")
                             
                             # Add recent log entries
-                            recent_logs = logs.get("logs", [])[:5]  # Limit to 5 recent logs
-                            if recent_logs:
-                                context_parts.append("Recent Log Entries:")
-                                for log in recent_logs:
-                                    context_parts.append(f"- {log.get('message', 'No message')[:100]}...")
+                            w("Recent Log Entries:\n")
+                            for log in log_entries[:5]:  # Limit to 5 recent logs
+                                w(f"- {log.get('message', 'No message')[:100]}...\n")
                     
-                    context_parts.append(f"Last Fetch: {datadog_data.get('last_fetch', 'Never')}")
-                    context_parts.append("")
+                    w(f"Last Fetch: {_iso(datadog_data.get('last_fetch', 'Never'))}\n\n")
             
             if data_source == "all" or data_source == "github":
-                github_data = self.context["data_sources"]["github"]
+                github_data = sources["github"]
                 if github_data["status"] == "fetched":
-                    context_parts.append("=== GITHUB ANALYTICS ===")
+                    w("=== GITHUB ANALYTICS ===\n")
                     analytics = github_data.get("analytics", {})
                     if analytics:
-                        context_parts.append(f"Total PRs: {analytics.get('total_pull_requests', 0)}")
-                        context_parts.append(f"Total Repositories: {analytics.get('total_repositories', 0)}")
-                        context_parts.append(f"Total Commits: {analytics.get('total_commits', 0)}")
+                        w(f"Total PRs: {analytics.get('total_pull_requests', 0)}\n"
+                          f"Total Repositories: {analytics.get('total_repositories', 0)}\n"
+                          f"Total Commits: {analytics.get('total_commits', 0)}\n")
                         
                         # Add recent PRs
                         recent_prs = github_data.get("pull_requests", [])
                         if recent_prs:
-                            context_parts.append("Recent Pull Requests:")
+                            w("Recent Pull Requests:\n")
                             for pr in recent_prs[:5]:  # Limit to 5 recent PRs
-                                context_parts.append(f"- {pr.get('title', 'Unknown')} (State: {pr.get('state', 'Unknown')})")
-                    context_parts.append(f"Last Fetch: {github_data.get('last_fetch', 'Never')}")
-                    context_parts.append("")
+                                w(f"- {pr.get('title', 'Unknown')} (State: {pr.get('state', 'Unknown')})\n")
+                    w(f"Last Fetch: {_iso(github_data.get('last_fetch', 'Never'))}\n\n")
             
             if data_source == "all" or data_source == "azuredevops":
-                azure_data = self.context["data_sources"]["azuredevops"]
-                print(f"🔧 DEBUG: Azure DevOps status: {azure_data['status']}")
+                azure_data = sources["azuredevops"]
+                logger.debug("Azure DevOps status: %s", azure_data['status'])
                 if azure_data["status"] == "fetched":
-                    context_parts.append("=== AZURE DEVOPS ANALYTICS ===")
+                    w("=== AZURE DEVOPS ANALYTICS ===\n")
                     analytics = azure_data.get("analytics", {})
-                    print(f"🔧 DEBUG: Azure DevOps analytics keys: {list(analytics.keys()) if analytics else 'None'}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Azure DevOps analytics keys: %s", list(analytics.keys()) if analytics else 'None')
                     if analytics:
-                        context_parts.append(f"Total Work Items: {analytics.get('total_work_items', 0)}")
-                        context_parts.append(f"Total PRs: {analytics.get('total_pull_requests', 0)}")
-                        context_parts.append(f"Total Repositories: {analytics.get('total_repositories', 0)}")
+                        w(f"Total Work Items: {analytics.get('total_work_items', 0)}\n"
+                          f"Total PRs: {analytics.get('total_pull_requests', 0)}\n"
+                          f"Total Repositories: {analytics.get('total_repositories', 0)}\n")
                         
                         # Add work items by type
                         work_items_by_type = analytics.get("work_items_by_type", {})
                         if work_items_by_type:
-                            context_parts.append("Work Items by Type:")
+                            w("Work Items by Type:\n")
                             for item_type, count in work_items_by_type.items():
-                                context_parts.append(f"- {item_type}: {count}")
+                                w(f"- {item_type}: {count}\n")
                         
                         # Add work items by state
                         work_items_by_state = analytics.get("work_items_by_state", {})
                         if work_items_by_state:
-                            context_parts.append("Work Items by State:")
+                            w("Work Items by State:\n")
                             for state, count in work_items_by_state.items():
-                                context_parts.append(f"- {state}: {count}")
-                    context_parts.append(f"Last Fetch: {azure_data.get('last_fetch', 'Never')}")
-                    context_parts.append("")
+                                w(f"- {state}: {count}\n")
+                    w(f"Last Fetch: {_iso(azure_data.get('last_fetch', 'Never'))}\n\n")
             
             if data_source == "all" or data_source == "figma":
-                figma_data = self.context["data_sources"]["figma"]
+                figma_data = sources["figma"]
                 if figma_data["status"] == "fetched":
-                    context_parts.append("=== FIGMA ANALYTICS ===")
+                    w("=== FIGMA ANALYTICS ===\n")
                     analytics = figma_data.get("analytics", {})
                     if analytics:
-                        context_parts.append(f"Total Files: {analytics.get('total_files', 0)}")
-                        context_parts.append(f"Total Projects: {analytics.get('total_projects', 0)}")
+                        w(f"Total Files: {analytics.get('total_files', 0)}\n"
+                          f"Total Projects: {analytics.get('total_projects', 0)}\n")
                         
                         # Add recent files
                         recent_files = figma_data.get("files", [])
                         if recent_files:
-                            context_parts.append("Recent Files:")
+                            w("Recent Files:\n")
                             for file in recent_files[:5]:  # Limit to 5 recent files
-                                context_parts.append(f"- {file.get('name', 'Unknown')} (Last Modified: {file.get('last_modified', 'Unknown')})")
-                    context_parts.append(f"Last Fetch: {figma_data.get('last_fetch', 'Never')}")
-                    context_parts.append("")
+                                w(f"- {file.get('name', 'Unknown')} (Last Modified: {file.get('last_modified', 'Unknown')})\n")
+                    w(f"Last Fetch: {_iso(figma_data.get('last_fetch', 'Never'))}\n\n")
             
-            context_result = "\n".join(context_parts)
-            print(f"🔧 DEBUG: Final context length: {len(context_result)} characters")
-            print(f"🔧 DEBUG: Context preview: {context_result[:500]}...")
+            # Every line above ends in a newline; drop the last one
+            context_result = buf.getvalue()[:-1]
+            logger.debug("Final context length: %s characters", len(context_result))
+            logger.debug("Context preview: %.500s...", context_result)
+            self._llm_cache[data_source] = (version, context_result)
             return context_result
             
-        except Exception as e:
-            print(f"❌ Error getting context for LLM: {e}")
+        except Exception:
+            logger.exception("Error getting context for LLM")
             return "Error retrieving context data."
     
+    def get_context_digest(self, data_source: str = "all") -> str:
+        """Fingerprint of the stored data get_context_for_llm renders for data_source, ignoring fetch times"""
+        version = self.version
+        cached = self._digest_cache.get(data_source)
+        if cached and cached[0] == version:
+            return cached[1]
+        
+        with self.lock:
+            sources = self.context["data_sources"]
+            content = {source: {key: value for key, value in sources[source].items() if key != "last_fetch"}
+                       for source in _SOURCES if data_source in ("all", source)}
+            content[_SUMMARY_SHARD] = self.context.get("summary", {})
+            encoded = orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        self._digest_cache[data_source] = (version, digest)
+        return digest
+    
     def get_context_summary(self) -> Dict:
         """Get a summary of current context status"""
         return {
-            "last_updated": self.context.get("last_updated"),
+            "last_updated": _iso(self.context.get("last_updated")),
             "data_sources": {
                 source: {
                     "status": data["status"],
-                    "last_fetch": data["last_fetch"]
+                    "last_fetch": _iso(data["last_fetch"])
                 }
                 for source, data in self.context["data_sources"].items()
             },
@@ -358,20 +622,13 @@ class ContextStorage:
         """Clear all context data"""
         try:
             with self.lock:
-                self.context = {
-                    "last_updated": None,
-                    "data_sources": {
-                        "datadog": {"metrics": {}, "charts": {}, "last_fetch": None, "status": "not_fetched"},
-                        "github": {"pull_requests": [], "repositories": [], "analytics": {}, "last_fetch": None, "status": "not_fetched"},
-                        "azuredevops": {"work_items": [], "pull_requests": [], "analytics": {}, "last_fetch": None, "status": "not_fetched"},
-                        "figma": {"files": [], "projects": [], "analytics": {}, "last_fetch": None, "status": "not_fetched"}
-                    },
-                    "summary": {"total_work_items": 0, "total_pull_requests": 0, "total_repositories": 0, "total_metrics": 0, "last_activity": None}
-                }
-                self.save_context()
-                print("🗑️ Context cleared")
-        except Exception as e:
-            print(f"❌ Error clearing context: {e}")
+                self.context = copy.deepcopy(_EMPTY_CONTEXT)
+                patches = {shard: dict(self.context["data_sources"][shard]) for shard in _SOURCES}
+                patches[_SUMMARY_SHARD] = dict(self.context["summary"])
+                self._mark_dirty(patches)
+                logger.info("Context cleared")
+        except Exception:
+            logger.exception("Error clearing context")
 
 # Global context storage instance
 context_storage = ContextStorage()
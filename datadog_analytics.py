@@ -3,11 +3,50 @@ Datadog Analytics Module
 Handles Datadog logs functionality only
 """
 
-import json
-from datetime import datetime, timedelta
+import atexit
+import gzip
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# Dynamic parts of log messages (UUIDs like b2d71429-9a93-4ba2-b0ae-2da3eb243dcf, dates, times),
+# replaced in a single scan so similar logs group together when deduplicating
+_NORMALIZE_RE = re.compile(
+    r'(?P<uuid>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'
+    r'|(?P<date>\d{4}-\d{2}-\d{2})'
+    r'|(?P<time>\d{2}:\d{2}:\d{2})'
+)
+_NORMALIZED_TOKENS = {'uuid': 'UUID', 'date': 'DATE', 'time': 'TIME'}
+
+
+def _normalize_token(match):
+    """Placeholder for one dynamic part of a log message"""
+    return _NORMALIZED_TOKENS[match.lastgroup]
+
+
+# Outgoing logs are sent in batches: when this many are queued, or after the interval
+_LOG_BATCH_SIZE = 100
+_LOG_FLUSH_INTERVAL = 1.0  # seconds
+# Entries kept for resending while the intake is unreachable; the oldest are dropped past this
+_LOG_BUFFER_MAX = 1000
+
+# Services offered in the logs dropdown
+_FIXED_SERVICES = (
+    'ultrataxapiservices',
+    'ultrataxclientservices',
+    'taxassistantservices'
+)
+
 
 class DatadogApplicationKeyAnalytics:
     def __init__(self):
@@ -16,18 +55,31 @@ class DatadogApplicationKeyAnalytics:
         self.site = Config.DD_SITE
         self.base_url = f"https://api.{self.site}"
         
+        # Reuse connections to the Datadog API instead of a new TLS handshake per request
+        self._session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        self._session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
+        
         # Simple cache for services list (cache for 10 minutes)
         self._services_cache = None
         self._services_cache_time = None
         self._services_cache_duration = 600  # 10 minutes in seconds
         
+        # Outgoing log entries waiting for the next batch; whatever is left is sent on exit.
+        # A single flusher thread, started with the first entry, sends them in the background
+        self._log_buffer = []
+        self._log_buffer_lock = threading.Lock()
+        self._log_wakeup = threading.Event()
+        self._log_flusher = None
+        atexit.register(self.flush_logs)
+        
     def get_logs(self, query='*', from_time=None, to_time=None, limit=100, service=None, level=None, hours_back=24):
         """Fetch logs from Datadog using application key authentication"""
         # Calculate time range if not provided
         if not from_time:
-            from_time = int((datetime.now() - timedelta(hours=hours_back)).timestamp())
+            from_time = int(time.time() - hours_back * 3600)
         if not to_time:
-            to_time = int(datetime.now().timestamp())
+            to_time = int(time.time())
         
         try:
             # Use the correct API endpoint as per Datadog documentation
@@ -61,10 +113,10 @@ class DatadogApplicationKeyAnalytics:
             print(f"Query: {search_query}")
             print(f"Time range: {from_time} to {to_time}")
             
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self._session.get(url, params=params, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"Successfully fetched {len(data.get('data', []))} logs")
                 return self._process_logs_data(data)
             else:
@@ -123,39 +175,25 @@ class DatadogApplicationKeyAnalytics:
                     # Remove dynamic parts like ClientMainId to group similar logs
                     message = processed_log['message']
                     if message:
-                        # Remove UUIDs and dynamic IDs from the message for grouping
-                        import re
-                        # Remove UUIDs (like b2d71429-9a93-4ba2-b0ae-2da3eb243dcf)
-                        normalized_message = re.sub(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', 'UUID', message)
-                        # Remove other dynamic IDs (like ClientMainId: UUID)
-                        normalized_message = re.sub(r'ClientMainId:\s*UUID', 'ClientMainId: UUID', normalized_message)
-                        # Remove timestamps and other dynamic values
-                        normalized_message = re.sub(r'\d{4}-\d{2}-\d{2}', 'DATE', normalized_message)
-                        normalized_message = re.sub(r'\d{2}:\d{2}:\d{2}', 'TIME', normalized_message)
+                        # Replace UUIDs, dates and times in one pass for grouping
+                        normalized_message = _NORMALIZE_RE.sub(_normalize_token, message)
                     else:
                         normalized_message = message
                     
                     # Normalize timestamp to group logs within the same minute
                     timestamp = processed_log['timestamp']
-                    if timestamp:
-                        # Parse timestamp and round to the nearest minute for grouping
-                        from datetime import datetime
-                        try:
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                            # Round to the nearest minute
-                            rounded_timestamp = dt.replace(second=0, microsecond=0).isoformat()
-                        except:
-                            rounded_timestamp = timestamp
+                    # ISO timestamps (YYYY-MM-DDTHH:MM...) truncate to the minute without parsing
+                    if isinstance(timestamp, str) and len(timestamp) >= 16:
+                        rounded_timestamp = timestamp[:16]
                     else:
                         rounded_timestamp = timestamp
                     
-                    # Create unique key based on normalized content and rounded timestamp
-                    unique_key = (
-                        normalized_message,
-                        processed_log['service'],
-                        processed_log['level'],
-                        rounded_timestamp
-                    )
+                    # Create unique key based on normalized content and rounded timestamp;
+                    # an 8-byte digest keeps seen_logs small however long the messages are
+                    unique_key = hashlib.blake2b(
+                        f"{normalized_message}\x1f{processed_log['service']}\x1f{processed_log['level']}\x1f{rounded_timestamp}".encode(),
+                        digest_size=8
+                    ).digest()
                 
                 # Only add if we haven't seen this exact log before
                 if unique_key not in seen_logs:
@@ -190,37 +228,16 @@ class DatadogApplicationKeyAnalytics:
                 }
             
             # Calculate statistics
-            total_logs = len(logs)
-            services = {}
-            error_count = 0
-            warning_count = 0
-            info_count = 0
-            
-            for log in logs:
-                # Count by service
-                service_name = log.get('service', 'unknown')
-                services[service_name] = services.get(service_name, 0) + 1
-                
-                # Count by level
-                level = log.get('level', '').upper()
-                if level == 'ERROR':
-                    error_count += 1
-                elif level == 'WARN':
-                    warning_count += 1
-                elif level == 'INFO':
-                    info_count += 1
-            
-            # Format services data
-            services_list = [{'name': name, 'count': count} for name, count in services.items()]
-            services_list.sort(key=lambda x: x['count'], reverse=True)
+            services = Counter(log.get('service', 'unknown') for log in logs)
+            levels = Counter(log.get('level', '').upper() for log in logs)
             
             return {
-                'total_logs': total_logs,
+                'total_logs': len(logs),
                 'unique_services': len(services),
-                'error_count': error_count,
-                'warning_count': warning_count,
-                'info_count': info_count,
-                'services': services_list
+                'error_count': levels['ERROR'],
+                'warning_count': levels['WARN'],
+                'info_count': levels['INFO'],
+                'services': [{'name': name, 'count': count} for name, count in services.most_common()]
             }
             
         except Exception as e:
@@ -236,26 +253,13 @@ class DatadogApplicationKeyAnalytics:
     
     def get_available_services(self, hours_back=24):
         """Get fixed list of specific services for consistent dropdown"""
-        try:
-            # Return fixed list of specific services
-            fixed_services = [
-                'ultrataxapiservices',
-                'ultrataxclientservices', 
-                'taxassistantservices'
-            ]
-            
-            print(f"Returning fixed services list: {fixed_services}")
-            return fixed_services
-            
-        except Exception as e:
-            print(f"Error returning fixed services: {e}")
-            return []
+        return list(_FIXED_SERVICES)
     
     def get_logs_summary(self, hours=24):
         """Get logs summary for the specified time period"""
         try:
-            from_time = int((datetime.now() - timedelta(hours=hours)).timestamp())
-            to_time = int(datetime.now().timestamp())
+            from_time = int(time.time() - hours * 3600)
+            to_time = int(time.time())
             
             # Get logs data
             logs_data = self.get_logs('*', from_time, to_time, limit=1000)
@@ -298,35 +302,78 @@ class DatadogApplicationKeyAnalytics:
             return self._generate_sample_logs_summary(hours)
     
     def send_log_to_datadog(self, message, level='info', service='analytics-dashboard', host=None, tags=None):
-        """Send a log entry to Datadog"""
+        """Queue a log entry for Datadog; entries are sent in compressed batches"""
+        # Prepare log data
+        log_data = {
+            'message': message,
+            'status': level,
+            'service': service,
+            'timestamp': int(time.time() * 1000),  # Convert to milliseconds
+            'hostname': host or 'localhost',
+            'ddtags': ','.join(tags or [])
+        }
+        
+        with self._log_buffer_lock:
+            self._log_buffer.append(log_data)
+            pending = len(self._log_buffer)
+            if self._log_flusher is None:
+                self._log_flusher = threading.Thread(target=self._log_flush_loop, name="datadog-log-flusher", daemon=True)
+                self._log_flusher.start()
+        
+        if pending >= _LOG_BATCH_SIZE:
+            # Full batch; send it now rather than waiting out the interval
+            self._log_wakeup.set()
+        return True
+    
+    def _log_flush_loop(self):
+        """Send queued log entries once per interval, or as soon as a batch fills up"""
+        while True:
+            self._log_wakeup.wait(_LOG_FLUSH_INTERVAL)
+            self._log_wakeup.clear()
+            self.flush_logs()
+    
+    def _requeue_logs(self, batch):
+        """Put an unsent batch back in front of the queue, dropping the oldest entries past the limit"""
+        with self._log_buffer_lock:
+            self._log_buffer = batch + self._log_buffer
+            overflow = len(self._log_buffer) - _LOG_BUFFER_MAX
+            if overflow > 0:
+                del self._log_buffer[:overflow]
+        if overflow > 0:
+            logger.warning("Dropped %d queued Datadog logs; log buffer is full", overflow)
+    
+    def flush_logs(self):
+        """Send all queued log entries to Datadog in one gzip-compressed request"""
+        with self._log_buffer_lock:
+            batch, self._log_buffer = self._log_buffer, []
+        if not batch:
+            return True
+        
         try:
-            url = f"{self.base_url}/api/v1/logs"
-            
-            # Prepare log data
-            log_data = {
-                'message': message,
-                'level': level,
-                'service': service,
-                'timestamp': int(datetime.now().timestamp() * 1000),  # Convert to milliseconds
-                'host': host or 'localhost',
-                'tags': tags or []
-            }
+            url = f"https://http-intake.logs.{self.site}/api/v2/logs"
             
             headers = {
                 'DD-API-KEY': self.api_key,
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Content-Encoding': 'gzip'
             }
             
-            response = requests.post(url, json=log_data, headers=headers)
+            response = self._session.post(url, data=gzip.compress(orjson.dumps(batch), compresslevel=6),
+                                          headers=headers, timeout=30)
             
             if response.status_code == 202:
                 return True
+            if response.status_code == 429 or response.status_code >= 500:
+                # Intake is throttling or unavailable; try this batch again on the next flush
+                logger.warning("Datadog log intake returned %s; requeueing %d logs", response.status_code, len(batch))
+                self._requeue_logs(batch)
             else:
-                print(f"Error sending log: {response.status_code} - {response.text}")
-                return False
+                logger.warning("Dropped %d Datadog logs: %s - %s", len(batch), response.status_code, response.text)
+            return False
                 
         except Exception as e:
-            print(f"Error sending log: {e}")
+            logger.warning("Error sending %d Datadog logs, requeueing: %s", len(batch), e)
+            self._requeue_logs(batch)
             return False
     
     def _generate_sample_logs(self, limit=100, services=None):
@@ -345,7 +392,7 @@ class DatadogApplicationKeyAnalytics:
                 'id': f'sample-log-{i}',
                 'type': 'log',
                 'attributes': {
-                    'timestamp': int((datetime.now() - timedelta(minutes=i)).timestamp() * 1000),
+                    'timestamp': int((time.time() - i * 60) * 1000),
                     'message': f'Sample log message {i} from {service}',
                     'level': level,
                     'service': service,
@@ -368,8 +415,8 @@ class DatadogApplicationKeyAnalytics:
         return {
             'total_logs': 150,
             'time_range': {
-                'from': int((datetime.now() - timedelta(hours=hours)).timestamp()),
-                'to': int(datetime.now().timestamp()),
+                'from': int(time.time() - hours * 3600),
+                'to': int(time.time()),
                 'hours': hours
             },
             'logs_by_level': {
@@ -390,14 +437,14 @@ class DatadogApplicationKeyAnalytics:
                     'message': 'Sample recent log message 1',
                         'level': 'info',
                     'service': 'web-app',
-                    'timestamp': int(datetime.now().timestamp() * 1000)
+                    'timestamp': int(time.time() * 1000)
                 },
                 {
                     'id': 'sample-2', 
                     'message': 'Sample recent log message 2',
                     'level': 'warn',
                     'service': 'api-server',
-                    'timestamp': int((datetime.now() - timedelta(minutes=5)).timestamp() * 1000)
+                    'timestamp': int((time.time() - 5 * 60) * 1000)
                 }
             ],
             'status': 'sample_data'
@@ -5,10 +5,13 @@ Startup script for Datadog Analytics Dashboard (Application Key Version)
 
 import os
 import sys
+import logging
 from config import Config
 
 def main():
     """Main startup function"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    
     try:
         # Validate configuration
         Config.validate_config()
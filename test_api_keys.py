@@ -10,8 +10,8 @@ def test_datadog_api():
     """Test if Datadog API keys are working"""
     
     print("🔑 Testing Datadog API Keys...")
-    print(f"API Key: {Config.DD_API_KEY[:8]}...")
-    print(f"Application Key: {Config.DD_APPLICATION_KEY[:8]}...")
+    print(f"API Key: {(Config.DD_API_KEY or '')[:8]}...")
+    print(f"Application Key: {(Config.DD_APPLICATION_KEY or '')[:8]}...")
     print(f"Site: {Config.DD_SITE}")
     
     # Test 1: Check if we can authenticate
@@ -0,0 +1,161 @@
+"""
+Tests for the Azure DevOps analytics module
+"""
+
+import json
+
+import pytest
+
+import azuredevops_analytics
+from azuredevops_analytics import AzureDevOpsAnalytics
+
+
+@pytest.fixture
+def analytics():
+    """Client with credentials set, so methods get past their configuration checks"""
+    client = AzureDevOpsAnalytics()
+    client.pat_token = "token"
+    client.organization = "org"
+    client.project = "project"
+    client.area_path = ""
+    yield client
+    client.close()
+
+
+def test_iter_work_items_with_github_prs_yields_every_batch(analytics, monkeypatch):
+    batch_size = azuredevops_analytics._WORK_ITEMS_BATCH_SIZE
+    ids = list(range(batch_size * 2 + 5))
+    monkeypatch.setattr(analytics, "_query_github_pr_work_item_ids", lambda *args: ids)
+    monkeypatch.setattr(analytics, "_get_work_item_details",
+                        lambda chunk, base_url: [{"id": work_item_id} for work_item_id in chunk])
+
+    batches = list(analytics.iter_work_items_with_github_prs())
+
+    assert len(batches) == 3
+    assert sorted(item["id"] for batch in batches for item in batch) == ids
+
+
+def test_iter_work_items_with_github_prs_stops_on_query_error(analytics, monkeypatch):
+    monkeypatch.setattr(analytics, "_query_github_pr_work_item_ids", lambda *args: None)
+
+    assert list(analytics.iter_work_items_with_github_prs()) == []
+
+
+def test_github_prs_stream_sends_one_json_object_per_line(monkeypatch, tmp_path):
+    pytest.importorskip("flask")
+    # Importing the app starts context storage in the working directory
+    monkeypatch.chdir(tmp_path)
+    import app as dashboard
+
+    batches = [[{"id": 1}], [{"id": 2}, {"id": 3}]]
+    monkeypatch.setattr(dashboard.azuredevops_analytics, "iter_work_items_with_github_prs",
+                        lambda: iter(batches))
+
+    response = dashboard.app.test_client().get("/api/azuredevops/github-prs/stream?org=org&project=project")
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [
+        {"status": "partial", "work_items": batches[0]},
+        {"status": "partial", "work_items": batches[1]},
+        {"status": "complete"},
+    ]
+
+
+class _Response:
+    """Minimal stand-in for a requests response"""
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+        self.headers = {}
+
+
+def test_wiql_quote_doubles_embedded_quotes():
+    assert azuredevops_analytics._wiql_quote("Team") == "'Team'"
+    assert azuredevops_analytics._wiql_quote("O'Brien's") == "'O''Brien''s'"
+
+
+def test_get_work_items_quotes_filter_values(analytics, monkeypatch):
+    queries = []
+
+    def post(url, headers=None, json=None, timeout=None):
+        queries.append(json["query"])
+        return _Response(200, {"workItems": []})
+
+    monkeypatch.setattr(analytics._session, "post", post)
+    analytics.area_path = "Project\\Team' OR 1=1"
+
+    assert analytics.get_work_items(work_item_type="User's Story", state="Done") == []
+
+    query = queries[0]
+    assert "[System.AreaPath] = 'Project\\Team'' OR 1=1'" in query
+    assert "[System.WorkItemType] = 'User''s Story'" in query
+    assert "[System.State] = 'Done'" in query
+    assert query.rstrip().endswith("ORDER BY [System.CreatedDate] DESC")
+
+
+@pytest.mark.parametrize("url", [
+    "vstfs:///GitHub/PullRequest/4f6d0c2e-1b7a-4a43-9c5e-0d3f2a1b8c7d%2f42",
+    "vstfs:///GitHub/Commit/4f6d0c2e-1b7a-4a43-9c5e-0d3f2a1b8c7d%2fa1b2c3d4",
+])
+def test_github_repo_re_captures_the_repository_id(url):
+    match = azuredevops_analytics._GITHUB_REPO_RE.search(url)
+
+    assert match.group(1) == "4f6d0c2e-1b7a-4a43-9c5e-0d3f2a1b8c7d"
+
+
+def test_get_repositories_fast_keeps_repositories_apart(analytics, monkeypatch):
+    links = {
+        1: ["vstfs:///GitHub/PullRequest/repo-one%2f7", "vstfs:///GitHub/Commit/repo-one%2fabc123"],
+        2: ["vstfs:///GitHub/PullRequest/repo-two%2f9"],
+    }
+    work_items = [{"id": work_item_id, "fields": {"System.CreatedDate": f"2024-01-0{work_item_id}"}}
+                  for work_item_id in links]
+
+    def attach_pr_links(items, base_url):
+        for item in items:
+            item["associated_prs"] = [{"url": url} for url in links[item["id"]]]
+
+    resolved = {}
+
+    def resolve(repo_ids, breakdown, raw_ids=False):
+        resolved.update(ids=repo_ids, breakdown=dict(breakdown))
+        return [{"repository_id": repo_id} for repo_id in repo_ids]
+
+    monkeypatch.setattr(analytics, "_get_work_items_fast", lambda days: work_items)
+    monkeypatch.setattr(analytics, "_attach_pr_links", attach_pr_links)
+    monkeypatch.setattr(analytics, "_get_resolved_repositories", resolve)
+
+    result = analytics.get_repositories_fast()
+
+    assert result["status"] == "success"
+    assert result["data"]["total_repositories"] == 2
+    # The old split-based scan turned every link into the literal 'GitHub/GitHub'
+    assert resolved["ids"] == ["repo-one", "repo-two"]
+    assert resolved["breakdown"] == {"GitHub-repo-one": 2, "GitHub-repo-two": 1}
+
+
+def test_cached_streamlined_analytics_are_not_changed_by_callers(analytics, monkeypatch):
+    calls = []
+    work_items = [{"id": 1, "fields": {"System.WorkItemType": "Bug", "System.State": "Active",
+                                       "System.CreatedDate": "2024-01-01T00:00:00Z"}}]
+
+    def get_work_items(*args, **kwargs):
+        calls.append(1)
+        return [dict(item) for item in work_items]
+
+    monkeypatch.setattr(analytics, "get_work_items", get_work_items)
+    monkeypatch.setattr(analytics, "_attach_pr_links", lambda items, base_url: None)
+
+    first = analytics.get_streamlined_analytics(days=7)
+    assert first["status"] == "success"
+    first["data"]["total_work_items"] = 99
+    first["status"] = "changed"
+
+    second = analytics.get_streamlined_analytics(days=7)
+
+    assert len(calls) == 1
+    assert second["status"] == "success"
+    assert second["data"]["total_work_items"] == 1
@@ -0,0 +1,170 @@
+"""
+Tests for the chatbot's provider circuit breaker
+"""
+
+import pytest
+
+import chatbot_analytics
+from chatbot_analytics import ChatbotAnalytics, _CircuitBreaker, _ProviderError
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(chatbot_analytics.time, "monotonic", clock)
+    return clock
+
+
+def _tripped(fail_max=2, reset_timeout=30):
+    breaker = _CircuitBreaker(fail_max, reset_timeout)
+    for _ in range(fail_max):
+        breaker.record(False)
+    return breaker
+
+
+def test_breaker_opens_after_fail_max_consecutive_failures(clock):
+    breaker = _CircuitBreaker(3, 30)
+    breaker.record(False)
+    breaker.record(False)
+    breaker.record(True)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.allow()
+
+    breaker.record(False)
+    assert not breaker.allow()
+
+
+def test_half_open_admits_a_single_trial(clock):
+    breaker = _tripped()
+    clock.now += 30
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = _tripped()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record(True)
+
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = _tripped()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record(False)
+
+    assert not breaker.allow()
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_trial_that_never_reports_back_is_replaced(clock):
+    breaker = _tripped()
+    clock.now += 30
+    assert breaker.allow()
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+@pytest.fixture
+def chatbot():
+    bot = ChatbotAnalytics()
+    bot.llm_provider = "anthropic"
+    bot.anthropic_api_key = "key"
+    bot._disk_cache = None
+    return bot
+
+
+def test_provider_error_is_counted_and_not_cached(chatbot, monkeypatch):
+    def fail(*args):
+        raise _ProviderError("Anthropic API Error: 503 - unavailable")
+
+    monkeypatch.setattr(chatbot, "_call_anthropic", fail)
+
+    assert chatbot._get_llm_response("question?") == "Anthropic API Error: 503 - unavailable"
+    assert chatbot._breaker._failures == 1
+    assert not chatbot._response_cache
+
+
+def test_answer_that_reads_like_an_error_still_counts_as_success(chatbot, monkeypatch):
+    monkeypatch.setattr(chatbot, "_call_anthropic", lambda *args: "Failed to deploy: check the pipeline")
+    chatbot._breaker.record(False)
+
+    assert chatbot._get_llm_response("question?") == "Failed to deploy: check the pipeline"
+    assert chatbot._breaker._failures == 0
+    assert len(chatbot._response_cache) == 1
+
+
+@pytest.mark.parametrize("response", [
+    "<ul><li>What is the error rate?</li><li>Which service is <strong>slowest</strong>?</li></ul>",
+    "1. **What is the error rate?**\n2. **Which service is slowest?**",
+    "- What is the error rate?\n- Which service is slowest?",
+    "<p>Questions:</p>\n<ol>\n  <li>What is the error rate?</li>\n  <li>Which service is slowest?</li>\n</ol>",
+])
+def test_suggest_questions_strips_html_and_markdown(chatbot, monkeypatch, response):
+    monkeypatch.setattr(chatbot, "_call_anthropic", lambda *args: response)
+
+    assert chatbot.suggest_questions("datadog", {}) == ["What is the error rate?", "Which service is slowest?"]
+
+
+def test_suggest_questions_keeps_identifiers_with_underscores(chatbot, monkeypatch):
+    monkeypatch.setattr(chatbot, "_call_anthropic", lambda *args: "Why is p99_latency rising?")
+
+    assert chatbot.suggest_questions("datadog", {}) == ["Why is p99_latency rising?"]
+
+
+def test_suggest_questions_falls_back_to_lines_containing_a_question(chatbot, monkeypatch):
+    monkeypatch.setattr(chatbot, "_call_anthropic", lambda *args: "Is the error rate rising? (check last week)")
+
+    assert chatbot.suggest_questions("datadog", {}) == ["Is the error rate rising? (check last week)"]
+
+
+class _StreamResponse:
+    """Minimal stand-in for a streamed requests response"""
+
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+@pytest.mark.parametrize("status_code", [401, 403])
+def test_streamed_auth_error_drops_cached_credentials(chatbot, monkeypatch, status_code):
+    chatbot.llm_provider = "openai"
+    chatbot._tr_credentials = {"token": "revoked"}
+    chatbot._tr_credentials_expiry = float("inf")
+    monkeypatch.setattr(chatbot, "_openai_request", lambda *args: ("url", {}, {}))
+    monkeypatch.setattr(chatbot._session, "post", lambda *args, **kwargs: _StreamResponse(status_code, "denied"))
+
+    chunks = list(chatbot._get_llm_response_stream("question?"))
+
+    assert chunks == [f"Thomson Reuters OpenAI API Error: {status_code} - denied"]
+    assert chatbot._tr_credentials is None
@@ -0,0 +1,136 @@
+"""
+Tests for chatbot context storage
+"""
+
+import atexit
+import os
+
+import orjson
+import pytest
+
+import context_storage
+from context_storage import ContextStorage
+
+
+def _new_storage(storage_dir, monkeypatch):
+    """A fresh ContextStorage in storage_dir, bypassing the process-wide singleton"""
+    monkeypatch.setattr(ContextStorage, "_instance", None)
+    return ContextStorage(str(storage_dir))
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    return _new_storage(tmp_path, monkeypatch)
+
+
+@pytest.fixture
+def start_storage(tmp_path, monkeypatch):
+    """Start fresh storages on tmp_path; stopping one without a flush simulates a crash"""
+    monkeypatch.setattr(context_storage.signal, "signal", lambda *args: None)
+    started = []
+
+    def start():
+        storage = _new_storage(tmp_path, monkeypatch)
+        storage.start()
+        started.append(storage)
+        return storage
+
+    yield start
+    for storage in started:
+        _stop(storage)
+
+
+def _stop(storage):
+    """Stop the flusher and close the WAL without writing a snapshot"""
+    storage._stop.set()
+    atexit.unregister(storage.flush)
+    if not storage._wal.closed:
+        storage._wal.close()
+
+
+def test_summary_totals_do_not_grow_on_repeated_updates(storage):
+    github = {"data": {"total_pull_requests": 5, "total_repositories": 2}}
+    azuredevops = {"data": {"total_pull_requests": 3, "total_repositories": 4, "total_work_items": 10}}
+
+    for _ in range(3):
+        storage.update_github_context(github)
+        storage.update_azuredevops_context(azuredevops)
+
+    summary = storage.context["summary"]
+    assert summary["total_pull_requests"] == 8
+    assert summary["total_repositories"] == 6
+    assert summary["total_work_items"] == 10
+
+
+def test_summary_totals_follow_the_latest_update(storage):
+    storage.update_github_context({"data": {"total_pull_requests": 5, "total_repositories": 2}})
+    storage.update_github_context({"data": {"total_pull_requests": 1, "total_repositories": 1}})
+
+    assert storage.context["summary"]["total_pull_requests"] == 1
+    assert storage.context["summary"]["total_repositories"] == 1
+
+
+def test_wal_records_hold_only_the_changed_keys(start_storage):
+    storage = start_storage()
+    storage.update_github_context({"data": {"total_pull_requests": 5}})
+    storage._flush_wal()
+
+    with open(storage._wal_file, "rb") as f:
+        records = [orjson.loads(line) for line in f]
+
+    assert [record["src"] for record in records] == ["github", "summary"]
+    assert set(records[0]["patch"]) == {"analytics", "last_fetch", "status"}
+    assert records[1]["patch"] == {"total_pull_requests": 5}
+
+
+def test_updates_are_replayed_from_the_wal_after_a_crash(start_storage):
+    storage = start_storage()
+    storage.update_github_context({"data": {"total_pull_requests": 5, "total_repositories": 2}})
+    storage._flush_wal()
+    _stop(storage)
+
+    restarted = start_storage()
+
+    github = restarted.context["data_sources"]["github"]
+    assert github["status"] == "fetched"
+    assert github["analytics"] == {"total_pull_requests": 5, "total_repositories": 2}
+    assert restarted.context["summary"]["total_pull_requests"] == 5
+    assert {"github", "summary"} <= restarted._dirty_shards
+
+
+def test_snapshot_truncates_the_wal(start_storage):
+    storage = start_storage()
+    storage.update_github_context({"data": {"total_pull_requests": 5}})
+    storage._flush_wal()
+
+    storage.flush()
+
+    assert os.path.getsize(storage._wal_file) == 0
+    _stop(storage)
+    restarted = start_storage()
+    assert restarted.context["data_sources"]["github"]["analytics"] == {"total_pull_requests": 5}
+    assert not restarted._dirty_shards
+
+
+def test_records_covered_by_a_snapshot_are_never_written(start_storage):
+    storage = start_storage()
+    storage.update_github_context({"data": {"total_pull_requests": 5}})
+
+    storage.flush()
+    storage._flush_wal()
+
+    assert os.path.getsize(storage._wal_file) == 0
+
+
+def test_torn_final_record_is_skipped_and_cut_off(start_storage):
+    storage = start_storage()
+    storage.update_github_context({"data": {"total_pull_requests": 5}})
+    storage._flush_wal()
+    valid_size = os.path.getsize(storage._wal_file)
+    storage._wal.write(b'{"src": "github", "ts": 1, "pat')
+    _stop(storage)
+
+    restarted = start_storage()
+
+    assert restarted.context["data_sources"]["github"]["analytics"] == {"total_pull_requests": 5}
+    assert os.path.getsize(restarted._wal_file) == valid_size